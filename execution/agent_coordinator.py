@@ -4,7 +4,7 @@ Agent Coordinator for the Auto-Dev System
 
 This is the main orchestrator that coordinates:
 - Todo processing and work queue management
-- Git branch creation and management
+- Git branch creation and management (one worktree per worker)
 - Multiple Claude CLI agents running in parallel
 - Dev server instances for each agent
 - Playwright testing for each implementation
@@ -23,10 +23,11 @@ Usage:
         --project /path/to/project \
         --dry-run
 
-    # Resume from previous run
-    python execution/agent_coordinator.py \
-        --project /path/to/project \
-        --resume
+    # Work on todos while generate_todos.py --stream-to-queue is still producing them
+    python execution/agent_coordinator.py --follow --project /path/to/project
+
+    # Resume from previous run (skips phases already checkpointed per todo)
+    python execution/agent_coordinator.py --resume
 """
 
 import argparse
@@ -36,20 +37,29 @@ import os
 import signal
 import subprocess
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils import load_env, log, save_json, load_json, get_tmp_path, ExecutionResult, timestamp
 
 # Import other modules
-from todo_processor import create_work_queue, load_work_queue, save_work_queue, claim_todo, complete_todo, get_next_todo
-from git_branch_manager import init_git_state, create_branch, commit_changes, push_branch, merge_branch, cleanup as git_cleanup
-from dev_server_manager import start_server, stop_server, stop_all_servers, check_server_health
+from todo_processor import (
+    create_work_queue, load_work_queue, save_work_queue, claim_todo, claim_next_todo,
+    complete_todo, release_todo, reclaim_expired_todos, get_queue_status,
+    queue_producer_open, LeaseHeartbeat, HEARTBEAT_INTERVAL
+)
+from git_branch_manager import (
+    init_git_state, load_git_state, create_worktree, create_branch, get_branch_status,
+    get_base_commit, git_session_intact, commit_changes, push_branch, merge_branch,
+    cleanup as git_cleanup
+)
+from dev_server_manager import ensure_server, stop_server, stop_all_servers, check_server_health
 from spawn_claude_agent import spawn_claude_agent, TodoItem
 
 
@@ -58,6 +68,7 @@ class AgentWorker:
     """Represents a single agent worker with its resources."""
     worker_id: str
     port: int
+    worktree: Optional[str] = None
     todo: Optional[Dict] = None
     branch: Optional[str] = None
     server_pid: Optional[int] = None
@@ -66,6 +77,18 @@ class AgentWorker:
     finished_at: Optional[str] = None
     result: Optional[Dict] = None
 
+    def to_dict(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "port": self.port,
+            "worktree": self.worktree,
+            "todo_id": self.todo["id"] if self.todo else None,
+            "branch": self.branch,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
 
 @dataclass
 class CoordinatorState:
@@ -79,6 +102,9 @@ class CoordinatorState:
     completed_todos: List[str] = field(default_factory=list)
     failed_todos: List[str] = field(default_factory=list)
     current_phase: str = "init"  # init, running, cleanup, done
+    options: Dict[str, Any] = field(default_factory=dict)
+    # todo_id -> {"worker_id": ..., "phases": {phase: result}} for unfinished todos
+    checkpoints: Dict[str, Dict] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
         return {
@@ -90,17 +116,32 @@ class CoordinatorState:
             "workers": self.workers,
             "completed_todos": self.completed_todos,
             "failed_todos": self.failed_todos,
-            "current_phase": self.current_phase
+            "current_phase": self.current_phase,
+            "options": self.options,
+            "checkpoints": self.checkpoints
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "CoordinatorState":
-        return cls(**data)
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+# How often a following coordinator looks for newly streamed todos (seconds)
+FOLLOW_POLL_INTERVAL = 2
+
+# How long --follow waits for a producer to open the work queue (seconds)
+FOLLOW_WAIT_TIMEOUT = 60
+
+# Worker threads record phase checkpoints while the main thread records
+# assignments, so all state mutations and saves go through this lock
+_state_lock = threading.RLock()
 
 
 def save_coordinator_state(state: CoordinatorState):
     """Save coordinator state for resume capability."""
-    save_json(state.to_dict(), "auto-dev/coordinator_state.json")
+    with _state_lock:
+        save_json(state.to_dict(), "auto-dev/coordinator_state.json")
 
 
 def load_coordinator_state() -> Optional[CoordinatorState]:
@@ -120,130 +161,187 @@ def process_single_todo(
     auto_merge: bool,
     github_push: bool,
     run_tests: bool,
-    timeout: int
+    timeout: int,
+    warm_server: bool = True,
+    browser_pool: Optional[Any] = None,
+    criteria_concurrency: int = 1,
+    checkpoint: Optional[Dict] = None,
+    on_phase: Optional[Callable[[str, Dict], None]] = None
 ) -> Dict:
     """
     Process a single todo with a dedicated worker.
 
     This runs in a thread and handles:
-    1. Creating feature branch
+    1. Creating feature branch (in the worker's worktree)
     2. Starting dev server
     3. Running Claude agent
     4. Running Playwright tests
     5. Committing and pushing changes
+
+    Args:
+        warm_server: Keep the worker's dev server running for its next todo
+            instead of stopping it when this one finishes
+        browser_pool: Shared playwright_test_runner.BrowserPool to lease a
+            browser context from instead of launching a browser
+        criteria_concurrency: Acceptance criteria evaluated at once, each in
+            its own page
+        checkpoint: Phase results from an interrupted run of this todo;
+            phases found here are skipped
+        on_phase: Called with (phase, result) as each phase finishes
     """
+    done_phases = dict(checkpoint or {})
     result = {
         "worker_id": worker.worker_id,
         "todo_id": todo_data["id"],
         "success": False,
-        "phases": {}
+        "phases": dict(done_phases)
     }
 
-    todo = TodoItem.from_dict(todo_data)
-    log(f"[{worker.worker_id}] Starting work on {todo.id}: {todo.title}")
-
-    try:
-        # Phase 1: Create branch
-        log(f"[{worker.worker_id}] Creating branch...")
-        branch_result = create_branch(project_path, todo.id, todo.title)
-        result["phases"]["branch"] = branch_result.to_dict()
+    def record(phase: str, phase_result: Dict):
+        result["phases"][phase] = phase_result
+        if on_phase:
+            on_phase(phase, phase_result)
 
-        if not branch_result.success:
-            log(f"[{worker.worker_id}] Failed to create branch: {branch_result.error}", level="error")
-            return result
+    def resumed(phase: str) -> bool:
+        if phase in done_phases:
+            log(f"[{worker.worker_id}] Skipping {phase} (checkpointed)")
+            return True
+        return False
 
-        worker.branch = branch_result.data["branch"]
-
-        # Phase 2: Start dev server
-        log(f"[{worker.worker_id}] Starting dev server on port {worker.port}...")
-        server_result = start_server(project_path, worker.port)
-        result["phases"]["server"] = server_result.to_dict()
+    todo = TodoItem.from_dict(todo_data)
+    log(f"[{worker.worker_id}] Starting work on {todo.id}: {todo.title}")
 
-        if not server_result.success:
-            log(f"[{worker.worker_id}] Failed to start server: {server_result.error}", level="error")
-            return result
+    # Everything except merging into main happens in the worker's own checkout
+    work_path = worker.worktree or project_path
 
-        worker.server_pid = server_result.data.get("pid")
-        test_url = server_result.data.get("url", f"http://localhost:{worker.port}")
+    try:
+        # Phase 1: Create branch (unless the checkout is still on it)
+        branch_done = done_phases.get("branch", {})
+        status = get_branch_status(work_path)
+        if (
+            branch_done.get("success")
+            and status.success
+            and status.data["branch"] == branch_done["data"]["branch"]
+        ):
+            log(f"[{worker.worker_id}] Skipping branch (checkpointed)")
+        else:
+            log(f"[{worker.worker_id}] Creating branch...")
+            branch_result = create_branch(project_path, todo.id, todo.title, worker.worktree)
+            record("branch", branch_result.to_dict())
+
+            if not branch_result.success:
+                log(f"[{worker.worker_id}] Failed to create branch: {branch_result.error}", level="error")
+                return result
+
+        worker.branch = result["phases"]["branch"]["data"]["branch"]
+
+        # Phase 2: Start dev server (only needed by the agent and tests),
+        # reusing the worker's warm server or one that survived a restart
+        test_url = f"http://localhost:{worker.port}"
+        if "agent" not in done_phases or (run_tests and "tests" not in done_phases):
+            log(f"[{worker.worker_id}] Ensuring dev server on port {worker.port}...")
+            server_result = ensure_server(work_path, worker.port)
+            record("server", server_result.to_dict())
+
+            if not server_result.success:
+                log(f"[{worker.worker_id}] Failed to start server: {server_result.error}", level="error")
+                return result
+
+            worker.server_pid = server_result.data.get("pid")
+            # The allocator may have moved the server to another free port
+            worker.port = server_result.data.get("port", worker.port)
+            test_url = server_result.data.get("url", test_url)
+
+        # The checkout is still exactly its main-branch base: record that
+        # commit's visual baseline if no todo branched from it has yet
+        if run_tests and "agent" not in done_phases:
+            record_base_baseline(worker, work_path, project_path, test_url, browser_pool)
 
         # Phase 3: Run Claude agent
-        log(f"[{worker.worker_id}] Spawning Claude agent...")
-        agent_result = spawn_claude_agent(
-            todo=todo,
-            project_path=project_path,
-            test_url=test_url,
-            session_id=f"{worker.worker_id}_{todo.id}",
-            app_context=app_context,
-            timeout=timeout
-        )
-        result["phases"]["agent"] = agent_result.to_dict()
+        if not resumed("agent"):
+            log(f"[{worker.worker_id}] Spawning Claude agent...")
+            agent_result = spawn_claude_agent(
+                todo=todo,
+                project_path=work_path,
+                test_url=test_url,
+                session_id=f"{worker.worker_id}_{todo.id}",
+                app_context=app_context,
+                timeout=timeout
+            )
+            record("agent", agent_result.to_dict())
 
-        if not agent_result.success:
-            log(f"[{worker.worker_id}] Agent failed: {agent_result.error}", level="error")
-            # Don't return yet - still try to run tests and commit what we have
+            if not agent_result.success:
+                log(f"[{worker.worker_id}] Agent failed: {agent_result.error}", level="error")
+                # Don't return yet - still try to run tests and commit what we have
+        agent_success = result["phases"]["agent"]["success"]
 
         # Phase 4: Run Playwright tests (if enabled)
-        if run_tests:
+        if run_tests and not resumed("tests"):
             log(f"[{worker.worker_id}] Running Playwright tests...")
             try:
                 # Import here to avoid issues if playwright not installed
                 from playwright_test_runner import run_tests as pw_run_tests
-                import asyncio
 
-                test_result = asyncio.run(pw_run_tests(
+                tests = pw_run_tests(
                     url=test_url,
                     todo_id=todo.id,
                     acceptance_criteria=todo.acceptance_criteria,
                     timeout=120,
-                    headless=True
-                ))
-                result["phases"]["tests"] = test_result.to_dict()
+                    headless=True,
+                    pool=browser_pool,
+                    criteria_concurrency=criteria_concurrency,
+                    # Compare against main as it was when this branch started
+                    project=project_path,
+                    base_commit=get_base_commit(work_path)
+                )
+                # Pooled runs execute on the pool's own event loop
+                test_result = browser_pool.run(tests) if browser_pool else asyncio.run(tests)
+                record("tests", test_result.to_dict())
 
                 if test_result.failed_tests > 0:
                     log(f"[{worker.worker_id}] {test_result.failed_tests} tests failed", level="warning")
             except ImportError:
                 log(f"[{worker.worker_id}] Playwright not available, skipping tests", level="warning")
-                result["phases"]["tests"] = {"skipped": True, "reason": "playwright not installed"}
+                record("tests", {"skipped": True, "reason": "playwright not installed"})
             except Exception as e:
                 log(f"[{worker.worker_id}] Test error: {e}", level="error")
-                result["phases"]["tests"] = {"error": str(e)}
+                record("tests", {"error": str(e)})
 
         # Phase 5: Commit changes
-        log(f"[{worker.worker_id}] Committing changes...")
-        commit_msg = f"feat({todo.category}): {todo.title}\n\nImplemented by auto-dev agent\nTodo ID: {todo.id}"
-        commit_result = commit_changes(project_path, commit_msg)
-        result["phases"]["commit"] = commit_result.to_dict()
+        if not done_phases.get("commit", {}).get("success"):
+            log(f"[{worker.worker_id}] Committing changes...")
+            commit_msg = f"feat({todo.category}): {todo.title}\n\nImplemented by auto-dev agent\nTodo ID: {todo.id}"
+            record("commit", commit_changes(work_path, commit_msg).to_dict())
+        commit = result["phases"]["commit"]
+        committed = commit["success"] and commit["data"].get("committed", False)
 
         # Phase 6: Push to GitHub (if enabled and commit succeeded)
-        if github_push and commit_result.success and commit_result.data.get("committed"):
-            log(f"[{worker.worker_id}] Pushing to GitHub...")
-            push_result = push_branch(project_path, worker.branch)
-            result["phases"]["push"] = push_result.to_dict()
-        else:
-            result["phases"]["push"] = {"skipped": True}
+        if not resumed("push"):
+            if github_push and committed:
+                log(f"[{worker.worker_id}] Pushing to GitHub...")
+                record("push", push_branch(work_path, worker.branch).to_dict())
+            else:
+                record("push", {"skipped": True})
 
         # Phase 7: Auto-merge (if enabled and all tests passed)
-        tests_passed = result["phases"].get("tests", {}).get("failed_tests", 0) == 0
-        if auto_merge and tests_passed and commit_result.success:
-            log(f"[{worker.worker_id}] Auto-merging to main...")
-            merge_result = merge_branch(project_path, worker.branch)
-            result["phases"]["merge"] = merge_result.to_dict()
-        else:
-            result["phases"]["merge"] = {"skipped": True, "reason": "auto_merge disabled or tests failed"}
+        if not resumed("merge"):
+            tests_passed = result["phases"].get("tests", {}).get("failed_tests", 0) == 0
+            if auto_merge and tests_passed and commit["success"]:
+                log(f"[{worker.worker_id}] Auto-merging to main...")
+                record("merge", merge_branch(project_path, worker.branch).to_dict())
+            else:
+                record("merge", {"skipped": True, "reason": "auto_merge disabled or tests failed"})
 
         # Determine overall success
-        result["success"] = (
-            agent_result.success or
-            commit_result.data.get("committed", False)
-        )
+        result["success"] = agent_success or committed
 
     except Exception as e:
         log(f"[{worker.worker_id}] Error: {e}", level="error")
         result["error"] = str(e)
 
     finally:
-        # Cleanup: Stop dev server
-        if worker.server_pid:
+        # Cleanup: Stop dev server unless it stays warm for the next todo
+        if worker.server_pid and not warm_server:
             log(f"[{worker.worker_id}] Stopping dev server...")
             stop_server(worker.port)
 
@@ -251,8 +349,301 @@ def process_single_todo(
     return result
 
 
+def record_base_baseline(
+    worker: AgentWorker,
+    work_path: str,
+    project_path: str,
+    test_url: str,
+    browser_pool: Optional[Any] = None
+):
+    """Screenshot the worker's untouched checkout as its base commit's baseline, if missing."""
+    base_commit = get_base_commit(work_path)
+    if not base_commit:
+        return
+    try:
+        from playwright_test_runner import record_missing_baseline
+
+        recording = record_missing_baseline(test_url, project_path, base_commit, pool=browser_pool)
+        # Pooled runs execute on the pool's own event loop
+        if browser_pool:
+            browser_pool.run(recording)
+        else:
+            asyncio.run(recording)
+    except ImportError:
+        pass
+    except Exception as e:
+        log(f"[{worker.worker_id}] Could not record visual baseline: {e}", level="warning")
+
+
+def run_leased_todo(worker: AgentWorker, todo_data: Dict, *args, **kwargs) -> Dict:
+    """Run process_single_todo while a heartbeat keeps the todo's lease alive."""
+    with LeaseHeartbeat(todo_data["id"], worker.worker_id):
+        return process_single_todo(worker, todo_data, *args, **kwargs)
+
+
+def wait_for_producer(timeout: float = FOLLOW_WAIT_TIMEOUT) -> bool:
+    """
+    Wait for generate_todos.py --stream-to-queue to open the work queue.
+
+    Returns:
+        False if no producer opened it within timeout
+    """
+    deadline = time.time() + timeout
+    while not queue_producer_open():
+        if time.time() >= deadline:
+            return False
+        time.sleep(FOLLOW_POLL_INTERVAL)
+    return True
+
+
+def run_workers(state: CoordinatorState, total_todos: Optional[int]) -> ExecutionResult:
+    """
+    Process the work queue with a pool of workers, then clean up and report.
+
+    Todos with checkpoints in state (from an interrupted run) are handed
+    back to the worker that started them so their worktree is reused.
+
+    With options["follow"], idle workers keep polling the queue while its
+    producer is still appending todos, and the run ends once the producer
+    has closed it and every todo is done. total_todos is then counted at
+    the end.
+    """
+    project_path = state.project_path
+    options = state.options
+    follow = options.get("follow", False)
+
+    # Phase 3: Process todos in parallel
+    log(f"Phase 3: Processing todos with up to {state.max_agents} parallel agents...")
+
+    # Create worker pool
+    workers = [
+        AgentWorker(
+            worker_id=f"worker_{i}",
+            port=state.base_port + i
+        )
+        for i in range(state.max_agents)
+    ]
+
+    # Give each worker its own worktree so branches don't share a checkout
+    for worker in workers:
+        worktree_result = create_worktree(project_path, worker.worker_id)
+        if not worktree_result.success:
+            return ExecutionResult.fail(
+                error=f"Failed to create worktree for {worker.worker_id}: {worktree_result.error}"
+            )
+        worker.worktree = worktree_result.data["worktree"]
+
+    # One shared browser for every worker's tests
+    browser_pool = None
+    if options.get("run_tests", True):
+        try:
+            from playwright_test_runner import BrowserPool, playwright_available
+            if playwright_available:
+                browser_pool = BrowserPool().start()
+        except Exception as e:
+            log(f"Browser pool unavailable, tests will launch their own browser: {e}", level="warning")
+
+    results = []
+
+    with ThreadPoolExecutor(max_workers=state.max_agents) as executor:
+        futures = {}
+
+        def start(worker: AgentWorker, todo_data: Dict):
+            todo_id = todo_data["id"]
+            with _state_lock:
+                entry = state.checkpoints.setdefault(
+                    todo_id,
+                    {"worker_id": worker.worker_id, "phases": {}}
+                )
+                entry["worker_id"] = worker.worker_id
+                prior_phases = dict(entry["phases"])
+
+            def on_phase(phase: str, phase_result: Dict):
+                with _state_lock:
+                    state.checkpoints[todo_id]["phases"][phase] = phase_result
+                    save_coordinator_state(state)
+
+            worker.todo = todo_data
+            worker.status = "running"
+            worker.started_at = timestamp()
+            worker.finished_at = None
+
+            future = executor.submit(
+                run_leased_todo,
+                worker,
+                todo_data,
+                project_path,
+                options.get("app_context", ""),
+                options.get("auto_merge", False),
+                options.get("github_push", True),
+                options.get("run_tests", True),
+                options.get("timeout", 600),
+                warm_server=options.get("warm_servers", True),
+                browser_pool=browser_pool,
+                criteria_concurrency=options.get("criteria_concurrency", 1),
+                checkpoint=prior_phases,
+                on_phase=on_phase
+            )
+            futures[future] = worker
+
+        def assign_idle_workers() -> bool:
+            """Hand the next available todo to every idle worker."""
+            assigned = False
+            for worker in workers:
+                if worker.status == "running":
+                    continue
+
+                # Resume this worker's own interrupted todo first
+                with _state_lock:
+                    own = [
+                        todo_id for todo_id, entry in state.checkpoints.items()
+                        if entry["worker_id"] == worker.worker_id
+                    ]
+                for todo_id in own:
+                    claim_result = claim_todo(todo_id, worker.worker_id)
+                    if claim_result.success:
+                        start(worker, claim_result.data)
+                        assigned = True
+                        break
+                if worker.status == "running":
+                    continue
+
+                next_result = claim_next_todo(
+                    worker.worker_id,
+                    avoid_conflicts=options.get("avoid_conflicts", True)
+                )
+                if not next_result.success:
+                    continue
+
+                start(worker, next_result.data)
+                assigned = True
+            return assigned
+
+        def checkpoint():
+            with _state_lock:
+                state.workers = [w.to_dict() for w in workers]
+                save_coordinator_state(state)
+
+        # Initial assignment
+        assign_idle_workers()
+        checkpoint()
+
+        # React to each completion as it happens and refill idle workers.
+        # Leases abandoned by dead workers are swept on their own timer,
+        # whether or not completions keep arriving, and once more before
+        # exiting; when following a producer, wake up to pick up newly
+        # streamed todos.
+        poll_interval = FOLLOW_POLL_INTERVAL if follow else HEARTBEAT_INTERVAL
+        next_sweep = time.monotonic() + HEARTBEAT_INTERVAL
+
+        def sweep_expired() -> bool:
+            """Reclaim expired leases; whether any todo became claimable again."""
+            nonlocal next_sweep
+            next_sweep = time.monotonic() + HEARTBEAT_INTERVAL
+            sweep = reclaim_expired_todos()
+            return bool(sweep.success and sweep.data["reclaimed"])
+
+        while True:
+            if time.monotonic() >= next_sweep and sweep_expired() and assign_idle_workers():
+                checkpoint()
+
+            if not futures:
+                # Checked before claiming so todos appended just before the
+                # producer closed are not missed
+                producer_open = follow and queue_producer_open()
+                if assign_idle_workers():
+                    checkpoint()
+                    continue
+                if not producer_open:
+                    # Final sweep so reclaimable todos aren't left stranded
+                    if sweep_expired() and assign_idle_workers():
+                        checkpoint()
+                        continue
+                    break
+                time.sleep(min(poll_interval, max(0, next_sweep - time.monotonic())))
+                continue
+
+            timeout = min(poll_interval, max(0, next_sweep - time.monotonic()))
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                if follow and assign_idle_workers():
+                    checkpoint()
+                continue
+
+            for future in done:
+                worker = futures.pop(future)
+                todo_id = worker.todo["id"]
+
+                try:
+                    result = future.result()
+                    results.append(result)
+                    success = result["success"]
+                except Exception as e:
+                    log(f"Worker {worker.worker_id} error: {e}", level="error")
+                    success = False
+
+                complete_todo(todo_id, success=success)
+                with _state_lock:
+                    state.checkpoints.pop(todo_id, None)
+                    if success:
+                        state.completed_todos.append(todo_id)
+                    else:
+                        state.failed_todos.append(todo_id)
+                log(f"{'Completed' if success else 'Failed'}: {todo_id}")
+
+                worker.status = "idle"
+                worker.todo = None
+                worker.branch = None
+                worker.finished_at = timestamp()
+
+            # A completion may also unblock dependents for other idle workers
+            assign_idle_workers()
+            checkpoint()
+
+    # Phase 4: Cleanup
+    log("Phase 4: Cleanup...")
+    state.current_phase = "cleanup"
+    save_coordinator_state(state)
+
+    # Stop any remaining servers
+    stop_all_servers()
+
+    if browser_pool:
+        browser_pool.close()
+
+    # Restore git state
+    git_cleanup(project_path)
+
+    if total_todos is None:
+        queue_status = get_queue_status()
+        total_todos = queue_status.data["total"] if queue_status.success else len(results)
+
+    # Generate report
+    state.current_phase = "done"
+    report = {
+        "run_id": state.run_id,
+        "started_at": state.started_at,
+        "finished_at": timestamp(),
+        "project_path": project_path,
+        "total_todos": total_todos,
+        "completed": len(state.completed_todos),
+        "failed": len(state.failed_todos),
+        "success_rate": len(state.completed_todos) / total_todos * 100 if total_todos > 0 else 0,
+        "completed_todos": state.completed_todos,
+        "failed_todos": state.failed_todos,
+        "results": results
+    }
+
+    report_file = save_json(report, f"auto-dev/run_report_{state.run_id}.json")
+    save_coordinator_state(state)
+
+    log(f"Auto-dev run complete. {len(state.completed_todos)}/{total_todos} todos completed.")
+    return ExecutionResult.ok(data=report, report_file=str(report_file))
+
+
 def run_coordinator(
-    todos_path: str,
+    todos_path: Optional[str],
     project_path: str,
     max_agents: int = 3,
     base_port: int = 3001,
@@ -264,10 +655,24 @@ def run_coordinator(
     github_push: bool = True,
     run_tests: bool = True,
     timeout: int = 600,
-    dry_run: bool = False
+    dry_run: bool = False,
+    avoid_conflicts: bool = True,
+    warm_servers: bool = True,
+    criteria_concurrency: int = 1,
+    follow: bool = False
 ) -> ExecutionResult:
     """
     Main coordinator function that orchestrates the entire auto-dev process.
+
+    With avoid_conflicts, a todo is never handed to a worker while another
+    todo touching the same files is in progress. With warm_servers, each
+    worker keeps its dev server running across todos and only restarts it
+    after a crash or a config change.
+
+    With follow, no queue is created from todos_path: the coordinator works
+    on the queue that generate_todos.py --stream-to-queue is filling and
+    finishes once the producer is done. The producer decides which todos
+    are queued, so the priority, category and max_todos filters don't apply.
     """
     run_id = f"run_{timestamp()}"
     log(f"Starting auto-dev coordinator: {run_id}")
@@ -278,25 +683,47 @@ def run_coordinator(
         project_path=project_path,
         max_agents=max_agents,
         base_port=base_port,
-        started_at=timestamp()
+        started_at=timestamp(),
+        options={
+            "todos_path": todos_path,
+            "app_context": app_context,
+            "auto_merge": auto_merge,
+            "github_push": github_push,
+            "run_tests": run_tests,
+            "timeout": timeout,
+            "avoid_conflicts": avoid_conflicts,
+            "warm_servers": warm_servers,
+            "criteria_concurrency": criteria_concurrency,
+            "follow": follow
+        }
     )
 
     try:
-        # Phase 1: Create work queue
-        log("Phase 1: Creating work queue...")
-        queue_result = create_work_queue(
-            todos_path=todos_path,
-            priority_filter=priority_filter,
-            categories=categories,
-            max_todos=max_todos
-        )
+        if follow:
+            # Phase 1: Attach to the queue a producer is streaming into
+            log("Phase 1: Waiting for a todo producer to open the work queue...")
+            if not wait_for_producer():
+                if not get_queue_status().success:
+                    return ExecutionResult.fail(
+                        error=f"No todo producer opened the work queue within {FOLLOW_WAIT_TIMEOUT}s"
+                    )
+                log("No producer is running; processing the existing work queue", level="warning")
+        else:
+            # Phase 1: Create work queue
+            log("Phase 1: Creating work queue...")
+            queue_result = create_work_queue(
+                todos_path=todos_path,
+                priority_filter=priority_filter,
+                categories=categories,
+                max_todos=max_todos
+            )
 
-        if not queue_result.success:
-            return ExecutionResult.fail(error=f"Failed to create work queue: {queue_result.error}")
+            if not queue_result.success:
+                return ExecutionResult.fail(error=f"Failed to create work queue: {queue_result.error}")
 
         queue = load_work_queue()
         total_todos = queue["total_count"]
-        log(f"Work queue created with {total_todos} todos")
+        log(f"Work queue {'opened' if follow else 'created'} with {total_todos} todos")
 
         if dry_run:
             log("DRY RUN - Would process the following todos:")
@@ -304,7 +731,13 @@ def run_coordinator(
                 log(f"  {i+1}. [{todo['priority']}] {todo['title']} ({todo['category']})")
             if total_todos > 10:
                 log(f"  ... and {total_todos - 10} more")
-            return ExecutionResult.ok(data={"dry_run": True, "total_todos": total_todos})
+            waves = queue.get("waves", [])
+            log(f"Wave plan: {len(waves)} waves, sizes {[len(w) for w in waves[:10]]}")
+            return ExecutionResult.ok(data={
+                "dry_run": True,
+                "total_todos": total_todos,
+                "waves": len(waves)
+            })
 
         # Phase 2: Initialize git
         log("Phase 2: Initializing git state...")
@@ -315,140 +748,65 @@ def run_coordinator(
         state.current_phase = "running"
         save_coordinator_state(state)
 
-        # Phase 3: Process todos in parallel
-        log(f"Phase 3: Processing todos with up to {max_agents} parallel agents...")
+        return run_workers(state, None if follow else total_todos)
 
-        # Create worker pool
-        workers = [
-            AgentWorker(
-                worker_id=f"worker_{i}",
-                port=base_port + i
-            )
-            for i in range(max_agents)
-        ]
-
-        results = []
-
-        with ThreadPoolExecutor(max_workers=max_agents) as executor:
-            futures = {}
-            pending_todos = []
+    except KeyboardInterrupt:
+        log("Interrupted by user. Cleaning up...", level="warning")
+        stop_all_servers()
+        git_cleanup(project_path)
+        return ExecutionResult.fail(error="Interrupted by user")
 
-            # Initial assignment
-            for worker in workers:
-                next_result = get_next_todo()
-                if next_result.success:
-                    todo_data = next_result.data
-                    claim_todo(todo_data["id"], worker.worker_id)
-                    worker.todo = todo_data
-                    worker.status = "running"
-                    worker.started_at = timestamp()
-
-                    future = executor.submit(
-                        process_single_todo,
-                        worker,
-                        todo_data,
-                        project_path,
-                        app_context,
-                        auto_merge,
-                        github_push,
-                        run_tests,
-                        timeout
-                    )
-                    futures[future] = worker
-
-            # Process results and assign new work
-            while futures:
-                done = []
-                for future in list(futures.keys()):
-                    if future.done():
-                        done.append(future)
-
-                for future in done:
-                    worker = futures.pop(future)
-
-                    try:
-                        result = future.result()
-                        results.append(result)
-
-                        todo_id = result["todo_id"]
-                        if result["success"]:
-                            complete_todo(todo_id, success=True)
-                            state.completed_todos.append(todo_id)
-                            log(f"Completed: {todo_id}")
-                        else:
-                            complete_todo(todo_id, success=False)
-                            state.failed_todos.append(todo_id)
-                            log(f"Failed: {todo_id}")
-
-                    except Exception as e:
-                        log(f"Worker {worker.worker_id} error: {e}", level="error")
-
-                    # Assign new work to this worker
-                    worker.status = "idle"
-                    worker.todo = None
-                    worker.branch = None
-
-                    next_result = get_next_todo()
-                    if next_result.success:
-                        todo_data = next_result.data
-                        claim_todo(todo_data["id"], worker.worker_id)
-                        worker.todo = todo_data
-                        worker.status = "running"
-                        worker.started_at = timestamp()
-
-                        future = executor.submit(
-                            process_single_todo,
-                            worker,
-                            todo_data,
-                            project_path,
-                            app_context,
-                            auto_merge,
-                            github_push,
-                            run_tests,
-                            timeout
-                        )
-                        futures[future] = worker
+    except Exception as e:
+        log(f"Coordinator error: {e}", level="error")
+        stop_all_servers()
+        return ExecutionResult.fail(error=str(e))
 
-                save_coordinator_state(state)
-                time.sleep(1)  # Small delay to prevent busy waiting
 
-        # Phase 4: Cleanup
-        log("Phase 4: Cleanup...")
-        state.current_phase = "cleanup"
-        save_coordinator_state(state)
+def resume_coordinator(state: CoordinatorState) -> ExecutionResult:
+    """
+    Resume an interrupted run from coordinator_state.json.
 
-        # Stop any remaining servers
-        stop_all_servers()
+    Reuses the existing work queue, worker worktrees and git session (if
+    the main checkout is still as the session left it).
+    Todos left in progress go back to their original worker, which skips
+    the phases already checkpointed and reattaches to its dev server if it
+    is still running.
+    """
+    if state.current_phase == "done":
+        return ExecutionResult.fail(error=f"Run {state.run_id} already finished")
 
-        # Restore git state
-        git_cleanup(project_path)
+    log(f"Resuming auto-dev run: {state.run_id}")
 
-        # Generate report
-        state.current_phase = "done"
-        report = {
-            "run_id": run_id,
-            "started_at": state.started_at,
-            "finished_at": timestamp(),
-            "project_path": project_path,
-            "total_todos": total_todos,
-            "completed": len(state.completed_todos),
-            "failed": len(state.failed_todos),
-            "success_rate": len(state.completed_todos) / total_todos * 100 if total_todos > 0 else 0,
-            "completed_todos": state.completed_todos,
-            "failed_todos": state.failed_todos,
-            "results": results
-        }
+    try:
+        queue_status = get_queue_status()
+        if not queue_status.success:
+            return ExecutionResult.fail(error=f"Cannot resume: {queue_status.error}")
+        total_todos = None if state.options.get("follow") else queue_status.data["total"]
+
+        # Initialize git unless the previous session is still in place
+        # (never got that far, was cleaned up, or the checkout was moved)
+        git_state = load_git_state()
+        if git_state is not None and not git_session_intact(state.project_path, git_state):
+            log("Main checkout no longer matches the saved git session; re-initializing", level="warning")
+            git_state = None
+        if git_state is None:
+            git_result = init_git_state(state.project_path)
+            if not git_result.success:
+                return ExecutionResult.fail(error=f"Failed to initialize git: {git_result.error}")
+
+        # Free todos the previous run left in progress so they can be re-claimed
+        for todo_id in list(state.checkpoints):
+            release_todo(todo_id)
 
-        report_file = save_json(report, f"auto-dev/run_report_{run_id}.json")
+        state.current_phase = "running"
         save_coordinator_state(state)
 
-        log(f"Auto-dev run complete. {len(state.completed_todos)}/{total_todos} todos completed.")
-        return ExecutionResult.ok(data=report, report_file=str(report_file))
+        return run_workers(state, total_todos)
 
     except KeyboardInterrupt:
         log("Interrupted by user. Cleaning up...", level="warning")
         stop_all_servers()
-        git_cleanup(project_path)
+        git_cleanup(state.project_path)
         return ExecutionResult.fail(error="Interrupted by user")
 
     except Exception as e:
@@ -476,17 +834,18 @@ Examples:
 
   # Dry run
   python execution/agent_coordinator.py --todos .tmp/todos/video.json --project ./my-app --dry-run
+
+  # Follow todos streamed by generate_todos.py --stream-to-queue
+  python execution/agent_coordinator.py --follow --project ./my-app
         """
     )
     parser.add_argument(
         "--todos",
-        required=True,
-        help="Path to todos JSON file"
+        help="Path to todos JSON file (required unless --resume or --follow)"
     )
     parser.add_argument(
         "--project",
-        required=True,
-        help="Path to the project directory"
+        help="Path to the project directory (required unless --resume)"
     )
     parser.add_argument(
         "--max-agents",
@@ -504,7 +863,7 @@ Examples:
         "--priority-filter",
         type=int,
         default=1,
-        help="Minimum priority (1-5, default: 1)"
+        help="Minimum priority (1-5, 5 = most important, default: 1)"
     )
     parser.add_argument(
         "--categories",
@@ -541,6 +900,28 @@ Examples:
         default=600,
         help="Agent timeout in seconds (default: 600)"
     )
+    parser.add_argument(
+        "--allow-conflicts",
+        action="store_true",
+        help="Allow todos touching the same files to run concurrently"
+    )
+    parser.add_argument(
+        "--criteria-concurrency",
+        type=int,
+        default=1,
+        help="Acceptance criteria to test at once, each in its own page (default: 1)"
+    )
+    parser.add_argument(
+        "--cold-servers",
+        action="store_true",
+        help="Restart the dev server for every todo instead of keeping it warm"
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Work on the queue generate_todos.py --stream-to-queue is filling, "
+             "until it finishes"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -561,8 +942,12 @@ Examples:
         if not state:
             print(ExecutionResult.fail(error="No previous run to resume").to_json())
             sys.exit(1)
-        # TODO: Implement resume logic
-        print(ExecutionResult.fail(error="Resume not yet implemented").to_json())
+        result = resume_coordinator(state)
+        print(result.to_json())
+        sys.exit(0 if result.success else 1)
+
+    if not (args.todos or args.follow) or not args.project:
+        print(ExecutionResult.fail(error="--todos (or --follow) and --project are required").to_json())
         sys.exit(1)
 
     # Parse categories
@@ -582,7 +967,11 @@ Examples:
         github_push=not args.no_push,
         run_tests=not args.no_tests,
         timeout=args.timeout,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        avoid_conflicts=not args.allow_conflicts,
+        warm_servers=not args.cold_servers,
+        criteria_concurrency=args.criteria_concurrency,
+        follow=args.follow
     )
 
     print(result.to_json())
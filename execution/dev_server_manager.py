@@ -22,26 +22,118 @@ Usage:
         --action stop \
         --port 3001
 
+    # Start a server, or reuse the healthy one already running for this
+    # project and port if its config hasn't changed
+    python execution/dev_server_manager.py \
+        --action ensure \
+        --project /path/to/project \
+        --port 3001
+
     # Stop all managed servers
     python execution/dev_server_manager.py --action stop-all
 """
 
 import argparse
+import ctypes
+import ctypes.util
+import hashlib
 import json
 import os
+import re
+import select
 import signal
 import subprocess
 import sys
+import threading
 import time
 import socket
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from dataclasses import dataclass
 import requests
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils import load_env, log, save_json, load_json, get_tmp_path, ExecutionResult, timestamp
+from port_allocator import reserve_port, update_reservation, release_port, list_reservations
+
+# flock is POSIX-only; elsewhere only threads in this process are serialized
+fcntl_available = True
+try:
+    import fcntl
+except ImportError:
+    fcntl_available = False
+
+SERVERS_STATE_FILE = "auto-dev/servers_state.json"
+SERVERS_STATE_LOCK_FILE = "auto-dev/servers_state.lock"
+
+_state_thread_lock = threading.Lock()
+
+
+# Files whose changes require a dev server restart (dependencies, bundler
+# and framework config, env). Source edits are left to file watching/HMR.
+SERVER_CONFIG_FILES = [
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "app.json",
+    "app.config.js",
+    "app.config.ts",
+    "metro.config.js",
+    "babel.config.js",
+    "next.config.js",
+    "next.config.mjs",
+    "vite.config.js",
+    "vite.config.ts",
+    "tsconfig.json",
+    ".env",
+    "requirements.txt",
+]
+
+
+# Log lines that mean the server is up (confirmed with an HTTP probe),
+# keyed by the project type from detect_project_type
+READY_PATTERNS = {
+    "expo": r"Waiting on https?://|Web is waiting on|Metro waiting on|Web Bundled",
+    "nextjs": r"Ready in|ready - started server|Local:\s+https?://",
+    "vite": r"Local:\s+https?://|ready in \d+",
+    "cra": r"Compiled successfully|webpack compiled|You can now view",
+    "npm": r"Local:\s+https?://|listening on|ready in|compiled successfully",
+    "django": r"Starting development server at",
+    "flask": r"Running on https?://",
+    "static": r"Serving HTTP on",
+}
+
+# Log lines that mean the server will never become ready
+COMMON_ERROR_PATTERNS = [
+    r"EADDRINUSE",
+    r"[Aa]ddress already in use",
+    r"command not found",
+    r"npm ERR!",
+    r"Cannot find module",
+]
+ERROR_PATTERNS = {
+    "expo": [r"CommandError:"],
+    "vite": [r"error when starting dev server"],
+    "cra": [r"Something is already running on port"],
+    "django": [r"Traceback \(most recent call last\)", r"ImproperlyConfigured", r"That port is already in use"],
+    "flask": [r"Traceback \(most recent call last\)", r"Could not locate a Flask application"],
+    "static": [r"Traceback \(most recent call last\)"],
+}
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+# HTTP readiness probe: exponential backoff between attempts
+PROBE_INITIAL_DELAY = 0.1
+PROBE_MAX_DELAY = 2.0
+PROBE_TIMEOUT = 2
+
+# Log polling interval when inotify is not available
+LOG_POLL_INTERVAL = 0.1
+
+IN_MODIFY = 0x2
 
 
 @dataclass
@@ -111,32 +203,78 @@ def detect_project_type(project_path: str) -> tuple:
     return ("unknown", None, 3000)
 
 
+def config_fingerprint(project_path: str, command: Optional[str] = None) -> str:
+    """
+    Hash the start command and the contents of the project's config files.
+
+    A running server can keep serving across branch switches as long as
+    this fingerprint is unchanged.
+    """
+    project = Path(project_path)
+    digest = hashlib.sha256((command or "").encode())
+    for name in SERVER_CONFIG_FILES:
+        path = project / name
+        if path.is_file():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
 def is_port_in_use(port: int) -> bool:
     """Check if a port is already in use."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
 
-def find_available_port(start_port: int, max_attempts: int = 100) -> int:
-    """Find an available port starting from start_port."""
-    for offset in range(max_attempts):
-        port = start_port + offset
-        if not is_port_in_use(port):
-            return port
-    raise RuntimeError(f"No available ports found in range {start_port}-{start_port + max_attempts}")
-
-
-def get_servers_state() -> Dict[int, dict]:
-    """Load the current servers state from file."""
-    try:
-        return load_json("auto-dev/servers_state.json")
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
+@contextmanager
+def _locked_servers_state() -> Iterator[Dict[str, dict]]:
+    """
+    Yield the servers state under an exclusive lock.
 
-def save_servers_state(state: Dict[int, dict]):
-    """Save the servers state to file."""
-    save_json(state, "auto-dev/servers_state.json")
+    Worker threads and other coordinators read-modify-write the same file,
+    so every access holds the lock (fcntl.flock where available, plus a
+    thread lock), as port_allocator does. Changes made to the yielded dict
+    are written back atomically on exit.
+    """
+    path = get_tmp_path(SERVERS_STATE_FILE)
+    with _state_thread_lock, open(get_tmp_path(SERVERS_STATE_LOCK_FILE), "a") as lock_handle:
+        if fcntl_available:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+        try:
+            try:
+                state = json.loads(path.read_text())
+            except FileNotFoundError:
+                state = {}
+            except json.JSONDecodeError as e:
+                # Writes are atomic, so this is outside interference; keep
+                # the file for inspection rather than silently dropping it
+                corrupt = path.with_name(f"{path.name}.corrupt")
+                os.replace(path, corrupt)
+                log(f"Servers state was unreadable ({e}); moved to {corrupt}", level="warning")
+                state = {}
+
+            before = json.dumps(state, sort_keys=True, default=str)
+            yield state
+            if json.dumps(state, sort_keys=True, default=str) != before:
+                temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                temp_path.write_text(json.dumps(state, indent=2, default=str))
+                os.replace(temp_path, path)
+        finally:
+            if fcntl_available:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+
+def get_servers_state() -> Dict[str, dict]:
+    """Load a snapshot of the current servers state."""
+    with _locked_servers_state() as state:
+        return dict(state)
+
+
+def save_servers_state(state: Dict[str, dict]):
+    """Replace the servers state."""
+    with _locked_servers_state() as current:
+        current.clear()
+        current.update(state)
 
 
 def start_server(
@@ -161,14 +299,15 @@ def start_server(
     """
     project_path = str(Path(project_path).resolve())
 
-    # Check if port is available
-    if is_port_in_use(port):
-        # Try to find an available port
-        try:
-            port = find_available_port(port)
-            log(f"Port was in use, using port {port} instead")
-        except RuntimeError as e:
-            return ExecutionResult.fail(error=str(e))
+    # Reserve the port (or the next free one) so no other worker or
+    # coordinator can take it before the server binds
+    requested_port = port
+    try:
+        port = reserve_port(requested_port, owner=project_path)
+    except RuntimeError as e:
+        return ExecutionResult.fail(error=str(e))
+    if port != requested_port:
+        log(f"Port was in use, using port {port} instead")
 
     # Detect project type
     project_type, default_command, _ = detect_project_type(project_path)
@@ -177,6 +316,7 @@ def start_server(
     # Determine start command
     command = command_override or default_command
     if not command:
+        release_port(port)
         return ExecutionResult.fail(
             error=f"Could not determine start command for project type: {project_type}"
         )
@@ -186,8 +326,7 @@ def start_server(
     log(f"Start command: {command}")
 
     # Create log file
-    log_dir = get_tmp_path("auto-dev/server_logs")
-    log_file = log_dir / f"server_{port}.log"
+    log_file = get_tmp_path(f"auto-dev/server_logs/server_{port}.log")
 
     try:
         # Open log file
@@ -203,6 +342,9 @@ def start_server(
             preexec_fn=os.setsid if os.name != 'nt' else None
         )
 
+        # The reservation now lives as long as the server process
+        update_reservation(port, process.pid)
+
         url = f"http://localhost:{port}"
 
         # Save server info
@@ -214,25 +356,31 @@ def start_server(
             "started_at": timestamp(),
             "url": url,
             "project_type": project_type,
-            "log_file": str(log_file)
+            "log_file": str(log_file),
+            "config_hash": config_fingerprint(project_path, command)
         }
 
         # Update state
-        state = get_servers_state()
-        state[str(port)] = server_info
-        save_servers_state(state)
+        with _locked_servers_state() as state:
+            state[str(port)] = server_info
 
         log(f"Started server on port {port} (PID: {process.pid})")
 
         # Wait for server to be ready
         if wait_for_ready:
             log(f"Waiting for server to be ready at {url}...")
-            ready = wait_for_server_ready(url, ready_timeout)
+            ready, reason = watch_server_startup(
+                url,
+                log_file=log_file,
+                project_type=project_type,
+                timeout=ready_timeout,
+                process=process
+            )
             if not ready:
                 # Server didn't start properly
                 stop_server(port)
                 return ExecutionResult.fail(
-                    error=f"Server failed to become ready within {ready_timeout}s",
+                    error=reason,
                     log_file=str(log_file)
                 )
             log("Server is ready")
@@ -245,21 +393,151 @@ def start_server(
 
     except Exception as e:
         log(f"Failed to start server: {e}", level="error")
+        release_port(port)
         return ExecutionResult.fail(error=str(e))
 
 
 def wait_for_server_ready(url: str, timeout: int = 60) -> bool:
     """Wait for the server to respond to requests."""
-    start = time.time()
-    while time.time() - start < timeout:
+    ready, _ = watch_server_startup(url, timeout=timeout)
+    return ready
+
+
+def _inotify_watch(path: Path) -> Optional[int]:
+    """
+    Open an inotify descriptor watching path for writes (Linux only).
+
+    Returns:
+        The descriptor, or None if inotify is unavailable
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, str(path).encode(), IN_MODIFY) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class LogWatcher:
+    """Read lines appended to a log file, blocking until it changes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset = 0
+        self.partial = ""
+        self.inotify_fd = _inotify_watch(self.path)
+
+    def read_lines(self) -> List[str]:
+        """Return the complete lines written since the last call."""
         try:
-            response = requests.get(url, timeout=5)
-            if response.status_code < 500:
-                return True
-        except requests.exceptions.RequestException:
-            pass
-        time.sleep(1)
-    return False
+            with open(self.path, "r", errors="replace") as f:
+                f.seek(self.offset)
+                chunk = f.read()
+                self.offset = f.tell()
+        except FileNotFoundError:
+            return []
+
+        lines = (self.partial + chunk).split("\n")
+        self.partial = lines.pop()
+        return [ANSI_ESCAPE.sub("", line) for line in lines]
+
+    def wait(self, timeout: float):
+        """Block until the log grows or timeout seconds pass."""
+        if timeout <= 0:
+            return
+        if self.inotify_fd is not None:
+            readable, _, _ = select.select([self.inotify_fd], [], [], timeout)
+            if readable:
+                try:
+                    os.read(self.inotify_fd, 4096)
+                except BlockingIOError:
+                    pass
+            return
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                if self.path.stat().st_size != self.offset:
+                    return
+            except FileNotFoundError:
+                pass
+            time.sleep(min(LOG_POLL_INTERVAL, max(0, deadline - time.time())))
+
+    def close(self):
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+
+def watch_server_startup(
+    url: str,
+    log_file: Optional[Path] = None,
+    project_type: Optional[str] = None,
+    timeout: int = 60,
+    process: Optional[subprocess.Popen] = None
+) -> Tuple[bool, str]:
+    """
+    Wait for a starting server to become ready.
+
+    Tails the server log for the project type's ready/error patterns while
+    probing the URL over a pooled HTTP connection with exponential backoff.
+    A ready line triggers an immediate probe; an error line, or the process
+    exiting, fails right away instead of waiting out the timeout.
+
+    Returns:
+        Tuple of (ready, reason)
+    """
+    ready_pattern = READY_PATTERNS.get(project_type)
+    ready_re = re.compile(ready_pattern) if ready_pattern else None
+    error_re = re.compile("|".join(COMMON_ERROR_PATTERNS + ERROR_PATTERNS.get(project_type, [])))
+
+    deadline = time.time() + timeout
+    next_probe = time.time()
+    delay = PROBE_INITIAL_DELAY
+    watcher = LogWatcher(log_file) if log_file else None
+
+    session = requests.Session()
+    try:
+        while True:
+            for line in watcher.read_lines() if watcher else []:
+                if error_re.search(line):
+                    return False, f"Server reported an error: {line.strip()}"
+                if ready_re and ready_re.search(line):
+                    next_probe = time.time()
+
+            if process is not None and process.poll() is not None:
+                return False, f"Server exited with code {process.returncode}"
+
+            now = time.time()
+            if now >= next_probe:
+                try:
+                    if session.get(url, timeout=PROBE_TIMEOUT).status_code < 500:
+                        return True, "ready"
+                except requests.exceptions.RequestException:
+                    pass
+                now = time.time()
+                next_probe = now + delay
+                delay = min(delay * 2, PROBE_MAX_DELAY)
+
+            if now >= deadline:
+                return False, f"Server failed to become ready within {timeout}s"
+
+            wait_for = min(next_probe, deadline) - now
+            if watcher:
+                watcher.wait(wait_for)
+            else:
+                time.sleep(max(0, wait_for))
+    finally:
+        session.close()
+        if watcher:
+            watcher.close()
 
 
 def check_server_health(port: int) -> ExecutionResult:
@@ -304,10 +582,88 @@ def check_server_health(port: int) -> ExecutionResult:
     )
 
 
+def reattach_server(project_path: str, port: int) -> ExecutionResult:
+    """
+    Reattach to a healthy server already registered for this project and port.
+
+    Used when a coordinator restarts while its dev servers keep running, and
+    by ensure_server to reuse a warm server across todos. A server whose
+    config files changed since it started is not reused.
+
+    Returns:
+        ExecutionResult with the registered server info, or failure if there
+        is no healthy server to reuse
+    """
+    project_path = str(Path(project_path).resolve())
+    server_info = get_servers_state().get(str(port))
+
+    if not server_info or server_info.get("project_path") != project_path:
+        return ExecutionResult.fail(error=f"No server for {project_path} on port {port}")
+
+    health = check_server_health(port)
+    if not health.success or not health.data["healthy"]:
+        return ExecutionResult.fail(error=f"Server on port {port} is not healthy")
+
+    fingerprint = config_fingerprint(project_path, server_info.get("start_command"))
+    if server_info.get("config_hash") != fingerprint:
+        return ExecutionResult.fail(error=f"Config changed for server on port {port}")
+
+    log(f"Reattached to server on port {port} (PID: {server_info['pid']})")
+    return ExecutionResult.ok(
+        data=server_info,
+        url=server_info["url"],
+        pid=server_info["pid"],
+        reattached=True
+    )
+
+
+def ensure_server(
+    project_path: str,
+    port: int,
+    command_override: Optional[str] = None,
+    ready_timeout: int = 60
+) -> ExecutionResult:
+    """
+    Return a ready dev server for the project on the given port.
+
+    Reuses the server already running there when it is healthy and its
+    config is unchanged, so the bundler stays warm and picks up branch
+    switches through file watching. Otherwise (crash or config change) the
+    old server is stopped and a new one started; if another project holds
+    the port, the new server gets the next free port.
+
+    Returns:
+        ExecutionResult with server info; data["reused"] tells which case
+    """
+    reattached = reattach_server(project_path, port)
+    if reattached.success:
+        return ExecutionResult.ok(
+            data={**reattached.data, "reused": True},
+            url=reattached.data["url"],
+            pid=reattached.data["pid"]
+        )
+
+    # Only replace our own stale server; a port held by another project's
+    # server is left alone and start_server reserves the next free one
+    registered = get_servers_state().get(str(port))
+    if registered and registered.get("project_path") == str(Path(project_path).resolve()):
+        log(f"Restarting server on port {port}: {reattached.error}")
+        stop_server(port)
+
+    result = start_server(
+        project_path,
+        port,
+        command_override=command_override,
+        ready_timeout=ready_timeout
+    )
+    if result.success:
+        result.data["reused"] = False
+    return result
+
+
 def stop_server(port: int) -> ExecutionResult:
     """Stop a server running on the given port."""
-    state = get_servers_state()
-    server_info = state.get(str(port))
+    server_info = get_servers_state().get(str(port))
 
     if not server_info:
         # Try to kill any process on that port anyway
@@ -323,6 +679,7 @@ def stop_server(port: int) -> ExecutionResult:
                 log(f"Killed process on port {port}")
             except Exception:
                 pass
+        release_port(port)
         return ExecutionResult.ok(data={"port": port, "stopped": True, "was_registered": False})
 
     pid = server_info.get("pid")
@@ -348,9 +705,13 @@ def stop_server(port: int) -> ExecutionResult:
     except (OSError, ProcessLookupError):
         log(f"Process {pid} already terminated")
 
-    # Remove from state
-    del state[str(port)]
-    save_servers_state(state)
+    # Remove from state, unless a new server was registered meanwhile
+    with _locked_servers_state() as state:
+        removed = state.get(str(port), {}).get("pid") == pid
+        if removed:
+            del state[str(port)]
+    if removed:
+        release_port(port)
 
     return ExecutionResult.ok(
         data={
@@ -382,7 +743,7 @@ def stop_all_servers() -> ExecutionResult:
 
 
 def list_servers() -> ExecutionResult:
-    """List all managed servers with their status."""
+    """List all managed servers with their status and the reserved ports."""
     state = get_servers_state()
     servers = []
 
@@ -396,7 +757,8 @@ def list_servers() -> ExecutionResult:
     return ExecutionResult.ok(
         data={
             "servers": servers,
-            "count": len(servers)
+            "count": len(servers),
+            "port_reservations": list_reservations()
         }
     )
 
@@ -406,12 +768,12 @@ def main():
     parser.add_argument(
         "--action",
         required=True,
-        choices=["start", "stop", "stop-all", "health", "list"],
+        choices=["start", "ensure", "stop", "stop-all", "health", "list"],
         help="Action to perform"
     )
     parser.add_argument(
         "--project",
-        help="Path to the project (for start)"
+        help="Path to the project (for start/ensure)"
     )
     parser.add_argument(
         "--port",
@@ -453,6 +815,20 @@ def main():
             ready_timeout=args.timeout
         )
 
+    elif args.action == "ensure":
+        if not args.project:
+            print(ExecutionResult.fail(
+                error="--project required for ensure action"
+            ).to_json())
+            sys.exit(1)
+
+        result = ensure_server(
+            project_path=args.project,
+            port=args.port,
+            command_override=args.command,
+            ready_timeout=args.timeout
+        )
+
     elif args.action == "stop":
         result = stop_server(args.port)
 
@@ -4,19 +4,84 @@ Todo Generation Script using OpenAI GPT-4.
 Analyzes video transcripts to generate structured, actionable todos
 for app development and enhancement.
 
+Transcripts are chunked on segment boundaries, packed against a token
+budget (--chunk-tokens; tiktoken if installed, otherwise a fast
+word-piece estimate), with the last few segments of each chunk repeated
+at the start of the next (--overlap-segments) for context. Todos a chunk
+reports from its repeated context are dropped at merge time, since the
+chunk that owns that time range reports them.
+
+Transcript chunks are analyzed concurrently (--concurrency) under a shared
+requests/tokens-per-minute limiter (--rpm, --tpm), with jittered backoff on
+rate limits; results are merged in chunk order.
+
+Responses are cached in .tmp/cache/llm_responses/ keyed by a hash of the
+full request (model, prompts, parameters) for a week, so re-running with a
+different --format or --max-todos costs no API calls (--no-cache bypasses).
+
+--incremental reuses an earlier JSON output for the same video: segments
+it already analyzed (by fingerprint, recorded in "analyzed_segments") are
+skipped, only new segments plus a few preceding ones for context are
+sent, and new todos are merged in. Existing todos keep their IDs, which
+the agent work queue is keyed on; new todos are numbered from the
+output's "next_id" high-water mark, so no ID is ever reused. Existing
+todos always survive --max-todos; segments whose new todos didn't fit
+stay unanalyzed, so a later run picks them up again.
+
+--stream-to-queue feeds the auto-dev work queue while analysis is still
+running: as each chunk's response arrives its todos are deduplicated,
+given their final IDs and appended to the queue, so agents started with
+`agent_coordinator.py --follow` begin on the first todos immediately.
+--max-todos selects the same todos for the queue and the JSON.
+
+Near-duplicate todos are found with MinHash signatures over title words
+and LSH banding (near-linear instead of comparing every pair), confirmed
+with the word-overlap rule, and merged into the first occurrence.
+
 Usage:
     python execution/generate_todos.py \
         --transcript .tmp/transcripts/video_20240115.json \
         --context "React Native hiking app with premium features" \
         --format markdown
+
+    # After the transcript grew: analyze only the new segments
+    python execution/generate_todos.py \
+        --transcript .tmp/transcripts/video_20240116.json \
+        --context "React Native hiking app with premium features" \
+        --incremental
+
+    # Hand todos to running agents as soon as each chunk is analyzed
+    python execution/generate_todos.py \
+        --transcript .tmp/transcripts/video_20240115.json \
+        --context "React Native hiking app with premium features" \
+        --stream-to-queue
 """
 
 import argparse
+import bisect
+import hashlib
 import json
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from openai import (
+    OpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError
+)
 
-from openai import OpenAI
+# tiktoken gives exact counts; without it tokens are estimated
+tiktoken_available = True
+try:
+    import tiktoken
+except ImportError:
+    tiktoken_available = False
 
 from utils import (
     load_env,
@@ -25,13 +90,60 @@ from utils import (
     load_json,
     get_tmp_path,
     timestamp,
-    ExecutionResult
+    ExecutionResult,
+    DiskCache,
+    RateLimiter,
+    content_hash,
+    retry_with_backoff
+)
+from todo_processor import (
+    open_streaming_queue,
+    append_to_work_queue,
+    update_queued_todo,
+    close_streaming_queue
 )
 
 
 # GPT-4 context window considerations
 MAX_TRANSCRIPT_CHARS = 100000  # Leave room for prompt and response
-CHUNK_SIZE = 80000  # Size for transcript chunks if too long
+CHUNK_SIZE = 80000  # Size for transcript chunks if too long (plain-text transcripts)
+# Transcript tokens per request when chunking by segment
+CHUNK_TOKEN_BUDGET = 30000
+# Segments repeated from the end of one chunk at the start of the next
+SEGMENT_OVERLAP = 3
+# Already-analyzed segments sent as context before new ones (incremental mode)
+INCREMENTAL_CONTEXT_SEGMENTS = 5
+
+# Chunks analyzed at once
+DEFAULT_CONCURRENCY = 4
+# Default rate limits (gpt-4o, usage tier 2); lower them for smaller tiers
+DEFAULT_RPM = 500
+DEFAULT_TPM = 450000
+# Completion tokens reserved per request until real usage is known
+RESPONSE_TOKEN_ESTIMATE = 4000
+# Retries per chunk on rate limits and transient API errors
+MAX_RETRIES = 5
+# LLM response cache: entries expire after a week, LRU beyond the size cap
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 100 * 1024 * 1024
+# Sampling parameters sent with every analysis request (part of the cache key)
+COMPLETION_PARAMS = {
+    "temperature": 0.3,  # Lower temp for more consistent extraction
+    "response_format": {"type": "json_object"}
+}
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Titles sharing more than this fraction of words (of the longer title) are duplicates
+DUPLICATE_THRESHOLD = 0.7
+# LSH banding: 20 bands of 3 MinHash rows; pairs at the threshold's
+# Jaccard (~0.54) become candidates ~97% of the time
+LSH_BANDS = 20
+LSH_ROWS = 3
+# List fields combined when duplicates are merged
+MERGED_LIST_FIELDS = ("acceptance_criteria", "raw_quotes", "suggested_files")
+
+_MERSENNE_PRIME = (1 << 61) - 1
 
 
 SYSTEM_PROMPT = """You are an expert software development analyst. Your job is to analyze video transcripts (from tutorials, feature demos, bug reports, user feedback sessions, etc.) and extract actionable development todos.
@@ -82,21 +194,65 @@ Output your response as valid JSON matching this schema:
 }"""
 
 
+@dataclass
+class TranscriptChunk:
+    """
+    Formatted transcript text sent in one request.
+
+    Segments before owned_start repeat the end of the previous chunk as
+    context; the chunk is responsible for todos from owned_start up to
+    owned_end (the next chunk's owned_start, None for the last chunk).
+    """
+    text: str
+    start: float = 0.0
+    owned_start: float = 0.0
+    owned_end: Optional[float] = None
+
+    @property
+    def has_context(self) -> bool:
+        return self.start < self.owned_start
+
+    def owns(self, seconds: Optional[float]) -> bool:
+        """Whether a todo starting at seconds belongs to this chunk (None: unknown, kept)."""
+        if seconds is None:
+            return True
+        # Timestamps shown to the model are whole seconds
+        if seconds < int(self.owned_start):
+            return False
+        return self.owned_end is None or seconds < int(self.owned_end)
+
+
+def format_timestamp(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    return f"[{minutes:02d}:{int(seconds % 60):02d}]"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Seconds of the first MM:SS or HH:MM:SS in a todo's timestamp field."""
+    match = re.search(r"(\d+):(\d{2})(?::(\d{2}))?", value or "")
+    if not match:
+        return None
+    first, second, third = match.groups()
+    if third is not None:
+        return int(first) * 3600 + int(second) * 60 + int(third)
+    return int(first) * 60 + int(second)
+
+
+def format_segment(segment: dict) -> Optional[str]:
+    """One transcript line, "[MM:SS] text", or None for empty segments."""
+    text = segment.get("text", "").strip()
+    if not text:
+        return None
+    return f"{format_timestamp(segment.get('start', 0))} {text}"
+
+
 def format_transcript_for_llm(transcript: dict) -> str:
     """Format transcript data for LLM consumption."""
     segments = transcript.get("segments", [])
 
     if segments:
         # Include timestamps if available
-        formatted_parts = []
-        for segment in segments:
-            start = segment.get("start", 0)
-            minutes = int(start // 60)
-            seconds = int(start % 60)
-            timestamp_str = f"[{minutes:02d}:{seconds:02d}]"
-            text = segment.get("text", "").strip()
-            if text:
-                formatted_parts.append(f"{timestamp_str} {text}")
+        formatted_parts = [line for line in map(format_segment, segments) if line]
         return "\n".join(formatted_parts)
     else:
         # Fall back to plain text
@@ -129,6 +285,91 @@ def chunk_transcript(transcript_text: str, chunk_size: int = CHUNK_SIZE) -> List
     return chunks
 
 
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+_encoder = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count of text for chunk budgets and rate limiting.
+
+    Exact with tiktoken (o200k_base, as used by gpt-4o) when it's installed
+    and its encoding can be loaded; otherwise every word or punctuation
+    mark counts as one token plus one per further 8 characters, which
+    slightly overestimates BPE counts for English speech.
+    """
+    global _encoder
+    if tiktoken_available and _encoder is None:
+        try:
+            _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            # The encoding is downloaded on first use; offline, estimate
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text, disallowed_special=()))
+    return sum(1 + len(piece) // 8 for piece in _TOKEN_PIECES.findall(text))
+
+
+def segment_fingerprint(segment: dict) -> str:
+    """Identity of a transcript segment: its start time and normalized text."""
+    text = " ".join(segment.get("text", "").lower().split())
+    return content_hash(round(float(segment.get("start", 0)), 1), text)[:16]
+
+
+def _segment_lines(segments: List[dict]) -> List[Tuple[float, str, int]]:
+    lines = []
+    for segment in segments:
+        line = format_segment(segment)
+        if line:
+            lines.append((float(segment.get("start", 0)), line, estimate_tokens(line) + 1))
+    return lines
+
+
+def chunk_segments(
+    segments: List[dict],
+    token_budget: int = CHUNK_TOKEN_BUDGET,
+    overlap: int = SEGMENT_OVERLAP,
+    lead_context: Optional[List[dict]] = None
+) -> List[TranscriptChunk]:
+    """
+    Pack transcript segments into chunks of at most token_budget tokens.
+
+    Chunks only break between segments, so every line keeps its [MM:SS]
+    timestamp. Each chunk after the first starts with the last `overlap`
+    segments of the previous one as context (trimmed to half the budget);
+    lead_context segments, if given, play that role for the first chunk.
+    Every chunk owns at least one new segment, even if that segment alone
+    exceeds the budget.
+    """
+    lines = _segment_lines(segments)
+    leading = _segment_lines(lead_context or [])
+
+    chunks: List[TranscriptChunk] = []
+    i = 0
+    while i < len(lines):
+        context = lines[max(0, i - overlap):i] if chunks else leading
+        while context and sum(tokens for _, _, tokens in context) > token_budget // 2:
+            context = context[1:]
+
+        used = sum(tokens for _, _, tokens in context)
+        end = i
+        while end < len(lines) and (end == i or used + lines[end][2] <= token_budget):
+            used += lines[end][2]
+            end += 1
+
+        included = context + lines[i:end]
+        chunks.append(TranscriptChunk(
+            text="\n".join(line for _, line, _ in included),
+            start=included[0][0],
+            owned_start=lines[i][0]
+        ))
+        i = end
+
+    for current, following in zip(chunks, chunks[1:]):
+        current.owned_end = following.owned_start
+    return chunks
+
+
 def analyze_transcript_chunk(
     client: OpenAI,
     transcript_text: str,
@@ -136,9 +377,20 @@ def analyze_transcript_chunk(
     focus_areas: Optional[List[str]] = None,
     chunk_index: int = 0,
     total_chunks: int = 1,
-    model: str = "gpt-4o"
+    model: str = "gpt-4o",
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[DiskCache] = None,
+    context_until: Optional[str] = None
 ) -> dict:
-    """Analyze a transcript chunk with GPT-4."""
+    """
+    Analyze a transcript chunk with GPT-4.
+
+    Every attempt (including retries) waits for the limiter, and rate
+    limits and transient API errors are retried with jittered backoff.
+    With a cache, an identical earlier request is answered from disk.
+    context_until names the first timestamp this chunk is responsible for;
+    earlier lines repeat the previous chunk.
+    """
 
     focus_instruction = ""
     if focus_areas:
@@ -147,6 +399,8 @@ def analyze_transcript_chunk(
     chunk_note = ""
     if total_chunks > 1:
         chunk_note = f"\n\nThis is chunk {chunk_index + 1} of {total_chunks}. Focus on this portion but maintain consistency with overall themes."
+    if context_until:
+        chunk_note += f" Lines before {context_until} repeat the end of the previous chunk for context only; extract todos discussed from {context_until} onward."
 
     user_prompt = f"""Analyze this video transcript and extract development todos for the following app:
 
@@ -159,67 +413,453 @@ def analyze_transcript_chunk(
 
 Extract all actionable development items as structured todos. Return valid JSON only."""
 
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+    key = content_hash(model, messages, COMPLETION_PARAMS) if cache else None
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        log(f"Chunk {chunk_index + 1}/{total_chunks}: using cached analysis")
+        return cached
+
     log(f"Analyzing transcript chunk {chunk_index + 1}/{total_chunks} with {model}")
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt}
-        ],
-        temperature=0.3,  # Lower temp for more consistent extraction
-        response_format={"type": "json_object"}
+    estimated = estimate_tokens(SYSTEM_PROMPT + user_prompt) + RESPONSE_TOKEN_ESTIMATE
+
+    def complete():
+        if limiter:
+            limiter.acquire(estimated)
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            **COMPLETION_PARAMS
+        )
+        if limiter and getattr(response, "usage", None):
+            limiter.record_usage(estimated, response.usage.total_tokens)
+        return response
+
+    response = retry_with_backoff(
+        complete,
+        is_retryable=lambda e: isinstance(e, RETRYABLE_ERRORS),
+        max_retries=MAX_RETRIES,
+        description=f"Chunk {chunk_index + 1}/{total_chunks}"
     )
 
     result_text = response.choices[0].message.content
-    return json.loads(result_text)
+    result = json.loads(result_text)
+    if cache:
+        cache.set(key, result)
+    return result
 
 
-def merge_todo_results(results: List[dict]) -> dict:
-    """Merge todos from multiple chunks, deduplicating similar items."""
-    all_todos = []
-    seen_titles = set()
+def get_llm_cache() -> DiskCache:
+    return DiskCache("llm_responses", max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL)
 
-    for result in results:
-        for todo in result.get("todos", []):
-            # Simple deduplication by similar titles
-            title_lower = todo["title"].lower()
-
-            # Check for duplicates (fuzzy match)
-            is_duplicate = False
-            for seen in seen_titles:
-                # If titles share 70% of words, consider duplicate
-                title_words = set(title_lower.split())
-                seen_words = set(seen.split())
-                if len(title_words & seen_words) / max(len(title_words), len(seen_words)) > 0.7:
-                    is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                seen_titles.add(title_lower)
-                all_todos.append(todo)
-
-    # Re-sort by priority
-    all_todos.sort(key=lambda x: x.get("priority", 5))
-
-    # Re-assign IDs
-    for i, todo in enumerate(all_todos):
-        todo["id"] = f"todo_{i+1:03d}"
+
+def analyze_chunks(
+    client: OpenAI,
+    chunks: List[TranscriptChunk],
+    app_context: str,
+    focus_areas: Optional[List[str]] = None,
+    model: str = "gpt-4o",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[DiskCache] = None,
+    on_result: Optional[Callable[[int, dict], None]] = None
+) -> List[dict]:
+    """
+    Analyze chunks concurrently and return the results in chunk order.
+
+    on_result(index, result), if given, is called from this thread as each
+    chunk finishes, in completion order.
+    """
+    def analyze(index: int) -> dict:
+        chunk = chunks[index]
+        return analyze_transcript_chunk(
+            client,
+            chunk.text,
+            app_context,
+            focus_areas,
+            chunk_index=index,
+            total_chunks=len(chunks),
+            model=model,
+            limiter=limiter,
+            cache=cache,
+            context_until=format_timestamp(chunk.owned_start) if chunk.has_context else None
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as executor:
+        futures = [executor.submit(analyze, index) for index in range(len(chunks))]
+        if on_result:
+            indexes = {future: index for index, future in enumerate(futures)}
+            for future in as_completed(futures):
+                on_result(indexes[future], future.result())
+        return [future.result() for future in futures]
+
+
+def _merge_unique(first: Optional[list], second: Optional[list]) -> list:
+    """Concatenate two lists, dropping repeats (case-insensitive for strings)."""
+    merged, seen = [], set()
+    for item in (first or []) + (second or []):
+        key = item.strip().lower() if isinstance(item, str) else json.dumps(item, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+class TodoDeduplicator:
+    """
+    Incremental near-duplicate detection for todos.
+
+    Each title's word set gets a MinHash signature of bands * rows values;
+    todos whose signatures agree on every row of any band share an LSH
+    bucket and become candidates. Candidates are confirmed with the
+    overlap rule (shared words / words in the longer title >
+    DUPLICATE_THRESHOLD), so only a handful of exact comparisons happen
+    per todo instead of one per todo already seen.
+
+    A duplicate is merged into the todo seen first: acceptance criteria,
+    quotes and suggested files are combined, and the most urgent priority
+    (lowest number, 1 = critical) wins.
+
+    Usage:
+        dedup = TodoDeduplicator()
+        for todo in todos:
+            survivor, is_new = dedup.add(todo)
+        unique = dedup.todos
+    """
+
+    def __init__(
+        self,
+        threshold: float = DUPLICATE_THRESHOLD,
+        bands: int = LSH_BANDS,
+        rows: int = LSH_ROWS,
+        seed: int = 1
+    ):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._hash_params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._buckets: List[Dict[tuple, List[int]]] = [{} for _ in range(bands)]
+        self._words: List[frozenset] = []
+        # Titles reuse a small vocabulary, so per-word hash rows are cached
+        self._word_cache: Dict[str, Tuple[int, ...]] = {}
+        self.todos: List[dict] = []
+
+    @staticmethod
+    def title_words(title: str) -> frozenset:
+        return frozenset(title.lower().split())
+
+    def _word_hashes(self, word: str) -> Tuple[int, ...]:
+        hashes = self._word_cache.get(word)
+        if hashes is None:
+            h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "big")
+            hashes = tuple((a * h + b) % _MERSENNE_PRIME for a, b in self._hash_params)
+            self._word_cache[word] = hashes
+        return hashes
+
+    def signature(self, words: frozenset) -> List[int]:
+        """MinHash of a word set: the minimum of each hash function over the words."""
+        return [min(column) for column in zip(*(self._word_hashes(word) for word in words))]
+
+    def is_duplicate(self, words: frozenset, other: frozenset) -> bool:
+        longest = max(len(words), len(other))
+        return longest > 0 and len(words & other) / longest > self.threshold
+
+    def find(self, title: str) -> Optional[dict]:
+        """Return the earliest stored todo duplicating title, if any."""
+        index = self._find(self.title_words(title))
+        return self.todos[index] if index is not None else None
+
+    def _find(self, words: frozenset, signature: Optional[List[int]] = None) -> Optional[int]:
+        if not words:
+            return None
+        signature = signature or self.signature(words)
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            key = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            candidates.update(buckets.get(key, ()))
+        for index in sorted(candidates):
+            if self.is_duplicate(words, self._words[index]):
+                return index
+        return None
+
+    def add(self, todo: dict) -> Tuple[dict, bool]:
+        """
+        Add a todo, merging it into an earlier duplicate if there is one.
+
+        Returns:
+            (the stored todo it ended up in, whether it was new)
+        """
+        words = self.title_words(todo.get("title", ""))
+        signature = self.signature(words) if words else None
+        index = self._find(words, signature)
+
+        if index is not None:
+            survivor = self.todos[index]
+            merge_todos(survivor, todo)
+            return survivor, False
+
+        index = len(self.todos)
+        self.todos.append(todo)
+        self._words.append(words)
+        if signature:
+            for band, buckets in enumerate(self._buckets):
+                key = tuple(signature[band * self.rows:(band + 1) * self.rows])
+                buckets.setdefault(key, []).append(index)
+        return todo, True
+
+
+def merge_todos(survivor: dict, duplicate: dict) -> dict:
+    """Fold a duplicate todo's criteria, quotes, files and priority into survivor."""
+    for field in MERGED_LIST_FIELDS:
+        if survivor.get(field) or duplicate.get(field):
+            survivor[field] = _merge_unique(survivor.get(field), duplicate.get(field))
+    priorities = [t["priority"] for t in (survivor, duplicate) if t.get("priority") is not None]
+    if priorities:
+        survivor["priority"] = min(priorities)
+    return survivor
+
+
+def _without_llm_id(todo: dict) -> dict:
+    """A chunk's todo minus the "id" the model made up; real IDs are assigned on merge."""
+    return {key: value for key, value in todo.items() if key != "id"}
+
+
+def _todo_number(todo_id: str) -> int:
+    match = re.fullmatch(r"todo_(\d+)", todo_id or "")
+    return int(match.group(1)) if match else 0
+
+
+def next_todo_number(previous: Optional[dict]) -> int:
+    """
+    First todo number a run extending previous may hand out.
+
+    Outputs record the high-water mark as "next_id", so numbers given to
+    todos that were later dropped are never reused (the work queue is
+    keyed on them); older outputs fall back to the highest ID + 1.
+    """
+    if not previous:
+        return 1
+    highest = max((_todo_number(todo.get("id")) for todo in previous.get("todos", [])), default=0)
+    return max(previous.get("next_id", 1), highest + 1)
+
+
+def select_todos(prior: List[dict], new: List[dict], max_todos: Optional[int]) -> Tuple[List[dict], List[dict]]:
+    """
+    Split new todos into (kept, dropped) under max_todos.
+
+    Prior todos are always kept and count against the limit; new todos
+    fill the remaining room in priority order.
+    """
+    ranked = sorted(new, key=lambda x: x.get("priority", 5))
+    if max_todos is None:
+        return ranked, []
+    room = max(0, max_todos - len(prior))
+    return ranked[:room], ranked[room:]
+
+
+def summarize_todos(todos: List[dict], next_id: int, dropped: Optional[List[dict]] = None) -> dict:
+    """Output dict for a final todo list, sorted by priority."""
+    todos = sorted(todos, key=lambda x: x.get("priority", 5))
 
     # Calculate priority breakdown
     priority_breakdown = {
-        "critical": len([t for t in all_todos if t.get("priority") == 1]),
-        "high": len([t for t in all_todos if t.get("priority") == 2]),
-        "medium": len([t for t in all_todos if t.get("priority") == 3]),
-        "low": len([t for t in all_todos if t.get("priority", 5) >= 4])
+        "critical": len([t for t in todos if t.get("priority") == 1]),
+        "high": len([t for t in todos if t.get("priority") == 2]),
+        "medium": len([t for t in todos if t.get("priority") == 3]),
+        "low": len([t for t in todos if t.get("priority", 5) >= 4])
     }
 
-    return {
-        "todos": all_todos,
-        "summary": f"Extracted {len(all_todos)} actionable todos from video transcript",
-        "total_todos": len(all_todos),
-        "priority_breakdown": priority_breakdown
+    merged = {
+        "todos": todos,
+        "summary": f"Extracted {len(todos)} actionable todos from video transcript",
+        "total_todos": len(todos),
+        "priority_breakdown": priority_breakdown,
+        "next_id": next_id,
+        # Not saved; decides which segments count as analyzed
+        "dropped_todos": dropped or []
     }
+    if dropped:
+        merged["note"] = f"Limited to {len(todos)} todos by priority; {len(dropped)} new todos left for a later run"
+    return merged
+
+
+def merge_todo_results(
+    results: List[dict],
+    chunks: Optional[List[TranscriptChunk]] = None,
+    previous: Optional[dict] = None,
+    max_todos: Optional[int] = None
+) -> dict:
+    """
+    Merge todos from multiple chunks, merging near-duplicate items.
+
+    With chunks (parallel to results), todos timestamped outside a chunk's
+    owned range came from its overlap context and are dropped.
+
+    With previous (an earlier merged output), its todos come first and keep
+    their IDs (duplicates found now merge into them); new todos are
+    numbered from its "next_id". Without it, IDs follow priority order.
+
+    With max_todos, new todos beyond the limit (see select_todos) are
+    returned under "dropped_todos" without an ID.
+    """
+    dedup = TodoDeduplicator()
+    prior = previous.get("todos", []) if previous else []
+    for todo in prior:
+        dedup.add(todo)
+    for i, result in enumerate(results):
+        for todo in result.get("todos", []):
+            if chunks and not chunks[i].owns(parse_timestamp(todo.get("timestamp"))):
+                continue
+            dedup.add(_without_llm_id(todo))
+
+    kept_prior = {id(todo) for todo in prior}
+    new, dropped = select_todos(
+        prior,
+        [todo for todo in dedup.todos if id(todo) not in kept_prior],
+        max_todos
+    )
+
+    # Keep existing IDs; number new todos after them
+    next_number = next_todo_number(previous)
+    for todo in new:
+        todo["id"] = f"todo_{next_number:03d}"
+        next_number += 1
+
+    return summarize_todos(prior + new, next_number, dropped)
+
+
+def analyzed_fingerprints(segments: List[dict], dropped: List[dict]) -> List[str]:
+    """
+    Fingerprints of segments to record as analyzed.
+
+    A segment whose todos were dropped by the limit stays unanalyzed, so
+    a later incremental run rediscovers them. A dropped todo without a
+    timestamp can't be placed, so then no new segment is recorded.
+    """
+    starts = [int(float(segment.get("start", 0))) for segment in segments]
+    skipped = set()
+    for todo in dropped:
+        seconds = parse_timestamp(todo.get("timestamp"))
+        if seconds is None:
+            return []
+        skipped.add(max(0, bisect.bisect_right(starts, seconds) - 1))
+    return [
+        segment_fingerprint(segment)
+        for index, segment in enumerate(segments)
+        if index not in skipped
+    ]
+
+
+class QueueHandoff:
+    """
+    Moves each chunk's todos into the live work queue as it is analyzed.
+
+    Todos are deduplicated across chunks as they arrive. Prior todos count
+    against max_todos like in merge_todo_results; each chunk's new todos
+    fill the remaining room in priority order and get their final ID
+    (after any IDs from a previous output) as they are queued. The JSON
+    written at the end holds exactly the prior and queued todos; new todos
+    that didn't fit are reported as dropped, like merge_todo_results does.
+    A duplicate of a queued todo that hasn't been claimed yet updates it
+    in place.
+    """
+
+    def __init__(
+        self,
+        chunks: List[TranscriptChunk],
+        previous: Optional[dict] = None,
+        max_todos: int = 50
+    ):
+        self.chunks = chunks
+        self.max_todos = max_todos
+        self.dedup = TodoDeduplicator()
+        self.prior = previous.get("todos", []) if previous else []
+        for todo in self.prior:
+            self.dedup.add(todo)
+        self.next_number = next_todo_number(previous)
+        self.queued: List[dict] = []
+        self.dropped: List[dict] = []
+        # IDs in the queue (prior and handed out here); only these are updated
+        self.queued_ids = {todo.get("id") for todo in self.prior}
+
+    def on_result(self, index: int, result: dict):
+        new, updated = [], {}
+        for todo in result.get("todos", []):
+            if not self.chunks[index].owns(parse_timestamp(todo.get("timestamp"))):
+                continue
+            survivor, is_new = self.dedup.add(_without_llm_id(todo))
+            if is_new:
+                new.append(survivor)
+            elif survivor.get("id") in self.queued_ids:
+                # Merged into a queued or prior todo; dropped ones stay out
+                updated[survivor["id"]] = survivor
+
+        kept, dropped = select_todos(self.prior + self.queued, new, self.max_todos)
+        for todo in kept:
+            todo["id"] = f"todo_{self.next_number:03d}"
+            self.next_number += 1
+        self.queued.extend(kept)
+        self.queued_ids.update(todo["id"] for todo in kept)
+        self.dropped.extend(dropped)
+
+        append_to_work_queue(kept)
+        for todo in updated.values():
+            update_queued_todo(todo)
+        log(
+            f"Chunk {index + 1}/{len(self.chunks)}: {len(kept)} new todos queued, "
+            f"{len(dropped)} over the limit, {len(updated)} merged into earlier ones"
+        )
+
+    def merged_output(self) -> dict:
+        """The merged result for the prior and queued todos, keeping the IDs handed out."""
+        return summarize_todos(self.prior + self.queued, self.next_number, self.dropped)
+
+
+def find_previous_todos(video_name: str) -> Optional[Path]:
+    """Most recent JSON output for video_name in .tmp/todos/, if any."""
+    outputs = sorted(get_tmp_path("todos").glob(f"{video_name}_????????_??????.json"))
+    return outputs[-1] if outputs else None
+
+
+def plan_incremental_chunks(
+    segments: List[dict],
+    analyzed: set,
+    token_budget: int = CHUNK_TOKEN_BUDGET,
+    overlap: int = SEGMENT_OVERLAP,
+    context_segments: int = INCREMENTAL_CONTEXT_SEGMENTS
+) -> List[TranscriptChunk]:
+    """
+    Chunks covering only segments whose fingerprint isn't in analyzed.
+
+    Each run of consecutive new segments is chunked on its own, led by up
+    to context_segments of the segments before it.
+    """
+    new = [segment_fingerprint(segment) not in analyzed for segment in segments]
+    chunks = []
+    i = 0
+    while i < len(segments):
+        if not new[i]:
+            i += 1
+            continue
+        end = i
+        while end < len(segments) and new[end]:
+            end += 1
+        chunks.extend(chunk_segments(
+            segments[i:end],
+            token_budget,
+            overlap,
+            lead_context=segments[max(0, i - context_segments):i]
+        ))
+        i = end
+    return chunks
 
 
 def format_as_markdown(todos_data: dict, video_name: str) -> str:
@@ -292,7 +932,15 @@ def generate_todos(
     output_format: str = "markdown",
     max_todos: int = 50,
     openai_api_key: str = None,
-    model: str = "gpt-4o"
+    model: str = "gpt-4o",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: int = DEFAULT_RPM,
+    tokens_per_minute: int = DEFAULT_TPM,
+    use_cache: bool = True,
+    chunk_tokens: int = CHUNK_TOKEN_BUDGET,
+    overlap_segments: int = SEGMENT_OVERLAP,
+    incremental: Optional[str] = None,
+    stream_to_queue: bool = False
 ) -> ExecutionResult:
     """
     Main todo generation function.
@@ -305,6 +953,17 @@ def generate_todos(
         max_todos: Maximum number of todos to generate
         openai_api_key: OpenAI API key
         model: OpenAI model to use
+        concurrency: Maximum chunks analyzed at once
+        requests_per_minute: Request rate limit shared by all chunks
+        tokens_per_minute: Token rate limit shared by all chunks
+        use_cache: Reuse and store LLM responses in the response cache
+        chunk_tokens: Transcript token budget per request
+        overlap_segments: Segments repeated between consecutive chunks
+        incremental: Earlier JSON output to extend, or "latest" for the
+            newest one for this video; only unanalyzed segments are sent
+        stream_to_queue: Append todos to the auto-dev work queue as each
+            chunk is analyzed (a new queue, or the existing one when
+            extending a previous output)
 
     Returns:
         ExecutionResult with generated todos
@@ -322,36 +981,68 @@ def generate_todos(
     video_name = transcript.get("video_name", "unknown_video")
     log(f"Analyzing transcript for: {video_name}")
 
-    # Format transcript for LLM
-    transcript_text = format_transcript_for_llm(transcript)
-    log(f"Transcript length: {len(transcript_text)} characters")
-
-    # Chunk if necessary
-    chunks = chunk_transcript(transcript_text)
-    log(f"Processing {len(chunks)} chunk(s)")
+    segments = transcript.get("segments") or []
 
-    # Analyze each chunk
-    results = []
-    for i, chunk in enumerate(chunks):
-        result = analyze_transcript_chunk(
+    previous = None
+    if incremental:
+        previous_path = find_previous_todos(video_name) if incremental == "latest" else Path(incremental)
+        if previous_path and previous_path.exists() and segments:
+            with open(previous_path, "r") as f:
+                previous = json.load(f)
+            log(f"Extending {previous_path} ({len(previous.get('todos', []))} todos)")
+        else:
+            log("No previous segment-level output to extend; analyzing everything", level="warning")
+
+    # Chunk on segment boundaries (plain-text transcripts split by size)
+    if previous:
+        chunks = plan_incremental_chunks(
+            segments,
+            set(previous.get("analyzed_segments", [])),
+            chunk_tokens,
+            overlap_segments
+        )
+    elif segments:
+        chunks = chunk_segments(segments, chunk_tokens, overlap_segments)
+    else:
+        transcript_text = format_transcript_for_llm(transcript)
+        # About 4 characters per token
+        chunks = [TranscriptChunk(text=text) for text in chunk_transcript(transcript_text, chunk_tokens * 4)]
+    log(f"Processing {len(chunks)} chunk(s), ~{sum(estimate_tokens(c.text) for c in chunks)} tokens")
+
+    handoff = None
+    if stream_to_queue:
+        open_streaming_queue(str(transcript_file), reset=previous is None)
+        handoff = QueueHandoff(chunks, previous, max_todos)
+
+    # Analyze chunks in parallel under the shared rate limits
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    try:
+        results = [] if not chunks else analyze_chunks(
             client,
-            chunk,
+            chunks,
             app_context,
             focus_areas,
-            chunk_index=i,
-            total_chunks=len(chunks),
-            model=model
+            model=model,
+            concurrency=concurrency,
+            limiter=limiter,
+            cache=get_llm_cache() if use_cache else None,
+            on_result=handoff.on_result if handoff else None
         )
-        results.append(result)
+    finally:
+        # Following coordinators stop waiting once the producer closes
+        if handoff:
+            close_streaming_queue()
 
     # Merge results
-    merged = merge_todo_results(results)
-
-    # Limit todos if requested
-    if len(merged["todos"]) > max_todos:
-        merged["todos"] = merged["todos"][:max_todos]
-        merged["total_todos"] = max_todos
-        merged["note"] = f"Limited to top {max_todos} todos by priority"
+    if handoff:
+        merged = handoff.merged_output()
+    else:
+        merged = merge_todo_results(results, chunks, previous, max_todos)
+    # Record what was analyzed so later incremental runs can skip it
+    merged["analyzed_segments"] = list(dict.fromkeys(
+        (previous or {}).get("analyzed_segments", [])
+        + analyzed_fingerprints(segments, merged.pop("dropped_todos"))
+    ))
 
     # Save outputs
     ts = timestamp()
@@ -382,6 +1073,14 @@ def generate_todos(
     )
 
 
+def positive_int(value: str) -> int:
+    """argparse type for limits that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate development todos from video transcript"
@@ -417,6 +1116,55 @@ def main():
         default="gpt-4o",
         help="OpenAI model to use (default: gpt-4o)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Chunks to analyze at once (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--rpm",
+        type=positive_int,
+        default=DEFAULT_RPM,
+        help=f"Requests per minute limit (default: {DEFAULT_RPM})"
+    )
+    parser.add_argument(
+        "--tpm",
+        type=positive_int,
+        default=DEFAULT_TPM,
+        help=f"Tokens per minute limit (default: {DEFAULT_TPM})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse or store cached LLM responses"
+    )
+    parser.add_argument(
+        "--incremental",
+        nargs="?",
+        const="latest",
+        metavar="TODOS_JSON",
+        help="Only analyze segments not covered by an earlier JSON output "
+             "(default: the latest one for this video) and merge into it"
+    )
+    parser.add_argument(
+        "--stream-to-queue",
+        action="store_true",
+        help="Append todos to the auto-dev work queue as each chunk is analyzed "
+             "(run agent_coordinator.py --follow alongside)"
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=CHUNK_TOKEN_BUDGET,
+        help=f"Transcript tokens per request (default: {CHUNK_TOKEN_BUDGET})"
+    )
+    parser.add_argument(
+        "--overlap-segments",
+        type=int,
+        default=SEGMENT_OVERLAP,
+        help=f"Segments repeated between consecutive chunks (default: {SEGMENT_OVERLAP})"
+    )
 
     args = parser.parse_args()
 
@@ -444,7 +1192,15 @@ def main():
             output_format=args.format,
             max_todos=args.max_todos,
             openai_api_key=api_key,
-            model=args.model
+            model=args.model,
+            concurrency=args.concurrency,
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            use_cache=not args.no_cache,
+            chunk_tokens=args.chunk_tokens,
+            overlap_segments=args.overlap_segments,
+            incremental=args.incremental,
+            stream_to_queue=args.stream_to_queue
         )
     except Exception as e:
         log(f"Todo generation failed: {e}", level="error")
@@ -3,12 +3,20 @@
 Manages git branches for the auto-dev agent system.
 
 Handles creating feature branches, committing, pushing, and merging.
-Each todo gets its own isolated branch for parallel development.
+Each todo gets its own isolated branch for parallel development, and each
+parallel worker gets its own git worktree so branches can be checked out
+side by side without sharing one working tree.
 
 Usage:
     # Initialize git state
     python execution/git_branch_manager.py --action init --project /path/to/project
 
+    # Provision (or reuse) a dedicated worktree for a worker
+    python execution/git_branch_manager.py \
+        --action worktree \
+        --project /path/to/project \
+        --worker-id worker_0
+
     # Create feature branch
     python execution/git_branch_manager.py \
         --action create \
@@ -16,6 +24,14 @@ Usage:
         --todo-id todo_001 \
         --title "add-dark-mode"
 
+    # Create feature branch inside a worker's worktree
+    python execution/git_branch_manager.py \
+        --action create \
+        --project /path/to/project \
+        --worktree .tmp/auto-dev/worktrees/worker_0 \
+        --todo-id todo_001 \
+        --title "add-dark-mode"
+
     # Commit changes
     python execution/git_branch_manager.py \
         --action commit \
@@ -36,9 +52,11 @@ Usage:
 
 import argparse
 import json
+import os
 import re
 import subprocess
 import sys
+import threading
 from pathlib import Path
 from typing import Optional, List
 
@@ -46,6 +64,21 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from utils import load_env, log, save_json, get_tmp_path, ExecutionResult, timestamp
 
+# Directory (under .tmp/) holding one worktree per worker
+WORKTREES_DIR = "auto-dev/worktrees"
+
+# Untracked dependency directories shared from the main checkout into worktrees
+SHARED_DEPENDENCY_DIRS = ["node_modules"]
+
+# Env files shared the same way when the main checkout has them untracked
+# (dev servers read them, see dev_server_manager.SERVER_CONFIG_FILES)
+SHARED_ENV_FILES = [".env", ".env.local", ".env.development", ".env.development.local"]
+
+# Serializes read-modify-write of git_state.json and merges into the main
+# branch, which are shared by all workers
+_state_lock = threading.Lock()
+_merge_lock = threading.Lock()
+
 
 def run_git(args: List[str], cwd: str, capture: bool = True) -> tuple:
     """
@@ -87,6 +120,16 @@ def slugify(text: str, max_length: int = 30) -> str:
     return slug
 
 
+def load_git_state() -> Optional[dict]:
+    """Load git_state.json, or None if the session was never initialized."""
+    try:
+        state_path = get_tmp_path("auto-dev/git_state.json")
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
 def init_git_state(project_path: str) -> ExecutionResult:
     """
     Initialize git state for the auto-dev session.
@@ -149,7 +192,8 @@ def init_git_state(project_path: str) -> ExecutionResult:
         "main_branch": main_branch,
         "original_branch": current_branch,
         "stash_name": stash_name,
-        "active_branches": []
+        "active_branches": [],
+        "worktrees": {}
     }
     state_file = save_json(state, "auto-dev/git_state.json")
 
@@ -157,43 +201,179 @@ def init_git_state(project_path: str) -> ExecutionResult:
     return ExecutionResult.ok(data=state, state_file=str(state_file))
 
 
+def _exclude_from_git(exclude_file: Optional[Path], name: str):
+    """Add /name to the repository's info/exclude if it isn't there yet."""
+    if not exclude_file:
+        return
+    exclude_file.parent.mkdir(parents=True, exist_ok=True)
+    existing = exclude_file.read_text() if exclude_file.exists() else ""
+    if f"/{name}" not in existing.splitlines():
+        if existing and not existing.endswith("\n"):
+            existing += "\n"
+        exclude_file.write_text(f"{existing}/{name}\n")
+
+
+def _share_dependency_dirs(project_path: str, worktree_path: Path):
+    """
+    Symlink untracked dependency dirs (e.g. node_modules) and env files
+    from the main checkout so dev servers can start inside a fresh worktree.
+    """
+    success, common_dir, _ = run_git(["rev-parse", "--git-common-dir"], project_path)
+    exclude_file = None
+    if success and common_dir:
+        exclude_file = (Path(project_path) / common_dir).resolve() / "info" / "exclude"
+
+    for name in SHARED_DEPENDENCY_DIRS:
+        source = Path(project_path) / name
+        target = worktree_path / name
+        if not source.is_dir() or target.exists() or target.is_symlink():
+            continue
+        os.symlink(source, target, target_is_directory=True)
+        log(f"Linked {name} into {worktree_path}")
+
+        # A "node_modules/" gitignore rule doesn't match a symlink, so
+        # exclude it explicitly to keep it out of `git add -A`
+        _exclude_from_git(exclude_file, name)
+
+    for name in SHARED_ENV_FILES:
+        source = Path(project_path) / name
+        target = worktree_path / name
+        if not source.is_file() or target.exists() or target.is_symlink():
+            continue
+        # Tracked env files are already checked out in the worktree
+        tracked, _, _ = run_git(["ls-files", "--error-unmatch", name], project_path)
+        if tracked:
+            continue
+        os.symlink(source, target)
+        log(f"Linked {name} into {worktree_path}")
+        _exclude_from_git(exclude_file, name)
+
+
+def create_worktree(project_path: str, worker_id: str) -> ExecutionResult:
+    """
+    Provision a dedicated git worktree for a worker, or reuse an existing one.
+
+    The worktree is created detached at the main branch; create_branch then
+    re-points it at a fresh feature branch for each todo the worker picks up.
+    """
+    state = load_git_state()
+    if state is None:
+        return ExecutionResult.fail(
+            error="Git state not initialized. Run --action init first."
+        )
+
+    main_branch = state.get("main_branch", "main")
+    worktree_path = get_tmp_path(f"{WORKTREES_DIR}/{worker_id}")
+
+    # Reuse if git still knows about it
+    success, listing, _ = run_git(["worktree", "list", "--porcelain"], project_path)
+    known = success and f"worktree {worktree_path}" in listing.splitlines()
+
+    if known and worktree_path.exists():
+        log(f"Reusing worktree for {worker_id}: {worktree_path}")
+    else:
+        # Clear stale registrations and leftover directories
+        run_git(["worktree", "prune"], project_path)
+        if worktree_path.exists() and not any(worktree_path.iterdir()):
+            worktree_path.rmdir()
+
+        success, _, err = run_git(
+            ["worktree", "add", "--detach", str(worktree_path), main_branch],
+            project_path
+        )
+        if not success:
+            return ExecutionResult.fail(error=f"Failed to create worktree: {err}")
+        log(f"Created worktree for {worker_id}: {worktree_path}")
+
+    _share_dependency_dirs(project_path, worktree_path)
+
+    with _state_lock:
+        state = load_git_state() or state
+        state.setdefault("worktrees", {})[worker_id] = str(worktree_path)
+        save_json(state, "auto-dev/git_state.json")
+
+    return ExecutionResult.ok(
+        data={
+            "worker_id": worker_id,
+            "worktree": str(worktree_path),
+            "reused": known
+        }
+    )
+
+
+def remove_worktrees(project_path: str) -> ExecutionResult:
+    """Remove all worker worktrees registered in git_state.json."""
+    with _state_lock:
+        state = load_git_state()
+        if state is None:
+            return ExecutionResult.fail(error="Git state not initialized")
+
+        removed = []
+        for worker_id, worktree_path in state.get("worktrees", {}).items():
+            success, _, err = run_git(
+                ["worktree", "remove", "--force", worktree_path],
+                project_path
+            )
+            if success:
+                removed.append(worker_id)
+            else:
+                log(f"Failed to remove worktree {worktree_path}: {err}", level="warning")
+
+        run_git(["worktree", "prune"], project_path)
+        state["worktrees"] = {}
+        save_json(state, "auto-dev/git_state.json")
+
+    log(f"Removed {len(removed)} worktrees")
+    return ExecutionResult.ok(data={"removed": removed})
+
+
 def create_branch(
     project_path: str,
     todo_id: str,
-    title: str
+    title: str,
+    worktree_path: Optional[str] = None
 ) -> ExecutionResult:
     """
     Create a new feature branch for a todo item.
 
     Branch naming: feat/todo-{id}-{slugified-title}
+
+    If worktree_path is given, the branch is checked out in that worktree
+    (off the main branch) instead of the main checkout.
     """
     slug = slugify(title)
     branch_name = f"feat/{todo_id}-{slug}"
+    cwd = worktree_path or project_path
 
     log(f"Creating branch: {branch_name}")
 
     # Load state
-    try:
-        state_path = get_tmp_path("auto-dev/git_state.json")
-        with open(state_path, "r") as f:
-            state = json.load(f)
-    except FileNotFoundError:
+    state = load_git_state()
+    if state is None:
         return ExecutionResult.fail(
             error="Git state not initialized. Run --action init first."
         )
 
-    # Make sure we're on main branch
     main_branch = state.get("main_branch", "main")
-    success, current, _ = run_git(["rev-parse", "--abbrev-ref", "HEAD"], project_path)
-    if current != main_branch:
-        run_git(["checkout", main_branch], project_path)
 
-    # Create and checkout new branch
-    success, _, err = run_git(["checkout", "-b", branch_name], project_path)
+    if worktree_path:
+        # Drop leftovers from the previous todo, then branch off main
+        run_git(["reset", "--hard"], cwd)
+        run_git(["clean", "-fd"], cwd)
+        success, _, err = run_git(["checkout", "-b", branch_name, main_branch], cwd)
+    else:
+        # Make sure we're on main branch
+        success, current, _ = run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
+        if current != main_branch:
+            run_git(["checkout", main_branch], cwd)
+
+        # Create and checkout new branch
+        success, _, err = run_git(["checkout", "-b", branch_name], cwd)
+
     if not success:
         # Branch might already exist
         if "already exists" in err:
-            success, _, err = run_git(["checkout", branch_name], project_path)
+            success, _, err = run_git(["checkout", branch_name], cwd)
             if not success:
                 return ExecutionResult.fail(error=f"Failed to checkout branch: {err}")
             log(f"Branch {branch_name} already exists, checked out")
@@ -201,16 +381,19 @@ def create_branch(
             return ExecutionResult.fail(error=f"Failed to create branch: {err}")
 
     # Update state
-    if branch_name not in state["active_branches"]:
-        state["active_branches"].append(branch_name)
-        save_json(state, "auto-dev/git_state.json")
+    with _state_lock:
+        state = load_git_state() or state
+        if branch_name not in state["active_branches"]:
+            state["active_branches"].append(branch_name)
+            save_json(state, "auto-dev/git_state.json")
 
     log(f"On branch: {branch_name}")
     return ExecutionResult.ok(
         data={
             "branch": branch_name,
             "todo_id": todo_id,
-            "title": title
+            "title": title,
+            "worktree": worktree_path
         }
     )
 
@@ -292,15 +475,25 @@ def merge_branch(
     log(f"Merging branch: {branch}")
 
     # Load state
-    try:
-        state_path = get_tmp_path("auto-dev/git_state.json")
-        with open(state_path, "r") as f:
-            state = json.load(f)
-    except FileNotFoundError:
+    state = load_git_state()
+    if state is None:
         return ExecutionResult.fail(error="Git state not initialized")
 
     main_branch = state.get("main_branch", "main")
 
+    # Workers merge into the shared main checkout one at a time
+    with _merge_lock:
+        return _merge_into_main(project_path, branch, main_branch, delete_after)
+
+
+def _merge_into_main(
+    project_path: str,
+    branch: str,
+    main_branch: str,
+    delete_after: bool
+) -> ExecutionResult:
+    """Merge branch into main_branch in the main checkout."""
+
     # Checkout main
     success, _, err = run_git(["checkout", main_branch], project_path)
     if not success:
@@ -314,12 +507,22 @@ def merge_branch(
         return ExecutionResult.fail(error=f"Merge conflict: {err}")
 
     # Delete branch if requested
+    deleted = False
     if delete_after:
-        run_git(["branch", "-d", branch], project_path)
-        # Update state
-        if branch in state["active_branches"]:
-            state["active_branches"].remove(branch)
-            save_json(state, "auto-dev/git_state.json")
+        # git refuses to delete a branch checked out in a worker's worktree
+        worktree = _worktree_for_branch(project_path, branch)
+        if worktree:
+            run_git(["checkout", "--detach"], worktree)
+        deleted, _, err = run_git(["branch", "-d", branch], project_path)
+        if deleted:
+            # Update state
+            with _state_lock:
+                state = load_git_state()
+                if state and branch in state["active_branches"]:
+                    state["active_branches"].remove(branch)
+                    save_json(state, "auto-dev/git_state.json")
+        else:
+            log(f"Could not delete {branch}: {err}", level="warning")
 
     log(f"Merged {branch} into {main_branch}")
     return ExecutionResult.ok(
@@ -327,11 +530,35 @@ def merge_branch(
             "merged": True,
             "branch": branch,
             "into": main_branch,
-            "deleted": delete_after
+            "deleted": deleted
         }
     )
 
 
+def _worktree_for_branch(project_path: str, branch: str) -> Optional[str]:
+    """Path of the linked worktree that has branch checked out, if any."""
+    success, listing, _ = run_git(["worktree", "list", "--porcelain"], project_path)
+    if not success:
+        return None
+    main_checkout = Path(project_path).resolve()
+    worktree = None
+    for line in listing.splitlines():
+        if line.startswith("worktree "):
+            worktree = line[len("worktree "):]
+        elif line == f"branch refs/heads/{branch}" and worktree:
+            if Path(worktree).resolve() != main_checkout:
+                return worktree
+    return None
+
+
+def get_base_commit(project_path: str) -> Optional[str]:
+    """Commit of the main branch the current checkout branched from, if known."""
+    state = load_git_state()
+    main_branch = state.get("main_branch", "main") if state else "main"
+    success, base, _ = run_git(["merge-base", "HEAD", main_branch], project_path)
+    return base if success and base else None
+
+
 def get_branch_status(project_path: str) -> ExecutionResult:
     """
     Get current git status and branch information.
@@ -353,17 +580,36 @@ def get_branch_status(project_path: str) -> ExecutionResult:
     )
 
 
+def git_session_intact(project_path: str, state: dict) -> bool:
+    """
+    Whether the main checkout is still as init_git_state left it: on the
+    main branch, with the session's stash (if any) not yet popped.
+    """
+    success, current, _ = run_git(["rev-parse", "--abbrev-ref", "HEAD"], project_path)
+    if not success or current != state.get("main_branch", "main"):
+        return False
+    stash_name = state.get("stash_name")
+    if stash_name:
+        success, stash_list, _ = run_git(["stash", "list"], project_path)
+        return success and stash_name in stash_list
+    return True
+
+
 def cleanup(project_path: str) -> ExecutionResult:
     """
-    Cleanup git state, restore original branch, pop stash if needed.
+    Cleanup git state, remove worker worktrees, restore original branch,
+    pop stash if needed.
+
+    git_state.json is removed afterwards, so a later resume initializes a
+    new session instead of trusting the restored checkout.
     """
-    try:
-        state_path = get_tmp_path("auto-dev/git_state.json")
-        with open(state_path, "r") as f:
-            state = json.load(f)
-    except FileNotFoundError:
+    state = load_git_state()
+    if state is None:
         return ExecutionResult.fail(error="No git state to cleanup")
 
+    if state.get("worktrees"):
+        remove_worktrees(project_path)
+
     main_branch = state.get("main_branch", "main")
     original_branch = state.get("original_branch")
     stash_name = state.get("stash_name")
@@ -381,6 +627,8 @@ def cleanup(project_path: str) -> ExecutionResult:
             run_git(["stash", "pop"], project_path)
             log(f"Restored stashed changes: {stash_name}")
 
+    get_tmp_path("auto-dev/git_state.json").unlink(missing_ok=True)
+
     log("Git state cleaned up")
     return ExecutionResult.ok(data={"cleaned": True})
 
@@ -390,7 +638,7 @@ def main():
     parser.add_argument(
         "--action",
         required=True,
-        choices=["init", "create", "commit", "push", "merge", "status", "cleanup"],
+        choices=["init", "worktree", "create", "commit", "push", "merge", "status", "cleanup"],
         help="Action to perform"
     )
     parser.add_argument(
@@ -398,6 +646,14 @@ def main():
         required=True,
         help="Path to the project directory"
     )
+    parser.add_argument(
+        "--worker-id",
+        help="Worker ID (for worktree action)"
+    )
+    parser.add_argument(
+        "--worktree",
+        help="Worker worktree to operate in (for create/commit/push actions)"
+    )
     parser.add_argument(
         "--todo-id",
         help="Todo ID (for create action)"
@@ -427,13 +683,21 @@ def main():
     if args.action == "init":
         result = init_git_state(project_path)
 
+    elif args.action == "worktree":
+        if not args.worker_id:
+            print(ExecutionResult.fail(
+                error="--worker-id required for worktree action"
+            ).to_json())
+            sys.exit(1)
+        result = create_worktree(project_path, args.worker_id)
+
     elif args.action == "create":
         if not args.todo_id or not args.title:
             print(ExecutionResult.fail(
                 error="--todo-id and --title required for create action"
             ).to_json())
             sys.exit(1)
-        result = create_branch(project_path, args.todo_id, args.title)
+        result = create_branch(project_path, args.todo_id, args.title, args.worktree)
 
     elif args.action == "commit":
         if not args.message:
@@ -441,10 +705,10 @@ def main():
                 error="--message required for commit action"
             ).to_json())
             sys.exit(1)
-        result = commit_changes(project_path, args.message)
+        result = commit_changes(args.worktree or project_path, args.message)
 
     elif args.action == "push":
-        result = push_branch(project_path, args.branch)
+        result = push_branch(args.worktree or project_path, args.branch)
 
     elif args.action == "merge":
         if not args.branch:
@@ -12,23 +12,42 @@ Usage:
         --todo-id todo_001 \
         --acceptance-criteria '["Page loads without errors", "Button is visible"]'
 
+    # Record visual baselines from a server running the main branch
+    python execution/playwright_test_runner.py \
+        --url http://localhost:3001 \
+        --todo-id baseline \
+        --project /path/to/project \
+        --base-commit "$(git -C /path/to/project rev-parse main)" \
+        --update-baselines
+
 Requirements:
     pip install playwright
     playwright install chromium
+
+Long-running callers (the agent coordinator) share one browser through
+BrowserPool instead of launching Chromium per run:
+
+    pool = BrowserPool().start()
+    result = pool.run(run_tests(url, todo_id, criteria, pool=pool))
+    pool.close()
 """
 
 import argparse
 import asyncio
 import json
 import sys
+import threading
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional
 from dataclasses import dataclass, field
+from urllib.parse import urlparse
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils import load_env, log, save_json, get_tmp_path, ExecutionResult, timestamp
+from visual_diff import BaselineStore, check_against_baseline, numpy_available
 
 # Lazy import playwright to avoid errors if not installed
 playwright_available = True
@@ -38,6 +57,12 @@ except ImportError:
     playwright_available = False
 
 
+# Relaunch the pooled browser after this many context leases to bound memory
+DEFAULT_BROWSER_MAX_USES = 50
+
+VIEWPORT = {"width": 1280, "height": 720}
+
+
 @dataclass
 class TestResult:
     """Result of a single test assertion."""
@@ -85,6 +110,155 @@ class TestSuiteResult:
         }
 
 
+class BrowserPool:
+    """
+    One long-lived Chromium shared by many test runs.
+
+    Each run leases its own isolated BrowserContext. The pool owns an event
+    loop on a background thread, so worker threads submit their test
+    coroutines with run() instead of starting a loop and a browser each.
+    The browser is health-checked before every lease and relaunched when it
+    has disconnected or has served max_uses leases; a replaced browser is
+    closed once its outstanding leases are returned.
+    """
+
+    def __init__(self, headless: bool = True, max_uses: int = DEFAULT_BROWSER_MAX_USES):
+        self.headless = headless
+        self.max_uses = max_uses
+        self.launches = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self._active: Dict[Any, int] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    def start(self) -> "BrowserPool":
+        """Start the pool's event loop thread and Playwright driver."""
+        if self._thread:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="browser-pool",
+            daemon=True
+        )
+        self._thread.start()
+        self.run(self._start_playwright())
+        return self
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the pool's loop from any thread and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def close(self):
+        """Close the browser, stop Playwright and the loop thread."""
+        if not self._thread:
+            return
+        self.run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "BrowserPool":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def _start_playwright(self):
+        self._lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+
+    async def _shutdown(self):
+        for browser in list(self._active):
+            await self._close_browser(browser)
+        self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _close_browser(self, browser):
+        self._active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+    async def _acquire_browser(self, relaunch: bool = False):
+        async with self._lock:
+            browser = self._browser
+            if (
+                relaunch
+                or browser is None
+                or not browser.is_connected()
+                or self._uses >= self.max_uses
+            ):
+                if browser is not None and self._active.get(browser, 0) == 0:
+                    await self._close_browser(browser)
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._active[self._browser] = 0
+                self._uses = 0
+                self.launches += 1
+                log(f"Browser pool launched browser #{self.launches}")
+
+            self._uses += 1
+            self._active[self._browser] += 1
+            return self._browser
+
+    async def _release_browser(self, browser):
+        async with self._lock:
+            if browser not in self._active:
+                return
+            self._active[browser] -= 1
+            # Close a replaced browser once nothing is using it anymore
+            if browser is not self._browser and self._active[browser] == 0:
+                await self._close_browser(browser)
+
+    @asynccontextmanager
+    async def lease_context(self, **context_options) -> AsyncIterator[Any]:
+        """Lease a fresh BrowserContext; it is closed when the lease ends."""
+        browser = await self._acquire_browser()
+        try:
+            context = await browser.new_context(**context_options)
+        except Exception:
+            # Unhealthy browser: replace it and retry once
+            await self._release_browser(browser)
+            browser = await self._acquire_browser(relaunch=True)
+            context = await browser.new_context(**context_options)
+
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+            await self._release_browser(browser)
+
+
+@asynccontextmanager
+async def browser_context(
+    pool: Optional[BrowserPool] = None,
+    headless: bool = True
+) -> AsyncIterator[Any]:
+    """Yield a BrowserContext leased from the pool, or from a one-off browser."""
+    if pool:
+        async with pool.lease_context(viewport=VIEWPORT) as context:
+            yield context
+        return
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            yield await browser.new_context(viewport=VIEWPORT)
+        finally:
+            await browser.close()
+
+
 async def take_screenshot(page: Page, name: str, output_dir: Path) -> str:
     """Take a screenshot and return the file path."""
     screenshot_path = output_dir / f"{name}.png"
@@ -154,29 +328,62 @@ async def test_page_loads(page: Page, url: str, output_dir: Path) -> TestResult:
 async def test_no_visual_regression(
     page: Page,
     output_dir: Path,
-    baseline_dir: Optional[Path] = None
+    store: Optional[BaselineStore] = None,
+    route: str = "/",
+    update_baseline: bool = False,
+    project: Optional[str] = None,
+    base_commit: Optional[str] = None
 ) -> TestResult:
-    """Take a screenshot for visual comparison."""
+    """
+    Compare a screenshot with the stored baseline for this project, base
+    commit, route and viewport.
+
+    Baselines are only recorded with update_baseline (from a main-branch
+    render), which stores the screenshot instead of comparing it; without
+    a baseline the check passes uncompared. Without NumPy/Pillow the
+    screenshot is only captured.
+    """
     start = time.time()
 
     try:
         screenshot_path = await take_screenshot(page, "visual_check", output_dir)
 
-        # If there's a baseline, compare (simplified - just check sizes match)
-        if baseline_dir and (baseline_dir / "visual_check.png").exists():
-            # In a real implementation, you'd use pixelmatch or similar
+        if not numpy_available:
             return TestResult(
                 name="Visual regression",
                 passed=True,
-                message="Screenshot captured (manual review needed)",
+                message="Screenshot captured (install numpy and pillow for comparison)",
                 screenshot=screenshot_path,
                 duration_ms=int((time.time() - start) * 1000)
             )
 
+        store = store or BaselineStore()
+        viewport = page.viewport_size or VIEWPORT
+        if update_baseline:
+            store.put(route, Path(screenshot_path), viewport, project, base_commit)
+            message = "Baseline updated"
+            passed = True
+        else:
+            # Pixel comparison is CPU-bound; keep it off the event loop
+            diff = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: check_against_baseline(
+                    Path(screenshot_path),
+                    route,
+                    viewport,
+                    store=store,
+                    diff_path=output_dir / "visual_diff.png",
+                    project=project,
+                    base_commit=base_commit
+                )
+            )
+            message = diff.message + (f" - diff: {diff.diff_image}" if diff.diff_image else "")
+            passed = diff.passed
+
         return TestResult(
             name="Visual regression",
-            passed=True,
-            message="Baseline screenshot captured",
+            passed=passed,
+            message=message,
             screenshot=screenshot_path,
             duration_ms=int((time.time() - start) * 1000)
         )
@@ -277,12 +484,78 @@ async def test_acceptance_criterion(
         )
 
 
+async def test_criterion_in_new_page(
+    context,
+    url: str,
+    criterion: str,
+    output_dir: Path,
+    timeout: int,
+    semaphore: asyncio.Semaphore
+) -> TestResult:
+    """Load the URL in a page of its own and test one acceptance criterion there."""
+    async with semaphore:
+        start = time.time()
+        page = await context.new_page()
+        try:
+            page.set_default_timeout(timeout * 1000)
+            await page.goto(url, wait_until="networkidle", timeout=30000)
+            return await test_acceptance_criterion(page, criterion, output_dir)
+        except Exception as e:
+            return TestResult(
+                name=criterion,
+                passed=False,
+                message=str(e),
+                duration_ms=int((time.time() - start) * 1000)
+            )
+        finally:
+            await page.close()
+
+
+async def record_missing_baseline(
+    url: str,
+    project: str,
+    base_commit: str,
+    headless: bool = True,
+    pool: Optional[BrowserPool] = None,
+    store: Optional[BaselineStore] = None
+) -> bool:
+    """
+    Record the visual baseline for a main-branch commit if it has none.
+
+    url must serve the project exactly at base_commit (e.g. a worktree
+    just branched from main, before any edits). Must be awaited on the
+    pool's loop when a pool is given (see BrowserPool.run).
+
+    Returns:
+        Whether a baseline was recorded
+    """
+    store = store or BaselineStore()
+    route = urlparse(url).path or "/"
+    if not numpy_available or store.get(route, VIEWPORT, project, base_commit):
+        return False
+
+    output_dir = get_tmp_path(f"auto-dev/screenshots/baselines/{base_commit[:12]}")
+    async with browser_context(pool, headless) as context:
+        page = await context.new_page()
+        await page.goto(url, wait_until="networkidle", timeout=30000)
+        screenshot_path = await take_screenshot(page, "baseline", output_dir)
+        store.put(route, Path(screenshot_path), page.viewport_size or VIEWPORT, project, base_commit)
+
+    log(f"Recorded visual baseline for {BaselineStore.key(route, VIEWPORT, project, base_commit)}")
+    return True
+
+
 async def run_tests(
     url: str,
     todo_id: str,
     acceptance_criteria: List[str],
     timeout: int = 120,
-    headless: bool = True
+    headless: bool = True,
+    pool: Optional[BrowserPool] = None,
+    criteria_concurrency: int = 1,
+    update_baseline: bool = False,
+    project: Optional[str] = None,
+    base_commit: Optional[str] = None
 ) -> TestSuiteResult:
     """
     Run all tests for a todo item.
@@ -292,7 +565,17 @@ async def run_tests(
         todo_id: Identifier for this todo
         acceptance_criteria: List of criteria to verify
         timeout: Maximum time for all tests
-        headless: Run browser in headless mode
+        headless: Run browser in headless mode (ignored with a pool)
+        pool: Shared browser pool to lease a context from; must be awaited
+            on the pool's loop (see BrowserPool.run)
+        criteria_concurrency: With more than 1, acceptance criteria are
+            evaluated concurrently, each in its own page of the same
+            context, at most this many at a time (results keep their order)
+        update_baseline: Store this run's screenshot as the route's visual
+            baseline instead of comparing against it (main-branch renders only)
+        project: Project path the visual baseline belongs to
+        base_commit: Main-branch commit the tested checkout is based on;
+            the screenshot is compared with that commit's baseline
 
     Returns:
         TestSuiteResult with all test outcomes
@@ -306,12 +589,8 @@ async def run_tests(
     # Create output directory for screenshots
     output_dir = get_tmp_path(f"auto-dev/screenshots/{todo_id}")
 
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(headless=headless)
-            context = await browser.new_context(
-                viewport={"width": 1280, "height": 720}
-            )
+    try:
+        async with browser_context(pool, headless) as context:
             page = await context.new_page()
 
             # Set timeout
@@ -327,11 +606,17 @@ async def run_tests(
                 result.failed_tests += 1
                 # If page doesn't load, skip other tests
                 result.finished_at = timestamp()
-                await browser.close()
                 return result
 
-            # Test 2: Visual regression baseline
-            visual_result = await test_no_visual_regression(page, output_dir)
+            # Test 2: Visual regression against the route's baseline
+            visual_result = await test_no_visual_regression(
+                page,
+                output_dir,
+                route=urlparse(url).path or "/",
+                update_baseline=update_baseline,
+                project=project,
+                base_commit=base_commit
+            )
             result.results.append(visual_result)
             result.total_tests += 1
             if visual_result.passed:
@@ -339,9 +624,20 @@ async def run_tests(
             else:
                 result.failed_tests += 1
 
-            # Test 3+: Acceptance criteria
-            for criterion in acceptance_criteria:
-                criterion_result = await test_acceptance_criterion(page, criterion, output_dir)
+            # Test 3+: Acceptance criteria (only reached once the page loads)
+            if criteria_concurrency > 1:
+                semaphore = asyncio.Semaphore(criteria_concurrency)
+                criteria_results = await asyncio.gather(*[
+                    test_criterion_in_new_page(context, url, criterion, output_dir, timeout, semaphore)
+                    for criterion in acceptance_criteria
+                ])
+            else:
+                criteria_results = [
+                    await test_acceptance_criterion(page, criterion, output_dir)
+                    for criterion in acceptance_criteria
+                ]
+
+            for criterion_result in criteria_results:
                 result.results.append(criterion_result)
                 result.total_tests += 1
                 if criterion_result.passed:
@@ -349,11 +645,9 @@ async def run_tests(
                 else:
                     result.failed_tests += 1
 
-            await browser.close()
-
-        except Exception as e:
-            result.error = str(e)
-            log(f"Test suite error: {e}", level="error")
+    except Exception as e:
+        result.error = str(e)
+        log(f"Test suite error: {e}", level="error")
 
     result.finished_at = timestamp()
     return result
@@ -406,6 +700,26 @@ def main():
         action="store_true",
         help="Run browser in headed mode (visible)"
     )
+    parser.add_argument(
+        "--criteria-concurrency",
+        type=int,
+        default=1,
+        help="Evaluate up to N acceptance criteria at once, each in its own page (default: 1)"
+    )
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="Record this run's screenshots as the visual regression baselines "
+             "(run against the main branch)"
+    )
+    parser.add_argument(
+        "--project",
+        help="Project path the visual baselines belong to"
+    )
+    parser.add_argument(
+        "--base-commit",
+        help="Main-branch commit the served checkout is based on"
+    )
     parser.add_argument(
         "--wait-for-server",
         action="store_true",
@@ -448,7 +762,11 @@ def main():
             todo_id=args.todo_id,
             acceptance_criteria=criteria,
             timeout=args.timeout,
-            headless=not args.headed
+            headless=not args.headed,
+            criteria_concurrency=args.criteria_concurrency,
+            update_baseline=args.update_baselines,
+            project=args.project,
+            base_commit=args.base_commit
         )
 
         # Save results
@@ -0,0 +1,194 @@
+"""
+Port reservations for dev servers.
+
+Ports are handed out from a registry in .tmp/auto-dev/port_reservations.json.
+Every read-modify-write of the registry holds an exclusive lock (fcntl.flock
+on a lock file where available, plus a thread lock), so concurrent workers
+and separate coordinators on the same machine never pick the same port in
+the window between checking it and the server binding it. The registry is
+replaced atomically, and an unreadable one is moved aside with a warning.
+
+A reservation records the pid that holds the port: the reserving process
+until the server starts, then the server itself. Reservations are removed
+by release_port (called from stop_server) and are treated as stale once
+their pid has exited, so a crashed run never leaks ports.
+
+Usage:
+    from port_allocator import reserve_port, update_reservation, release_port
+
+    port = reserve_port(3001, owner="/path/to/worktree")
+    update_reservation(port, pid=server_process.pid)
+    release_port(port)
+"""
+
+import errno
+import json
+import os
+import socket
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import get_tmp_path, log, timestamp
+
+# flock is POSIX-only; elsewhere only threads in this process are serialized
+fcntl_available = True
+try:
+    import fcntl
+except ImportError:
+    fcntl_available = False
+
+RESERVATIONS_FILE = "auto-dev/port_reservations.json"
+LOCK_FILE = "auto-dev/port_reservations.lock"
+
+_thread_lock = threading.Lock()
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def can_bind(port: int) -> bool:
+    """
+    Check whether nothing is listening on the port by binding it briefly.
+
+    Both the IPv4 and IPv6 wildcard addresses are tried, since dev servers
+    often listen on "localhost" as ::1 only.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("", port))
+        except OSError:
+            return False
+
+    if socket.has_ipv6:
+        try:
+            s6 = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+        except OSError:
+            # IPv6 disabled on this host; nothing can listen there
+            return True
+        with s6:
+            s6.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            try:
+                s6.bind(("::", port))
+            except OSError as e:
+                # No usable IPv6 address is not a conflict
+                return e.errno == errno.EADDRNOTAVAIL
+    return True
+
+
+@contextmanager
+def _locked_reservations() -> Iterator[Dict[str, dict]]:
+    """
+    Yield the live reservations under the registry lock.
+
+    Changes made to the yielded dict are written back on exit.
+    """
+    path = get_tmp_path(RESERVATIONS_FILE)
+    with _thread_lock, open(get_tmp_path(LOCK_FILE), "a") as lock_handle:
+        if fcntl_available:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+        try:
+            try:
+                reservations = json.loads(path.read_text())
+            except FileNotFoundError:
+                reservations = {}
+            except json.JSONDecodeError as e:
+                # Writes are atomic, so this is outside interference; keep
+                # the file for inspection rather than silently dropping it
+                corrupt = path.with_name(f"{path.name}.corrupt")
+                os.replace(path, corrupt)
+                log(f"Port reservations were unreadable ({e}); moved to {corrupt}", level="warning")
+                reservations = {}
+
+            reservations = {
+                port: info for port, info in reservations.items()
+                if _process_alive(info.get("pid"))
+            }
+            yield reservations
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(reservations, indent=2))
+            os.replace(temp_path, path)
+        finally:
+            if fcntl_available:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+
+def reserve_port(
+    preferred: int,
+    owner: str,
+    pid: Optional[int] = None,
+    max_attempts: int = 100
+) -> int:
+    """
+    Reserve the first free port at or after preferred.
+
+    A port is free if it has no live reservation and can be bound.
+
+    Args:
+        preferred: First port to try
+        owner: Free-form description of the holder (e.g. project path)
+        pid: Process holding the port (defaults to the current process)
+        max_attempts: Number of consecutive ports to try
+
+    Returns:
+        The reserved port
+
+    Raises:
+        RuntimeError: If no port in the range is free
+    """
+    with _locked_reservations() as reservations:
+        for port in range(preferred, preferred + max_attempts):
+            if str(port) in reservations or not can_bind(port):
+                continue
+            reservations[str(port)] = {
+                "owner": owner,
+                "pid": pid or os.getpid(),
+                "reserved_at": timestamp()
+            }
+            return port
+
+    raise RuntimeError(f"No available ports found in range {preferred}-{preferred + max_attempts}")
+
+
+def update_reservation(port: int, pid: int) -> bool:
+    """
+    Hand a reservation over to another process (e.g. the started server).
+
+    Returns:
+        False if the port is not reserved
+    """
+    with _locked_reservations() as reservations:
+        if str(port) not in reservations:
+            return False
+        reservations[str(port)]["pid"] = pid
+        return True
+
+
+def release_port(port: int) -> bool:
+    """
+    Drop the reservation for a port.
+
+    Returns:
+        False if the port was not reserved
+    """
+    with _locked_reservations() as reservations:
+        return reservations.pop(str(port), None) is not None
+
+
+def list_reservations() -> Dict[str, dict]:
+    """Return the live reservations keyed by port."""
+    with _locked_reservations() as reservations:
+        return dict(reservations)
@@ -0,0 +1,638 @@
+"""
+SQLite-backed store for the auto-dev work queue.
+
+The queue lives in .tmp/auto-dev/work_queue.db (WAL mode) so that every
+claim/complete transition is a single indexed UPDATE instead of a rewrite
+of the whole work_queue.json, and so that concurrent writers (threads or
+separate processes) are serialized by SQLite's own locking.
+
+Each todo keeps a count of its unfinished dependencies (pending_deps),
+decremented when a dependency completes. The "ready set" is therefore the
+(status = 'pending', pending_deps = 0) slice of an index ordered by queue
+position, and picking the next todo is an O(log n) index lookup.
+
+File conflicts between todos are stored as edges in todo_conflicts, so a
+claim can atomically skip todos that touch the same files as any todo
+already in progress.
+
+Claims are leases: each claim sets lease_expires_at and bumps attempts,
+the claiming worker renews the lease while it runs, and reclaim_expired
+returns todos whose lease ran out (crashed worker or coordinator) to
+pending, or fails them once they've used up their attempts.
+
+work_queue.json is still produced as an export of the store for humans
+and for the `--action status` output.
+
+A queue can also be filled while it is being worked: a producer (e.g.
+generate_todos.py --stream-to-queue) opens it with set_producer_open,
+adds batches with append_todos as they are parsed, and closes it when
+done. Consumers keep polling for new todos while producer_open is true.
+
+Usage:
+    from queue_store import replace_queue, claim_next, complete, export_queue
+
+    replace_queue(work_queue)
+    append_todos(more_todos)
+    todo = claim_next("worker_0")
+    complete(todo["id"], success=True)
+    snapshot = export_queue()
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import get_tmp_path, log, timestamp
+
+QUEUE_DB = "auto-dev/work_queue.db"
+
+# Bump when the schema changes; older databases are rebuilt on open
+SCHEMA_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS todos (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    claimed_by TEXT,
+    claimed_at TEXT,
+    completed_at TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    pending_deps INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_todos_ready ON todos (status, pending_deps, position);
+CREATE INDEX IF NOT EXISTS idx_todos_status_position ON todos (status, position);
+CREATE INDEX IF NOT EXISTS idx_todos_status_priority ON todos (status, priority);
+CREATE INDEX IF NOT EXISTS idx_todos_lease ON todos (status, lease_expires_at);
+
+CREATE TABLE IF NOT EXISTS todo_deps (
+    todo_id TEXT NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (todo_id, depends_on)
+);
+
+CREATE INDEX IF NOT EXISTS idx_todo_deps_depends_on ON todo_deps (depends_on);
+
+CREATE TABLE IF NOT EXISTS todo_conflicts (
+    todo_id TEXT NOT NULL,
+    other_id TEXT NOT NULL,
+    PRIMARY KEY (todo_id, other_id)
+);
+"""
+
+TABLES = ["meta", "todos", "todo_deps", "todo_conflicts"]
+
+# Queue-level fields kept in the meta table (JSON-encoded)
+META_FIELDS = [
+    "created_at", "source_file", "filters", "file_conflicts", "dependency_cycles", "waves",
+    "producer_open"
+]
+
+# Columns that override the status fields stored in the todo's JSON blob
+STATUS_COLUMNS = "status, claimed_by, claimed_at, completed_at, lease_expires_at, attempts"
+
+# A pending todo is ready once every todo it depends on has completed.
+# Dependencies missing from the queue (e.g. filtered out) never complete.
+READY_CONDITION = "t.status = 'pending' AND t.pending_deps = 0"
+
+# Added to READY_CONDITION when claims must not overlap in-progress work
+NO_CONFLICT_CONDITION = """
+    NOT EXISTS (
+        SELECT 1 FROM todo_conflicts c
+        JOIN todos o ON o.id = c.other_id
+        WHERE c.todo_id = t.id AND o.status = 'in_progress'
+    )
+"""
+
+
+def get_db_path() -> Path:
+    """Path of the work queue database in .tmp/."""
+    return get_tmp_path(QUEUE_DB)
+
+
+@contextmanager
+def open_store(db_path: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Open a connection to the queue database, creating the schema if needed.
+
+    Connections are in autocommit mode; multi-statement changes use
+    `BEGIN IMMEDIATE` so they take the write lock up front.
+    """
+    conn = sqlite3.connect(
+        str(db_path or get_db_path()),
+        timeout=30,
+        isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _ensure_schema(conn)
+        yield conn
+    finally:
+        conn.close()
+
+
+def _ensure_schema(conn: sqlite3.Connection):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-check under the write lock in case another process migrated
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            if version != 0:
+                log(
+                    f"Work queue schema changed (v{version} -> v{SCHEMA_VERSION}), "
+                    "rebuilding empty queue",
+                    level="warning"
+                )
+            for table in TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _row_to_todo(row: sqlite3.Row) -> dict:
+    """Merge the authoritative status columns into the stored todo."""
+    todo = json.loads(row["data"])
+    for column in STATUS_COLUMNS.split(", "):
+        todo[column] = row[column]
+    return todo
+
+
+def queue_exists(db_path: Optional[Path] = None) -> bool:
+    """Whether a work queue has been created."""
+    path = db_path or get_db_path()
+    if not path.exists():
+        return False
+    with open_store(path) as conn:
+        row = conn.execute("SELECT 1 FROM meta WHERE key = 'created_at'").fetchone()
+        return row is not None
+
+
+def replace_queue(work_queue: dict, db_path: Optional[Path] = None):
+    """Replace the stored queue with the given work_queue dict."""
+    todos = work_queue.get("todos", [])
+    completed = {todo["id"] for todo in todos if todo.get("status") == "completed"}
+
+    with open_store(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in TABLES:
+                conn.execute(f"DELETE FROM {table}")
+
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(work_queue.get(key))) for key in META_FIELDS]
+            )
+            conn.executemany(
+                f"""INSERT INTO todos (id, position, priority, {STATUS_COLUMNS}, pending_deps, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        todo["id"],
+                        position,
+                        todo.get("priority", 3),
+                        todo.get("status", "pending"),
+                        todo.get("claimed_by"),
+                        todo.get("claimed_at"),
+                        todo.get("completed_at"),
+                        todo.get("lease_expires_at"),
+                        todo.get("attempts", 0),
+                        len(set(todo.get("depends_on", [])) - completed),
+                        json.dumps(todo, default=str)
+                    )
+                    for position, todo in enumerate(todos)
+                ]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO todo_deps (todo_id, depends_on) VALUES (?, ?)",
+                [
+                    (todo["id"], dep)
+                    for todo in todos
+                    for dep in todo.get("depends_on", [])
+                ]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO todo_conflicts (todo_id, other_id) VALUES (?, ?)",
+                [
+                    (todo_id, other_id)
+                    for todo_id, others in (work_queue.get("file_conflicts") or {}).items()
+                    for other_id in others
+                ]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _ready_condition(avoid_conflicts: bool) -> str:
+    if avoid_conflicts:
+        return f"{READY_CONDITION} AND {NO_CONFLICT_CONDITION}"
+    return READY_CONDITION
+
+
+def status_counts(db_path: Optional[Path] = None) -> dict:
+    """Return {"total", "pending", "in_progress", "completed", "failed"}."""
+    counts = {"pending": 0, "in_progress": 0, "completed": 0, "failed": 0}
+    with open_store(db_path) as conn:
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM todos GROUP BY status"):
+            counts[row["status"]] = row["n"]
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def export_queue(db_path: Optional[Path] = None) -> dict:
+    """
+    Export the store in the work_queue.json format.
+
+    Raises:
+        FileNotFoundError: If no queue has been created
+    """
+    if not queue_exists(db_path):
+        raise FileNotFoundError("Work queue not found")
+
+    with open_store(db_path) as conn:
+        meta = {
+            row["key"]: json.loads(row["value"])
+            for row in conn.execute("SELECT key, value FROM meta")
+        }
+        todos = [
+            _row_to_todo(row)
+            for row in conn.execute(
+                f"SELECT {STATUS_COLUMNS}, data FROM todos ORDER BY position"
+            )
+        ]
+
+    counts = status_counts(db_path)
+    return {
+        "created_at": meta.get("created_at"),
+        "source_file": meta.get("source_file"),
+        "filters": meta.get("filters"),
+        "total_count": counts["total"],
+        "pending_count": counts["pending"],
+        "in_progress_count": counts["in_progress"],
+        "completed_count": counts["completed"],
+        "failed_count": counts["failed"],
+        "file_conflicts": meta.get("file_conflicts") or {},
+        "dependency_cycles": meta.get("dependency_cycles") or [],
+        "waves": meta.get("waves") or [],
+        "producer_open": bool(meta.get("producer_open")),
+        "todos": todos
+    }
+
+
+def set_producer_open(is_open: bool, db_path: Optional[Path] = None):
+    """Mark whether a producer is still appending todos to the queue."""
+    with open_store(db_path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('producer_open', ?)",
+            (json.dumps(is_open),)
+        )
+
+
+def producer_open(db_path: Optional[Path] = None) -> bool:
+    """Whether more todos may still be appended to the queue."""
+    with open_store(db_path) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'producer_open'").fetchone()
+    return bool(row and json.loads(row["value"]))
+
+
+def append_todos(
+    todos: List[dict],
+    conflicts: Optional[Dict[str, List[str]]] = None,
+    db_path: Optional[Path] = None
+) -> List[str]:
+    """
+    Add todos after the end of the queue, skipping IDs already present.
+
+    Dependencies count as unfinished unless already completed, so a todo
+    may depend on one that is appended later. conflicts maps new todo IDs
+    to the (new or existing) todos they share files with; edges are
+    stored in both directions.
+
+    Returns:
+        IDs of the todos that were added
+    """
+    conflicts = conflicts or {}
+    with open_store(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM todos"
+            ).fetchone()[0]
+
+            added = []
+            for todo in todos:
+                deps = sorted(set(todo.get("depends_on", [])))
+                done = conn.execute(
+                    f"""SELECT COUNT(*) FROM todos
+                        WHERE status = 'completed' AND id IN ({",".join("?" * len(deps))})""",
+                    deps
+                ).fetchone()[0] if deps else 0
+                inserted = conn.execute(
+                    f"""INSERT OR IGNORE INTO todos
+                        (id, position, priority, {STATUS_COLUMNS}, pending_deps, data)
+                        VALUES (?, ?, ?, 'pending', NULL, NULL, NULL, NULL, 0, ?, ?)""",
+                    (
+                        todo["id"],
+                        position,
+                        todo.get("priority", 3),
+                        len(deps) - done,
+                        json.dumps(todo, default=str)
+                    )
+                ).rowcount
+                if not inserted:
+                    continue
+                added.append(todo["id"])
+                position += 1
+                conn.executemany(
+                    "INSERT OR IGNORE INTO todo_deps (todo_id, depends_on) VALUES (?, ?)",
+                    [(todo["id"], dep) for dep in deps]
+                )
+
+            edges = [
+                edge
+                for todo_id in added
+                for other_id in conflicts.get(todo_id, [])
+                for edge in ((todo_id, other_id), (other_id, todo_id))
+            ]
+            conn.executemany(
+                "INSERT OR IGNORE INTO todo_conflicts (todo_id, other_id) VALUES (?, ?)",
+                edges
+            )
+
+            # Keep the exported conflict map in step with the edges
+            if edges:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'file_conflicts'"
+                ).fetchone()
+                file_conflicts = (json.loads(row["value"]) if row else None) or {}
+                for todo_id, other_id in edges:
+                    others = file_conflicts.setdefault(todo_id, [])
+                    if other_id not in others:
+                        others.append(other_id)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('file_conflicts', ?)",
+                    (json.dumps(file_conflicts),)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return added
+
+
+def update_pending(todo_id: str, changes: dict, db_path: Optional[Path] = None) -> bool:
+    """
+    Update fields of a todo that hasn't been claimed yet.
+
+    Returns:
+        False if the todo is missing or no longer pending
+    """
+    with open_store(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM todos WHERE id = ? AND status = 'pending'",
+                (todo_id,)
+            ).fetchone()
+            if row:
+                todo = {**json.loads(row["data"]), **changes}
+                conn.execute(
+                    "UPDATE todos SET data = ?, priority = ? WHERE id = ?",
+                    (json.dumps(todo, default=str), todo.get("priority", 3), todo_id)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return row is not None
+
+
+def next_available(
+    db_path: Optional[Path] = None,
+    avoid_conflicts: bool = False
+) -> Optional[dict]:
+    """Peek at the next ready todo without claiming it."""
+    with open_store(db_path) as conn:
+        row = conn.execute(
+            f"""SELECT {STATUS_COLUMNS}, data FROM todos t
+                WHERE {_ready_condition(avoid_conflicts)}
+                ORDER BY t.position LIMIT 1"""
+        ).fetchone()
+    return _row_to_todo(row) if row else None
+
+
+def claim(
+    todo_id: str,
+    agent_id: str,
+    lease_seconds: float,
+    db_path: Optional[Path] = None
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Atomically claim a specific pending todo with a lease.
+
+    Returns:
+        (todo, None) on success, or (None, error message)
+    """
+    with open_store(db_path) as conn:
+        row = conn.execute(
+            f"""UPDATE todos
+                SET status = 'in_progress', claimed_by = ?, claimed_at = ?,
+                    lease_expires_at = ?, attempts = attempts + 1
+                WHERE id = ? AND status = 'pending'
+                RETURNING {STATUS_COLUMNS}, data""",
+            (agent_id, timestamp(), time.time() + lease_seconds, todo_id)
+        ).fetchone()
+        if row:
+            return _row_to_todo(row), None
+
+        existing = conn.execute("SELECT status FROM todos WHERE id = ?", (todo_id,)).fetchone()
+
+    if existing is None:
+        return None, f"Todo {todo_id} not found"
+    return None, f"Todo {todo_id} is not pending (status: {existing['status']})"
+
+
+def claim_next(
+    agent_id: str,
+    lease_seconds: float,
+    db_path: Optional[Path] = None,
+    avoid_conflicts: bool = False
+) -> Optional[dict]:
+    """
+    Atomically claim the next ready todo in queue order.
+
+    With avoid_conflicts, todos sharing files with an in-progress todo are
+    skipped; the check and the claim happen in the same statement.
+    """
+    with open_store(db_path) as conn:
+        row = conn.execute(
+            f"""UPDATE todos
+                SET status = 'in_progress', claimed_by = ?, claimed_at = ?,
+                    lease_expires_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT t.id FROM todos t
+                    WHERE {_ready_condition(avoid_conflicts)}
+                    ORDER BY t.position LIMIT 1
+                )
+                RETURNING {STATUS_COLUMNS}, data""",
+            (agent_id, timestamp(), time.time() + lease_seconds)
+        ).fetchone()
+    return _row_to_todo(row) if row else None
+
+
+def complete(
+    todo_id: str,
+    success: bool = True,
+    db_path: Optional[Path] = None
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Mark an in-progress todo as completed or failed.
+
+    Returns:
+        (todo, None) on success, or (None, error message)
+    """
+    new_status = "completed" if success else "failed"
+    with open_store(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"""UPDATE todos
+                    SET status = ?, completed_at = ?, lease_expires_at = NULL
+                    WHERE id = ? AND status = 'in_progress'
+                    RETURNING {STATUS_COLUMNS}, data""",
+                (new_status, timestamp(), todo_id)
+            ).fetchone()
+
+            # Completing a todo moves its dependents one step closer to ready
+            if row and success:
+                conn.execute(
+                    """UPDATE todos SET pending_deps = pending_deps - 1
+                       WHERE id IN (SELECT todo_id FROM todo_deps WHERE depends_on = ?)""",
+                    (todo_id,)
+                )
+
+            existing = None
+            if not row:
+                existing = conn.execute(
+                    "SELECT status FROM todos WHERE id = ?", (todo_id,)
+                ).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    if row:
+        return _row_to_todo(row), None
+    if existing is None:
+        return None, f"Todo {todo_id} not found"
+    return None, f"Todo {todo_id} is not in progress (status: {existing['status']})"
+
+
+def renew_lease(
+    todo_id: str,
+    agent_id: str,
+    lease_seconds: float,
+    db_path: Optional[Path] = None
+) -> bool:
+    """
+    Extend the lease on a todo held by agent_id.
+
+    Returns:
+        False if the todo is no longer in progress under this agent
+        (e.g. its lease expired and it was reclaimed)
+    """
+    with open_store(db_path) as conn:
+        row = conn.execute(
+            """UPDATE todos SET lease_expires_at = ?
+               WHERE id = ? AND claimed_by = ? AND status = 'in_progress'
+               RETURNING id""",
+            (time.time() + lease_seconds, todo_id, agent_id)
+        ).fetchone()
+    return row is not None
+
+
+def release(todo_id: str, db_path: Optional[Path] = None) -> bool:
+    """Return an in-progress todo to pending, keeping its attempt count."""
+    with open_store(db_path) as conn:
+        row = conn.execute(
+            """UPDATE todos
+               SET status = 'pending', claimed_by = NULL, claimed_at = NULL,
+                   lease_expires_at = NULL
+               WHERE id = ? AND status = 'in_progress'
+               RETURNING id""",
+            (todo_id,)
+        ).fetchone()
+    return row is not None
+
+
+def reclaim_expired(
+    max_attempts: int,
+    db_path: Optional[Path] = None
+) -> List[dict]:
+    """
+    Sweep in-progress todos whose lease has expired.
+
+    Todos with attempts left go back to pending; the rest are failed.
+
+    Returns:
+        List of {"id", "status", "attempts", "claimed_by"} for each swept todo
+    """
+    with open_store(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = conn.execute(
+                """SELECT id, claimed_by, attempts FROM todos
+                   WHERE status = 'in_progress' AND lease_expires_at < ?""",
+                (time.time(),)
+            ).fetchall()
+
+            swept = []
+            for row in expired:
+                new_status = "failed" if row["attempts"] >= max_attempts else "pending"
+                conn.execute(
+                    """UPDATE todos
+                       SET status = ?, claimed_by = NULL, claimed_at = NULL,
+                           lease_expires_at = NULL, completed_at = ?
+                       WHERE id = ?""",
+                    (new_status, timestamp() if new_status == "failed" else None, row["id"])
+                )
+                swept.append({
+                    "id": row["id"],
+                    "status": new_status,
+                    "attempts": row["attempts"],
+                    "claimed_by": row["claimed_by"]
+                })
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    return swept
@@ -4,6 +4,22 @@ Todo processor for the auto-dev agent system.
 
 Parses todos from generate_todos.py output, prioritizes them,
 detects dependencies, and creates a work queue for parallel processing.
+The generator ranks priority 1 as critical; queued todos are flipped onto
+the queue's scale, where 5 is most important (see Todo.from_generator).
+
+The queue is stored in SQLite (see queue_store.py) so claims and
+completions are single transactional updates; work_queue.json is
+written as an export on create and on `--action status`.
+
+Claims are leases that the claiming worker keeps alive with a heartbeat
+(LeaseHeartbeat). Expired leases are swept back to pending by
+reclaim_expired_todos, so a crashed worker doesn't strand its todo.
+
+A queue can also be streamed: open_streaming_queue creates (or reopens) it
+with the producer flag set, append_to_work_queue adds each batch of todos
+as it is generated (conflicts and dependencies are checked against
+everything already queued), and close_streaming_queue clears the flag so
+following consumers know no more todos are coming.
 
 Usage:
     # Create work queue from todos
@@ -25,20 +41,48 @@ Usage:
     python execution/todo_processor.py \
         --action complete \
         --todo-id todo_001
+
+    # Renew the lease on a claimed todo (heartbeat)
+    python execution/todo_processor.py \
+        --action renew \
+        --todo-id todo_001 \
+        --agent-id worker_0
+
+    # Return todos with expired leases to pending
+    python execution/todo_processor.py --action reclaim
+
+    # Show queue status (also refreshes the work_queue.json export)
+    python execution/todo_processor.py --action status
+
+    # Benchmark prioritization and queue operations on 50k synthetic todos
+    python execution/todo_processor.py --action benchmark --count 50000
 """
 
 import argparse
+import heapq
 import json
+import random
 import re
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils import load_env, log, save_json, load_json, get_tmp_path, ExecutionResult, timestamp
+import queue_store
+
+# How long a claim stays valid without a heartbeat
+DEFAULT_LEASE_SECONDS = 180
+# How often a worker renews its lease
+HEARTBEAT_INTERVAL = 30
+# Claims allowed per todo before an expired lease fails it for good
+DEFAULT_MAX_ATTEMPTS = 3
 
 
 @dataclass
@@ -57,6 +101,9 @@ class Todo:
     claimed_by: Optional[str] = None
     claimed_at: Optional[str] = None
     completed_at: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    attempts: int = 0
+    wave: Optional[int] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "Todo":
@@ -67,15 +114,31 @@ class Todo:
             category=data.get("category", "feature"),
             description=data.get("description", ""),
             acceptance_criteria=data.get("acceptance_criteria", []),
-            related_files=data.get("related_files", []),
-            timestamp=data.get("timestamp", ""),
+            # generate_todos.py calls them suggested_files
+            related_files=data.get("related_files") or data.get("suggested_files", []),
+            timestamp=data.get("timestamp") or "",
             status=data.get("status", "pending"),
             depends_on=data.get("depends_on", []),
             claimed_by=data.get("claimed_by"),
             claimed_at=data.get("claimed_at"),
-            completed_at=data.get("completed_at")
+            completed_at=data.get("completed_at"),
+            lease_expires_at=data.get("lease_expires_at"),
+            attempts=data.get("attempts", 0),
+            wave=data.get("wave")
         )
 
+    @classmethod
+    def from_generator(cls, data: dict) -> "Todo":
+        """
+        Todo from generate_todos.py output.
+
+        The generator ranks 1 as critical; the queue ranks 5 as most
+        important, so the priority is flipped here, once, for every path
+        that queues generator todos.
+        """
+        priority = min(5, max(1, int(data.get("priority", 3))))
+        return cls.from_dict({**data, "priority": 6 - priority})
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -90,7 +153,10 @@ class Todo:
             "depends_on": self.depends_on,
             "claimed_by": self.claimed_by,
             "claimed_at": self.claimed_at,
-            "completed_at": self.completed_at
+            "completed_at": self.completed_at,
+            "lease_expires_at": self.lease_expires_at,
+            "attempts": self.attempts,
+            "wave": self.wave
         }
 
 
@@ -163,60 +229,165 @@ def detect_dependencies(todos: List[Todo]) -> Dict[str, List[str]]:
     return dependencies
 
 
+def find_dependency_cycles(todos: List[Todo]) -> List[List[str]]:
+    """
+    Find dependency cycles as strongly connected components (Tarjan).
+
+    Only dependencies between todos in the list are considered. Iterative,
+    so deep dependency chains don't hit the recursion limit.
+
+    Returns:
+        List of cycles, each a sorted list of todo IDs
+    """
+    graph: Dict[str, List[str]] = {}
+    for todo in todos:
+        graph[todo.id] = []
+    for todo in todos:
+        graph[todo.id] = [dep for dep in todo.depends_on if dep in graph]
+
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    cycles: List[List[str]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph[node]:
+                        cycles.append(sorted(component))
+
+    return cycles
+
+
 def prioritize_todos(
     todos: List[Todo],
     conflicts: Dict[str, List[str]],
     dependencies: Dict[str, List[str]]
-) -> List[Todo]:
+) -> Tuple[List[Todo], List[List[str]]]:
     """
     Sort todos by priority, considering conflicts and dependencies.
 
     Priority rules:
     1. Higher priority number = more important (5 is highest)
-    2. Todos with no dependencies come first
+    2. A todo always comes after the todos it depends on
     3. Todos with no file conflicts can run in parallel
+
+    Uses Kahn's algorithm with a heap keyed by (-priority, id), so the
+    ordering is O((n + e) log n). Dependency cycles are reported and broken
+    by dropping the dependencies inside each cycle.
+
+    Returns:
+        Tuple of (ordered todos, dependency cycles that were broken)
     """
     # Add detected dependencies to todos
     for todo in todos:
         if todo.id in dependencies:
             todo.depends_on = list(set(todo.depends_on + dependencies[todo.id]))
 
-    # Topological sort considering dependencies
-    def can_process(todo: Todo, completed: Set[str]) -> bool:
-        return all(dep in completed for dep in todo.depends_on)
+    # Break cycles so every todo can eventually become ready
+    cycles = find_dependency_cycles(todos)
+    for cycle in cycles:
+        log(f"Warning: Circular dependency between {', '.join(cycle)}", level="warning")
+        members = set(cycle)
+        for todo in todos:
+            if todo.id in members:
+                todo.depends_on = [dep for dep in todo.depends_on if dep not in members]
+
+    by_id = {todo.id: todo for todo in todos}
+    in_degree = {todo.id: 0 for todo in todos}
+    dependents: Dict[str, List[str]] = defaultdict(list)
+
+    for todo in todos:
+        for dep in set(todo.depends_on):
+            # Dependencies outside the queue don't affect ordering
+            if dep in by_id:
+                in_degree[todo.id] += 1
+                dependents[dep].append(todo.id)
 
-    # Sort by priority first (higher = first)
-    sorted_todos = sorted(todos, key=lambda t: (-t.priority, t.id))
+    ready = [(-todo.priority, todo.id) for todo in todos if in_degree[todo.id] == 0]
+    heapq.heapify(ready)
 
-    # Reorder based on dependencies (simple approach)
     result = []
-    remaining = sorted_todos.copy()
-    completed: Set[str] = set()
+    while ready:
+        _, todo_id = heapq.heappop(ready)
+        result.append(by_id[todo_id])
+        for dependent in dependents[todo_id]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                heapq.heappush(ready, (-by_id[dependent].priority, dependent))
 
-    # Keep iterating until all todos are placed
-    max_iterations = len(todos) * 2
-    iteration = 0
+    return result, cycles
 
-    while remaining and iteration < max_iterations:
-        iteration += 1
-        made_progress = False
 
-        for todo in remaining[:]:
-            if can_process(todo, completed):
-                result.append(todo)
-                completed.add(todo.id)
-                remaining.remove(todo)
-                made_progress = True
+def plan_waves(
+    todos: List[Todo],
+    conflicts: Dict[str, List[str]]
+) -> List[List[str]]:
+    """
+    Group todos into waves that can safely run in parallel.
 
-        # If no progress, there might be a circular dependency
-        if not made_progress and remaining:
-            # Just add the highest priority remaining todo
-            todo = remaining.pop(0)
-            result.append(todo)
-            completed.add(todo.id)
-            log(f"Warning: Possible circular dependency for {todo.id}", level="warning")
+    Greedy coloring of the conflict graph in dependency order: each todo
+    goes into the earliest wave after all of its dependencies that holds
+    no todo touching the same files. Sets todo.wave on each todo.
 
-    return result
+    Args:
+        todos: Todos in dependency order (as returned by prioritize_todos)
+        conflicts: Map of todo_id to conflicting todo_ids
+
+    Returns:
+        List of waves, each a list of todo IDs
+    """
+    wave_of: Dict[str, int] = {}
+    waves: List[List[str]] = []
+
+    for todo in todos:
+        wave = max(
+            (wave_of[dep] + 1 for dep in todo.depends_on if dep in wave_of),
+            default=0
+        )
+        taken = {wave_of[other] for other in conflicts.get(todo.id, []) if other in wave_of}
+        while wave in taken:
+            wave += 1
+
+        wave_of[todo.id] = wave
+        todo.wave = wave
+        while len(waves) <= wave:
+            waves.append([])
+        waves[wave].append(todo.id)
+
+    return waves
 
 
 def create_work_queue(
@@ -229,8 +400,9 @@ def create_work_queue(
     Load todos and create a prioritized work queue.
 
     Args:
-        todos_path: Path to the todos JSON file
-        priority_filter: Only include todos with priority >= this value
+        todos_path: Path to the todos JSON file (generate_todos.py output)
+        priority_filter: Only include todos with queue priority >= this
+            value (5 = most important, i.e. generator priority 1)
         categories: Only include todos in these categories (None = all)
         max_todos: Maximum number of todos to include
 
@@ -254,8 +426,8 @@ def create_work_queue(
     else:
         return ExecutionResult.fail(error="Invalid todos format. Expected list or {todos: [...]}.")
 
-    # Parse todos
-    todos = [Todo.from_dict(t) for t in todos_data]
+    # Parse todos (on the queue's priority scale)
+    todos = [Todo.from_generator(t) for t in todos_data]
     log(f"Loaded {len(todos)} todos from {todos_path}")
 
     # Filter by priority
@@ -273,12 +445,19 @@ def create_work_queue(
     dependencies = detect_dependencies(todos)
 
     # Prioritize
-    todos = prioritize_todos(todos, conflicts, dependencies)
+    todos, cycles = prioritize_todos(todos, conflicts, dependencies)
 
     # Limit
     if max_todos:
         todos = todos[:max_todos]
 
+    # Plan conflict-free parallel waves
+    waves = plan_waves(todos, conflicts)
+    log(
+        f"Planned {len(waves)} waves "
+        f"(max parallelism: {max((len(w) for w in waves), default=0)})"
+    )
+
     # Create work queue
     work_queue = {
         "created_at": timestamp(),
@@ -294,11 +473,13 @@ def create_work_queue(
         "completed_count": 0,
         "failed_count": 0,
         "file_conflicts": conflicts,
+        "dependency_cycles": cycles,
+        "waves": waves,
         "todos": [t.to_dict() for t in todos]
     }
 
     # Save work queue
-    queue_file = save_json(work_queue, "auto-dev/work_queue.json")
+    queue_file = save_work_queue(work_queue)
 
     log(f"Created work queue with {len(todos)} todos")
     return ExecutionResult.ok(
@@ -307,142 +488,482 @@ def create_work_queue(
     )
 
 
+def open_streaming_queue(source: str, reset: bool = True) -> ExecutionResult:
+    """
+    Start a queue that a producer fills while workers consume it.
+
+    Args:
+        source: Description of where the todos come from (e.g. transcript path)
+        reset: Replace any existing queue; otherwise reopen it and append
+
+    Returns:
+        ExecutionResult with the current status counts
+    """
+    if reset or not queue_store.queue_exists():
+        queue_store.replace_queue({
+            "created_at": timestamp(),
+            "source_file": source,
+            "filters": None,
+            "file_conflicts": {},
+            "dependency_cycles": [],
+            "waves": [],
+            "todos": []
+        })
+    queue_store.set_producer_open(True)
+    log(f"Streaming work queue open for {source}")
+    return ExecutionResult.ok(data=queue_store.status_counts())
+
+
+def append_to_work_queue(
+    todos_data: List[dict],
+    priority_filter: int = 1,
+    categories: Optional[List[str]] = None
+) -> ExecutionResult:
+    """
+    Append a batch of generate_todos.py todos to the live work queue.
+
+    The batch is filtered like create_work_queue, ordered with
+    prioritize_todos, and checked for file conflicts and title dependencies
+    against every todo already queued. Todos whose ID is already queued are
+    skipped.
+
+    Returns:
+        ExecutionResult with the IDs that were added
+    """
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found")
+
+    todos = [Todo.from_generator(t) for t in todos_data]
+    todos = [t for t in todos if t.priority >= priority_filter]
+    if categories:
+        categories_lower = [c.lower() for c in categories]
+        todos = [t for t in todos if t.category.lower() in categories_lower]
+    if not todos:
+        return ExecutionResult.ok(data={"added": []})
+
+    existing = [Todo.from_dict(t) for t in queue_store.export_queue()["todos"]]
+    everything = existing + todos
+    new_ids = {todo.id for todo in todos}
+
+    conflicts = {
+        todo_id: others
+        for todo_id, others in detect_file_conflicts(everything).items()
+        if todo_id in new_ids
+    }
+    dependencies = {
+        todo_id: deps
+        for todo_id, deps in detect_dependencies(everything).items()
+        if todo_id in new_ids
+    }
+    todos, _ = prioritize_todos(todos, conflicts, dependencies)
+
+    added = queue_store.append_todos([t.to_dict() for t in todos], conflicts)
+    if added:
+        log(f"Appended {len(added)} todos to the work queue: {', '.join(added)}")
+    return ExecutionResult.ok(data={"added": added})
+
+
+def update_queued_todo(todo_data: dict) -> bool:
+    """
+    Refresh a still-pending queued todo after it absorbed a duplicate.
+
+    todo_data is generate_todos.py output; only the fields a merge changes
+    are updated.
+    """
+    todo = Todo.from_generator(todo_data)
+    return queue_store.update_pending(todo.id, {
+        "priority": todo.priority,
+        "acceptance_criteria": todo.acceptance_criteria,
+        "related_files": todo.related_files
+    })
+
+
+def close_streaming_queue() -> ExecutionResult:
+    """Mark the producer as finished and refresh the JSON export."""
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found")
+    queue_store.set_producer_open(False)
+    queue_file = export_work_queue()
+    log("Streaming work queue closed")
+    return ExecutionResult.ok(data=queue_store.status_counts(), queue_file=str(queue_file))
+
+
+def queue_producer_open() -> bool:
+    """Whether a producer is still appending todos to the queue."""
+    return queue_store.queue_exists() and queue_store.producer_open()
+
+
 def load_work_queue() -> dict:
-    """Load the current work queue."""
-    return load_json("auto-dev/work_queue.json")
+    """
+    Load the current work queue as a work_queue.json-style dict.
+
+    Raises:
+        FileNotFoundError: If no queue has been created
+    """
+    return queue_store.export_queue()
+
+
+def save_work_queue(queue: dict) -> Path:
+    """Replace the stored work queue and refresh its JSON export."""
+    queue_store.replace_queue(queue)
+    return export_work_queue()
 
 
-def save_work_queue(queue: dict):
-    """Save the work queue."""
-    save_json(queue, "auto-dev/work_queue.json")
+def export_work_queue() -> Path:
+    """Write the current queue to work_queue.json and return its path."""
+    return save_json(queue_store.export_queue(), "auto-dev/work_queue.json")
 
 
-def get_next_todo(agent_id: Optional[str] = None) -> ExecutionResult:
+def get_next_todo(
+    agent_id: Optional[str] = None,
+    avoid_conflicts: bool = False
+) -> ExecutionResult:
     """
     Get the next available todo from the queue.
 
     Args:
         agent_id: Optional ID of the agent claiming the todo
+        avoid_conflicts: Skip todos that touch the same files as an
+            in-progress todo
 
     Returns:
         ExecutionResult with the next todo, or error if none available
     """
-    try:
-        queue = load_work_queue()
-    except FileNotFoundError:
+    if not queue_store.queue_exists():
         return ExecutionResult.fail(error="Work queue not found. Run --action create first.")
 
-    todos = queue.get("todos", [])
-    completed_ids = {t["id"] for t in todos if t["status"] == "completed"}
-
-    for todo_data in todos:
-        if todo_data["status"] != "pending":
-            continue
-
-        # Check dependencies
-        depends_on = todo_data.get("depends_on", [])
-        if all(dep in completed_ids for dep in depends_on):
-            return ExecutionResult.ok(data=todo_data)
+    todo = queue_store.next_available(avoid_conflicts=avoid_conflicts)
+    if todo:
+        return ExecutionResult.ok(data=todo)
 
     return ExecutionResult.fail(
         error="No available todos (all completed, in progress, or blocked by dependencies)"
     )
 
 
-def claim_todo(todo_id: str, agent_id: str) -> ExecutionResult:
+def claim_todo(
+    todo_id: str,
+    agent_id: str,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
+) -> ExecutionResult:
     """
     Claim a todo for processing.
 
     Args:
         todo_id: ID of the todo to claim
         agent_id: ID of the agent claiming it
+        lease_seconds: How long the claim lasts without a renewal
 
     Returns:
         ExecutionResult indicating success or failure
     """
-    try:
-        queue = load_work_queue()
-    except FileNotFoundError:
+    if not queue_store.queue_exists():
         return ExecutionResult.fail(error="Work queue not found")
 
-    for todo in queue["todos"]:
-        if todo["id"] == todo_id:
-            if todo["status"] != "pending":
-                return ExecutionResult.fail(
-                    error=f"Todo {todo_id} is not pending (status: {todo['status']})"
-                )
+    todo, error = queue_store.claim(todo_id, agent_id, lease_seconds)
+    if error:
+        return ExecutionResult.fail(error=error)
 
-            todo["status"] = "in_progress"
-            todo["claimed_by"] = agent_id
-            todo["claimed_at"] = timestamp()
+    log(f"Todo {todo_id} claimed by {agent_id}")
+    return ExecutionResult.ok(data=todo)
 
-            queue["pending_count"] -= 1
-            queue["in_progress_count"] += 1
 
-            save_work_queue(queue)
-            log(f"Todo {todo_id} claimed by {agent_id}")
-            return ExecutionResult.ok(data=todo)
+def claim_next_todo(
+    agent_id: str,
+    avoid_conflicts: bool = False,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
+) -> ExecutionResult:
+    """
+    Atomically pick and claim the next available todo.
 
-    return ExecutionResult.fail(error=f"Todo {todo_id} not found")
+    Unlike get_next_todo + claim_todo, two agents can never claim the
+    same todo.
 
+    Args:
+        agent_id: ID of the agent claiming it
+        avoid_conflicts: Never hand out a todo that touches the same files
+            as an in-progress todo
+        lease_seconds: How long the claim lasts without a renewal
 
-def complete_todo(todo_id: str, success: bool = True) -> ExecutionResult:
+    Returns:
+        ExecutionResult with the claimed todo, or error if none available
     """
-    Mark a todo as completed or failed.
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found. Run --action create first.")
+
+    todo = queue_store.claim_next(
+        agent_id,
+        lease_seconds,
+        avoid_conflicts=avoid_conflicts
+    )
+    if not todo:
+        return ExecutionResult.fail(
+            error="No available todos (all completed, in progress, or blocked by dependencies)"
+        )
+
+    log(f"Todo {todo['id']} claimed by {agent_id}")
+    return ExecutionResult.ok(data=todo)
+
+
+def renew_lease(
+    todo_id: str,
+    agent_id: str,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
+) -> ExecutionResult:
+    """
+    Extend the lease on a todo claimed by agent_id.
+
+    Args:
+        todo_id: ID of the claimed todo
+        agent_id: ID of the agent holding the claim
+        lease_seconds: New lease length from now
+
+    Returns:
+        ExecutionResult, failed if the claim was lost
+    """
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found")
+
+    if not queue_store.renew_lease(todo_id, agent_id, lease_seconds):
+        return ExecutionResult.fail(
+            error=f"Todo {todo_id} is not in progress under {agent_id}"
+        )
+    return ExecutionResult.ok(data={"todo_id": todo_id, "agent_id": agent_id})
+
+
+def release_todo(todo_id: str) -> ExecutionResult:
+    """
+    Return an in-progress todo to pending so it can be claimed again.
 
     Args:
         todo_id: ID of the todo
-        success: Whether it completed successfully
 
     Returns:
         ExecutionResult indicating success or failure
     """
-    try:
-        queue = load_work_queue()
-    except FileNotFoundError:
+    if not queue_store.queue_exists():
         return ExecutionResult.fail(error="Work queue not found")
 
-    for todo in queue["todos"]:
-        if todo["id"] == todo_id:
-            if todo["status"] != "in_progress":
-                return ExecutionResult.fail(
-                    error=f"Todo {todo_id} is not in progress (status: {todo['status']})"
-                )
+    if not queue_store.release(todo_id):
+        return ExecutionResult.fail(error=f"Todo {todo_id} is not in progress")
 
-            new_status = "completed" if success else "failed"
-            todo["status"] = new_status
-            todo["completed_at"] = timestamp()
+    log(f"Todo {todo_id} released")
+    return ExecutionResult.ok(data={"todo_id": todo_id})
 
-            queue["in_progress_count"] -= 1
-            if success:
-                queue["completed_count"] += 1
-            else:
-                queue["failed_count"] += 1
 
-            save_work_queue(queue)
-            log(f"Todo {todo_id} marked as {new_status}")
-            return ExecutionResult.ok(data=todo)
+def reclaim_expired_todos(max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> ExecutionResult:
+    """
+    Return todos whose lease expired to pending.
+
+    Todos that have already been claimed max_attempts times are marked
+    failed instead.
+
+    Args:
+        max_attempts: Claims allowed per todo
+
+    Returns:
+        ExecutionResult with the swept todos
+    """
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found")
+
+    swept = queue_store.reclaim_expired(max_attempts)
+    for todo in swept:
+        log(
+            f"Lease expired for {todo['id']} (held by {todo['claimed_by']}, "
+            f"attempt {todo['attempts']}), now {todo['status']}",
+            level="warning"
+        )
+
+    return ExecutionResult.ok(
+        data={
+            "reclaimed": [t["id"] for t in swept if t["status"] == "pending"],
+            "failed": [t["id"] for t in swept if t["status"] == "failed"]
+        }
+    )
+
+
+class LeaseHeartbeat:
+    """
+    Keeps a todo's lease alive from a background thread.
 
-    return ExecutionResult.fail(error=f"Todo {todo_id} not found")
+    Usage:
+        with LeaseHeartbeat(todo_id, worker_id):
+            do_the_work()
+    """
+
+    def __init__(
+        self,
+        todo_id: str,
+        agent_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        interval: float = HEARTBEAT_INTERVAL
+    ):
+        self.todo_id = todo_id
+        self.agent_id = agent_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"heartbeat-{agent_id}",
+            daemon=True
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                result = renew_lease(self.todo_id, self.agent_id, self.lease_seconds)
+            except Exception as e:
+                log(f"Heartbeat for {self.todo_id} failed: {e}", level="warning")
+                continue
+            if not result.success:
+                log(f"Lost lease on {self.todo_id}: {result.error}", level="warning")
+                return
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def complete_todo(todo_id: str, success: bool = True) -> ExecutionResult:
+    """
+    Mark a todo as completed or failed.
+
+    Args:
+        todo_id: ID of the todo
+        success: Whether it completed successfully
+
+    Returns:
+        ExecutionResult indicating success or failure
+    """
+    if not queue_store.queue_exists():
+        return ExecutionResult.fail(error="Work queue not found")
+
+    todo, error = queue_store.complete(todo_id, success)
+    if error:
+        return ExecutionResult.fail(error=error)
+
+    log(f"Todo {todo_id} marked as {todo['status']}")
+    return ExecutionResult.ok(data=todo)
 
 
 def get_queue_status() -> ExecutionResult:
-    """Get current status of the work queue."""
-    try:
-        queue = load_work_queue()
-    except FileNotFoundError:
+    """Get current status of the work queue and refresh its JSON export."""
+    if not queue_store.queue_exists():
         return ExecutionResult.fail(error="Work queue not found")
 
+    counts = queue_store.status_counts()
+    queue_file = export_work_queue()
+
     return ExecutionResult.ok(
         data={
-            "total": queue.get("total_count", 0),
-            "pending": queue.get("pending_count", 0),
-            "in_progress": queue.get("in_progress_count", 0),
-            "completed": queue.get("completed_count", 0),
-            "failed": queue.get("failed_count", 0),
+            "total": counts["total"],
+            "pending": counts["pending"],
+            "in_progress": counts["in_progress"],
+            "completed": counts["completed"],
+            "failed": counts["failed"],
             "progress_percent": (
-                queue.get("completed_count", 0) / queue.get("total_count", 1) * 100
+                counts["completed"] / (counts["total"] or 1) * 100
             )
+        },
+        queue_file=str(queue_file)
+    )
+
+
+def generate_synthetic_todos(count: int, seed: int = 42) -> List[Todo]:
+    """
+    Generate synthetic todos with random priorities, file overlaps,
+    dependencies on earlier todos, and a few dependency cycles.
+    """
+    rng = random.Random(seed)
+    todos = []
+
+    for i in range(count):
+        depends_on = []
+        if i > 0 and rng.random() < 0.3:
+            depends_on = [f"todo_{rng.randrange(i):06d}" for _ in range(rng.randint(1, 3))]
+
+        todos.append(Todo(
+            id=f"todo_{i:06d}",
+            title=f"Synthetic todo {i}",
+            priority=rng.randint(1, 5),
+            category=rng.choice(["feature", "bug", "enhancement", "ui"]),
+            description="",
+            acceptance_criteria=["Page loads without errors"],
+            related_files=[f"src/module_{rng.randrange(max(count // 10, 1))}.ts"],
+            depends_on=depends_on
+        ))
+
+    # Mutual dependencies so cycle detection has something to find
+    for _ in range(max(count // 10000, 1)):
+        a, b = rng.sample(range(count), 2)
+        todos[a].depends_on.append(todos[b].id)
+        todos[b].depends_on.append(todos[a].id)
+
+    return todos
+
+
+def run_benchmark(count: int = 50000, samples: int = 2000) -> ExecutionResult:
+    """
+    Benchmark prioritization and queue operations on synthetic todos.
+
+    Args:
+        count: Number of synthetic todos
+        samples: Number of claim/complete cycles to time against the store
+
+    Returns:
+        ExecutionResult with timings in milliseconds
+    """
+    todos = generate_synthetic_todos(count)
+    timings = {}
+
+    start = time.perf_counter()
+    conflicts = detect_file_conflicts(todos)
+    timings["detect_file_conflicts_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    ordered, cycles = prioritize_todos(todos, conflicts, {})
+    timings["prioritize_todos_ms"] = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "work_queue.db"
+        queue = {
+            "created_at": timestamp(),
+            "source_file": "synthetic",
+            "file_conflicts": conflicts,
+            "dependency_cycles": cycles,
+            "todos": [t.to_dict() for t in ordered]
+        }
+
+        start = time.perf_counter()
+        queue_store.replace_queue(queue, db_path)
+        timings["replace_queue_ms"] = (time.perf_counter() - start) * 1000
+
+        claimed = 0
+        start = time.perf_counter()
+        for _ in range(samples):
+            todo = queue_store.claim_next("benchmark", DEFAULT_LEASE_SECONDS, db_path)
+            if not todo:
+                break
+            queue_store.complete(todo["id"], True, db_path)
+            claimed += 1
+        elapsed = (time.perf_counter() - start) * 1000
+        timings["claim_complete_avg_ms"] = elapsed / claimed if claimed else 0
+
+    for name, value in timings.items():
+        log(f"{name}: {value:.2f}")
+
+    return ExecutionResult.ok(
+        data={
+            "todos": count,
+            "cycles_found": len(cycles),
+            "claim_complete_samples": claimed,
+            **{name: round(value, 3) for name, value in timings.items()}
         }
     )
 
@@ -452,7 +973,10 @@ def main():
     parser.add_argument(
         "--action",
         default="create",
-        choices=["create", "next", "claim", "complete", "fail", "status"],
+        choices=[
+            "create", "next", "claim", "claim-next", "renew", "reclaim",
+            "complete", "fail", "status", "benchmark"
+        ],
         help="Action to perform (default: create)"
     )
     parser.add_argument(
@@ -463,7 +987,7 @@ def main():
         "--priority-filter",
         type=int,
         default=1,
-        help="Minimum priority to include (1-5, default: 1)"
+        help="Minimum priority to include (1-5, 5 = most important, default: 1)"
     )
     parser.add_argument(
         "--categories",
@@ -478,9 +1002,32 @@ def main():
         "--todo-id",
         help="Todo ID (for claim/complete/fail actions)"
     )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=f"Lease length for claim/claim-next/renew actions (default: {DEFAULT_LEASE_SECONDS})"
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Claims allowed per todo before reclaim fails it (default: {DEFAULT_MAX_ATTEMPTS})"
+    )
+    parser.add_argument(
+        "--avoid-conflicts",
+        action="store_true",
+        help="Skip todos conflicting with in-progress ones (for next/claim-next actions)"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=50000,
+        help="Number of synthetic todos (for benchmark action, default: 50000)"
+    )
     parser.add_argument(
         "--agent-id",
-        help="Agent ID (for claim action)"
+        help="Agent ID (for claim/claim-next actions)"
     )
     args = parser.parse_args()
 
@@ -502,7 +1049,7 @@ def main():
         )
 
     elif args.action == "next":
-        result = get_next_todo(args.agent_id)
+        result = get_next_todo(args.agent_id, avoid_conflicts=args.avoid_conflicts)
 
     elif args.action == "claim":
         if not args.todo_id or not args.agent_id:
@@ -510,7 +1057,30 @@ def main():
                 error="--todo-id and --agent-id required for claim action"
             ).to_json())
             sys.exit(1)
-        result = claim_todo(args.todo_id, args.agent_id)
+        result = claim_todo(args.todo_id, args.agent_id, args.lease_seconds)
+
+    elif args.action == "claim-next":
+        if not args.agent_id:
+            print(ExecutionResult.fail(
+                error="--agent-id required for claim-next action"
+            ).to_json())
+            sys.exit(1)
+        result = claim_next_todo(
+            args.agent_id,
+            avoid_conflicts=args.avoid_conflicts,
+            lease_seconds=args.lease_seconds
+        )
+
+    elif args.action == "renew":
+        if not args.todo_id or not args.agent_id:
+            print(ExecutionResult.fail(
+                error="--todo-id and --agent-id required for renew action"
+            ).to_json())
+            sys.exit(1)
+        result = renew_lease(args.todo_id, args.agent_id, args.lease_seconds)
+
+    elif args.action == "reclaim":
+        result = reclaim_expired_todos(args.max_attempts)
 
     elif args.action == "complete":
         if not args.todo_id:
@@ -531,6 +1101,9 @@ def main():
     elif args.action == "status":
         result = get_queue_status()
 
+    elif args.action == "benchmark":
+        result = run_benchmark(args.count)
+
     else:
         result = ExecutionResult.fail(error=f"Unknown action: {args.action}")
 
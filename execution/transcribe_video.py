@@ -4,21 +4,87 @@ Video Transcription Script using OpenAI Whisper API.
 Extracts audio from video files and transcribes using Whisper.
 Handles large files by chunking audio into segments.
 
+The transcription engine is pluggable (--backend): the OpenAI API (or any
+compatible server via --api-base), a local CPU engine (faster-whisper,
+optional), or a deterministic fake for offline runs and benchmarks. All
+backends share the same chunking, caching and merging.
+
+Chunk boundaries are snapped to the nearest pause in speech (short-window
+RMS energy over a low-rate PCM decode, needs NumPy) so words aren't cut in
+half; --chunk-duration makes chunks smaller for more parallelism.
+
+Chunks are transcribed concurrently (bounded by --concurrency) with
+jittered backoff on rate limits, and reassembled in order.
+
+Responses are cached in .tmp/cache/transcripts/ by content hash, both per
+chunk and for the whole extracted audio, so re-running on the same media
+(or resuming a partially failed run) skips the API calls already paid for.
+
+With --stream, extraction and chunking happen in one ffmpeg pass that
+writes segments progressively; each segment is submitted for
+transcription as soon as ffmpeg closes it, overlapping encoding with
+the API calls, and progress/ETA is logged from ffmpeg's -progress output.
+Streamed chunks are cut at fixed intervals (pauses can't be located
+before the audio exists).
+
 Usage:
     python execution/transcribe_video.py --video ./path/to/video.mp4
     python execution/transcribe_video.py --video "https://youtube.com/watch?v=..."
+
+    # Against a local OpenAI-compatible transcription server
+    python execution/transcribe_video.py --video ./video.mp4 --api-base http://localhost:8000/v1
+
+    # Transcribe while ffmpeg is still encoding (long videos)
+    python execution/transcribe_video.py --video ./long_talk.mp4 --stream
+
+    # On local cores, no API key needed (pip install faster-whisper)
+    python execution/transcribe_video.py --video ./archive/talk.mp4 --backend local --model small
+
+    # Offline pipeline benchmark with canned transcripts
+    python execution/transcribe_video.py --video ./video.mp4 --backend fake --no-cache
 """
 
 import argparse
+import csv
+from abc import ABC, abstractmethod
+import hashlib
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 import tempfile
 import os
 import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 import math
 
-from openai import OpenAI
+# NumPy is optional: without it chunks are cut at fixed intervals
+numpy_available = True
+try:
+    import numpy as np
+except ImportError:
+    numpy_available = False
+
+# OpenAI is only needed for the openai backend
+openai_available = True
+try:
+    from openai import (
+        OpenAI,
+        APIConnectionError,
+        APITimeoutError,
+        InternalServerError,
+        RateLimitError
+    )
+except ImportError:
+    openai_available = False
+
+# faster-whisper powers the local backend
+faster_whisper_available = True
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    faster_whisper_available = False
 
 from utils import (
     load_env,
@@ -27,13 +93,56 @@ from utils import (
     get_tmp_path,
     timestamp,
     ExecutionResult,
-    TMP_DIR
+    TMP_DIR,
+    DiskCache,
+    content_hash,
+    hash_file,
+    retry_with_backoff
 )
 
 # Whisper API file size limit (25MB)
 MAX_FILE_SIZE = 25 * 1024 * 1024
 # Chunk duration in seconds (10 minutes)
 CHUNK_DURATION = 600
+WHISPER_MODEL = "whisper-1"
+# faster-whisper model used by the local backend (tiny, base, small, medium, large-v3)
+LOCAL_WHISPER_MODEL = "base"
+# Length of each canned segment produced by the fake backend
+FAKE_SEGMENT_SECONDS = 5
+BACKENDS = ("openai", "local", "fake")
+# Silence detection: PCM sample rate, RMS window and smoothing (seconds)
+ENERGY_SAMPLE_RATE = 8000
+ENERGY_WINDOW = 0.05
+ENERGY_SMOOTHING = 0.3
+# Windows quieter than this (fraction of full scale, about -40 dBFS) are silence
+SILENCE_THRESHOLD = 0.01
+# How far (seconds) a cut may move from its nominal position to reach silence
+SILENCE_SEARCH_WINDOW = 30
+# Transcript cache size cap; least recently used entries are evicted
+TRANSCRIPT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Chunks transcribed at once
+DEFAULT_CONCURRENCY = 4
+# Retries per chunk on rate limits and transient API errors
+MAX_RETRIES = 5
+# Minimum seconds between streaming progress log lines
+PROGRESS_LOG_INTERVAL = 5
+
+RETRYABLE_ERRORS = (
+    (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+    if openai_available else ()
+)
+
+
+@dataclass
+class AudioChunk:
+    """A piece of the source audio and where it sits in the original timeline."""
+    path: Path
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
 
 
 def check_ffmpeg() -> bool:
@@ -153,109 +262,645 @@ def get_audio_duration(audio_path: Path) -> float:
     return float(result.stdout.strip())
 
 
-def chunk_audio(audio_path: Path, output_dir: Path) -> List[Path]:
-    """Split audio file into chunks for API upload."""
+def compute_rms_energy(audio_path: Path) -> "np.ndarray":
+    """
+    RMS energy (0-1) of consecutive ENERGY_WINDOW-second windows.
+
+    ffmpeg decodes to mono 16-bit PCM at ENERGY_SAMPLE_RATE, which is
+    streamed and reduced block by block so memory stays small for
+    multi-hour audio.
+    """
+    window = int(ENERGY_SAMPLE_RATE * ENERGY_WINDOW)
+    block_bytes = window * 2 * 2000
+
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-i", str(audio_path),
+            "-vn",
+            "-ac", "1",
+            "-ar", str(ENERGY_SAMPLE_RATE),
+            "-f", "s16le",
+            "-"
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+    energies = []
+    remainder = b""
+    while True:
+        block = process.stdout.read(block_bytes)
+        if not block:
+            break
+        data = remainder + block
+        usable = len(data) - len(data) % (window * 2)
+        remainder = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768
+        energies.append(np.sqrt(np.mean(samples.reshape(-1, window) ** 2, axis=1)))
+
+    if process.wait() != 0:
+        raise RuntimeError("ffmpeg failed to decode audio for silence detection")
+
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+
+def plan_chunk_boundaries(
+    energy: "np.ndarray",
+    duration: float,
+    chunk_duration: float = CHUNK_DURATION,
+    tolerance: float = SILENCE_SEARCH_WINDOW
+) -> List[float]:
+    """
+    Choose cut times about chunk_duration apart, each snapped to a pause.
+
+    Each cut looks within +/- tolerance of its nominal position for
+    silence (smoothed energy below SILENCE_THRESHOLD) and takes the silent
+    window nearest the nominal position, or the quietest window if nothing
+    is silent. Chunks never exceed chunk_duration + tolerance.
+
+    Args:
+        energy: Per-window RMS from compute_rms_energy
+        duration: Audio duration in seconds
+
+    Returns:
+        Cut times in seconds (excluding 0 and the end)
+    """
+    smooth = max(1, int(ENERGY_SMOOTHING / ENERGY_WINDOW))
+    smoothed = np.convolve(energy, np.ones(smooth) / smooth, mode="same")
+
+    cuts = []
+    last = 0.0
+    while duration - last > chunk_duration:
+        target = last + chunk_duration
+        lo = max(int((target - tolerance) / ENERGY_WINDOW), int(last / ENERGY_WINDOW) + 1)
+        hi = min(int((target + tolerance) / ENERGY_WINDOW), len(smoothed))
+        if hi <= lo:
+            cut = target
+        else:
+            window = smoothed[lo:hi]
+            silent = np.flatnonzero(window < SILENCE_THRESHOLD)
+            if silent.size:
+                nominal = int(target / ENERGY_WINDOW) - lo
+                best = silent[np.argmin(np.abs(silent - nominal))]
+            else:
+                best = int(np.argmin(window))
+            cut = (lo + best + 0.5) * ENERGY_WINDOW
+
+        cuts.append(round(float(cut), 3))
+        last = cut
+    return cuts
+
+
+def chunk_audio(
+    audio_path: Path,
+    output_dir: Path,
+    chunk_duration: int = CHUNK_DURATION
+) -> List[AudioChunk]:
+    """
+    Split audio file into chunks for API upload.
+
+    Uses one ffmpeg pass with the segment muxer (stream copy, falling back
+    to a single re-encode if the input can't be copied). Cuts are placed
+    at pauses when NumPy is available (plan_chunk_boundaries), otherwise
+    every chunk_duration seconds. Segments are cut on packet boundaries,
+    so the real start/end of every chunk is read back from the segment
+    list instead of assuming i * chunk_duration.
+    """
     duration = get_audio_duration(audio_path)
-    num_chunks = math.ceil(duration / CHUNK_DURATION)
 
-    if num_chunks == 1:
-        return [audio_path]
+    if duration <= chunk_duration:
+        return [AudioChunk(path=audio_path, start=0.0, end=duration)]
 
-    log(f"Splitting audio into {num_chunks} chunks")
+    if numpy_available:
+        cuts = plan_chunk_boundaries(compute_rms_energy(audio_path), duration, chunk_duration)
+        split = ["-segment_times", ",".join(str(cut) for cut in cuts)]
+        log(f"Splitting audio into {len(cuts) + 1} chunks at pauses")
+    else:
+        split = ["-segment_time", str(chunk_duration)]
+        log(f"Splitting audio into ~{math.ceil(duration / chunk_duration)} chunks")
 
-    chunks = []
-    for i in range(num_chunks):
-        start_time = i * CHUNK_DURATION
-        chunk_path = output_dir / f"chunk_{i:03d}.mp3"
+    segment_list = output_dir / "chunks.csv"
+    for codec in (["-c", "copy"], ["-c:a", "libmp3lame"]):
+        for stale in output_dir.glob("chunk_*.mp3"):
+            stale.unlink()
 
-        subprocess.run(
+        result = subprocess.run(
             [
                 "ffmpeg",
                 "-i", str(audio_path),
-                "-ss", str(start_time),
-                "-t", str(CHUNK_DURATION),
-                "-acodec", "libmp3lame",
+                "-vn",
+                *codec,
+                "-f", "segment",
+                *split,
+                "-reset_timestamps", "1",
+                "-segment_list", str(segment_list),
+                "-segment_list_type", "csv",
                 "-y",
-                str(chunk_path)
+                str(output_dir / "chunk_%03d.mp3")
             ],
             capture_output=True,
-            check=True
+            text=True
         )
+        if result.returncode == 0:
+            break
+        log(f"Segmenting with {' '.join(codec)} failed, retrying", level="warning")
+    else:
+        raise RuntimeError(f"ffmpeg segmenting failed: {result.stderr}")
 
-        chunks.append(chunk_path)
+    return read_segment_list(segment_list, output_dir)
 
+
+def read_segment_list(segment_list: Path, output_dir: Path) -> List[AudioChunk]:
+    """
+    Parse an ffmpeg csv segment list (file,start,end per line).
+
+    A trailing line without a newline is still being written and is skipped.
+    """
+    text = segment_list.read_text()
+    chunks = []
+    for row in csv.reader(text[:text.rfind("\n") + 1].splitlines()):
+        if len(row) < 3:
+            continue
+        chunks.append(AudioChunk(
+            path=output_dir / row[0],
+            start=float(row[1]),
+            end=float(row[2])
+        ))
     return chunks
 
 
+class TranscriptionBackend(ABC):
+    """
+    A transcription engine.
+
+    Subclasses implement transcribe(), which returns the dict shape of
+    transcript_to_dict. cache_id names the engine and model so cached
+    transcripts from one backend are never served for another.
+    """
+    name = "base"
+    # Exceptions worth retrying with backoff
+    retryable_errors: tuple = ()
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @property
+    def cache_id(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    @abstractmethod
+    def transcribe(self, chunk: AudioChunk) -> dict:
+        """Transcribe one audio chunk."""
+
+
+class OpenAIBackend(TranscriptionBackend):
+    """Whisper via the OpenAI API or any compatible server."""
+    name = "openai"
+    retryable_errors = RETRYABLE_ERRORS
+
+    def __init__(
+        self,
+        api_key: str,
+        api_base: Optional[str] = None,
+        model: str = WHISPER_MODEL
+    ):
+        super().__init__(model)
+        self.client = OpenAI(api_key=api_key, base_url=api_base)
+
+    def transcribe(self, chunk: AudioChunk) -> dict:
+        with open(chunk.path, "rb") as audio_file:
+            response = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=audio_file,
+                response_format="verbose_json",
+                timestamp_granularities=["segment"]
+            )
+        return transcript_to_dict(response)
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Whisper on local CPU cores via faster-whisper (CTranslate2, int8).
+
+    One model is shared by all transcription threads; its CPU threads are
+    split between them so concurrent chunks don't oversubscribe the cores.
+    """
+    name = "local"
+
+    def __init__(self, model: str = LOCAL_WHISPER_MODEL, concurrency: int = DEFAULT_CONCURRENCY):
+        super().__init__(model)
+        workers = max(1, concurrency)
+        log(f"Loading local whisper model '{model}'")
+        self.engine = WhisperModel(
+            model,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+            num_workers=workers
+        )
+
+    def transcribe(self, chunk: AudioChunk) -> dict:
+        segments, info = self.engine.transcribe(str(chunk.path), beam_size=1)
+        segments = [
+            {"start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in segments
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "language": info.language or "en",
+            "duration": info.duration,
+            "segments": segments
+        }
+
+
+class FakeBackend(TranscriptionBackend):
+    """
+    Deterministic canned transcripts derived from the chunk's bytes.
+
+    The same audio always yields the same text, so offline runs are
+    reproducible and the rest of the pipeline can be benchmarked without
+    model or network time (latency simulates a slow engine).
+    """
+    name = "fake"
+    WORDS = (
+        "the", "app", "should", "show", "users", "a", "faster", "timer",
+        "screen", "when", "they", "start", "focus", "session", "and", "sync",
+    )
+
+    def __init__(self, model: str = "fake", latency: float = 0.0):
+        super().__init__(model)
+        self.latency = latency
+
+    def transcribe(self, chunk: AudioChunk) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha256(Path(chunk.path).read_bytes()).digest()
+        segments = []
+        start = 0.0
+        while start < chunk.duration:
+            end = min(chunk.duration, start + FAKE_SEGMENT_SECONDS)
+            seed = digest[len(segments) % len(digest)]
+            words = [self.WORDS[(seed + i * 7) % len(self.WORDS)] for i in range(6)]
+            segments.append({"start": start, "end": end, "text": " " + " ".join(words) + "."})
+            start = end
+        return {
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "language": "en",
+            "duration": chunk.duration,
+            "segments": segments
+        }
+
+
+def create_backend(
+    name: str,
+    api_key: Optional[str] = None,
+    api_base: Optional[str] = None,
+    model: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> TranscriptionBackend:
+    """
+    Build a backend by name (see BACKENDS).
+
+    Raises:
+        RuntimeError: If the backend's dependency or credentials are missing
+    """
+    if name == "openai":
+        if not openai_available:
+            raise RuntimeError("openai not installed. Run: pip install openai")
+        if not api_key:
+            raise RuntimeError(
+                "OPENAI_API_KEY not found in environment. "
+                "Add it to your .env file."
+            )
+        return OpenAIBackend(api_key, api_base, model or WHISPER_MODEL)
+    if name == "local":
+        if not faster_whisper_available:
+            raise RuntimeError("faster-whisper not installed. Run: pip install faster-whisper")
+        return LocalWhisperBackend(model or LOCAL_WHISPER_MODEL, concurrency)
+    if name == "fake":
+        return FakeBackend(model or "fake")
+    raise ValueError(f"Unknown transcription backend: {name}")
+
+
 def transcribe_audio(
-    client: OpenAI,
-    audio_path: Path,
+    backend: TranscriptionBackend,
+    chunk: AudioChunk,
     chunk_index: int = 0,
     total_chunks: int = 1
 ) -> dict:
-    """Transcribe a single audio file using Whisper API."""
-    log(f"Transcribing chunk {chunk_index + 1}/{total_chunks}: {audio_path.name}")
-
-    with open(audio_path, "rb") as audio_file:
-        response = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="verbose_json",
-            timestamp_granularities=["segment"]
+    """Transcribe a single audio chunk with the given backend."""
+    log(f"Transcribing chunk {chunk_index + 1}/{total_chunks} ({backend.name}): {chunk.path.name}")
+    return backend.transcribe(chunk)
+
+
+def transcript_to_dict(response) -> dict:
+    """Normalize a verbose_json transcription response to a plain dict."""
+    if hasattr(response, "model_dump"):
+        response = response.model_dump()
+    return {
+        "text": response.get("text", ""),
+        "language": response.get("language") or "en",
+        "duration": response.get("duration") or 0,
+        "segments": [
+            {"start": s.get("start", 0), "end": s.get("end", 0), "text": s.get("text", "")}
+            for s in response.get("segments") or []
+        ]
+    }
+
+
+def get_transcript_cache() -> DiskCache:
+    return DiskCache("transcripts", max_bytes=TRANSCRIPT_CACHE_MAX_BYTES)
+
+
+def transcribe_chunk(
+    backend: TranscriptionBackend,
+    chunk: AudioChunk,
+    index: int,
+    total: int,
+    cache: Optional[DiskCache] = None
+) -> dict:
+    """Transcribe one chunk with retries, going through the cache if given."""
+    key = content_hash(backend.cache_id, "chunk", hash_file(chunk.path)) if cache else None
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        log(f"Chunk {index + 1}/{total}: using cached transcript")
+        return cached
+
+    transcript = retry_with_backoff(
+        lambda: transcribe_audio(backend, chunk, index, total),
+        is_retryable=lambda e: isinstance(e, backend.retryable_errors),
+        max_retries=MAX_RETRIES,
+        description=f"Chunk {index + 1}/{total}"
+    )
+    if cache:
+        cache.set(key, transcript)
+    return transcript
+
+
+def transcribe_chunks(
+    backend: TranscriptionBackend,
+    chunks: List[AudioChunk],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[DiskCache] = None
+) -> List[dict]:
+    """
+    Transcribe chunks concurrently and return the transcripts in chunk order.
+
+    Each chunk is retried with jittered backoff on rate limits and
+    transient errors; any chunk that still fails fails the whole job.
+    Chunks found in the cache (by content hash) are not sent again, and
+    each new transcript is cached as soon as it arrives.
+    """
+    def transcribe(index: int) -> dict:
+        return transcribe_chunk(backend, chunks[index], index, len(chunks), cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as executor:
+        # map() yields results in submission order regardless of finish order
+        return list(executor.map(transcribe, range(len(chunks))))
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m{secs:02d}s" if minutes else f"{secs}s"
+
+
+def log_stream_progress(progress: dict):
+    """Default progress callback for stream_transcribe."""
+    log(
+        f"Encoded {progress['encoded_percent']:.0f}%, "
+        f"transcribed {progress['chunks_done']}/{progress['chunks_expected']} chunks, "
+        f"ETA {_format_eta(progress['eta_seconds'])}"
+    )
+
+
+def stream_transcribe(
+    backend: TranscriptionBackend,
+    source_path: Path,
+    output_dir: Path,
+    chunk_duration: int = CHUNK_DURATION,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache: Optional[DiskCache] = None,
+    on_progress: Callable[[dict], None] = log_stream_progress
+) -> tuple:
+    """
+    Extract, chunk and transcribe in one overlapped pass.
+
+    A single ffmpeg process decodes the source (video or audio) to 16kHz
+    mono MP3 segments of chunk_duration seconds. ffmpeg appends a row to
+    the csv segment list only once a segment file is closed, so every new
+    row is handed to the transcription pool while later segments are still
+    being encoded. ffmpeg's -progress output (read from its stdout) drives
+    both polling of the segment list and the progress/ETA callback.
+
+    Args:
+        source_path: Video or audio file
+        output_dir: Where segments and the segment list are written
+        on_progress: Called with encoded_percent, chunks_done,
+            chunks_expected and eta_seconds (at most every
+            PROGRESS_LOG_INTERVAL seconds, and once at the end)
+
+    Returns:
+        (transcripts, chunks), both in chunk order
+    """
+    if not check_ffmpeg():
+        raise RuntimeError(
+            "ffmpeg not found. Install with: brew install ffmpeg"
         )
 
-    return response
+    duration = get_audio_duration(source_path)
+    expected = max(1, math.ceil(duration / chunk_duration))
+    segment_list = output_dir / "chunks.csv"
+    for stale in [segment_list, *output_dir.glob("chunk_*.mp3")]:
+        stale.unlink(missing_ok=True)
+
+    log(f"Streaming {source_path.name} ({duration:.0f}s) into ~{expected} chunks")
+
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-nostats",
+            "-loglevel", "error",
+            "-progress", "pipe:1",
+            "-i", str(source_path),
+            "-vn",
+            "-acodec", "libmp3lame",
+            "-ar", "16000",
+            "-ac", "1",
+            "-f", "segment",
+            "-segment_time", str(chunk_duration),
+            "-reset_timestamps", "1",
+            "-segment_list", str(segment_list),
+            "-segment_list_type", "csv",
+            "-y",
+            str(output_dir / "chunk_%03d.mp3")
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
 
+    started = time.monotonic()
+    chunks: List[AudioChunk] = []
+    futures: List[Future] = []
+    chunk_seconds: List[float] = []
+    encoded = 0.0
+    last_report = 0.0
+
+    def transcribe(chunk: AudioChunk, index: int) -> dict:
+        began = time.monotonic()
+        transcript = transcribe_chunk(backend, chunk, index, max(expected, len(chunks)), cache)
+        chunk_seconds.append(time.monotonic() - began)
+        return transcript
+
+    def submit_finished():
+        if not segment_list.exists():
+            return
+        for chunk in read_segment_list(segment_list, output_dir)[len(chunks):]:
+            chunks.append(chunk)
+            futures.append(executor.submit(transcribe, chunk, len(chunks) - 1))
+
+    def report(final: bool = False):
+        nonlocal last_report
+        now = time.monotonic()
+        if not final and now - last_report < PROGRESS_LOG_INTERVAL:
+            return
+        last_report = now
+
+        done = sum(1 for future in futures if future.done())
+        total = max(expected, len(chunks))
+        elapsed = now - started
+        eta = None
+        if done == total:
+            eta = 0.0
+        elif encoded > 0:
+            # Whichever finishes last: encoding, or transcribing what's left
+            encode_eta = (duration - encoded) * elapsed / encoded
+            transcribe_eta = 0.0
+            if chunk_seconds:
+                average = sum(chunk_seconds) / len(chunk_seconds)
+                transcribe_eta = math.ceil((total - done) / max(1, concurrency)) * average
+            eta = max(encode_eta, transcribe_eta)
+
+        on_progress({
+            "encoded_percent": min(100.0, 100 * encoded / duration) if duration else 100.0,
+            "chunks_done": done,
+            "chunks_expected": total,
+            "eta_seconds": eta
+        })
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            # out_time_ms is in microseconds too (long-standing ffmpeg quirk)
+            if key in ("out_time_us", "out_time_ms") and value.isdigit():
+                encoded = int(value) / 1_000_000
+            elif key == "progress":
+                submit_finished()
+                failed = next((f for f in futures if f.done() and f.exception()), None)
+                if failed:
+                    process.kill()
+                    raise failed.exception()
+                report()
+
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {process.stderr.read().strip()}")
+
+        # The last segment is listed when ffmpeg writes its trailer
+        submit_finished()
+        if not chunks:
+            raise RuntimeError("ffmpeg produced no audio segments")
+
+        log(f"Encoding finished after {time.monotonic() - started:.1f}s; "
+            f"waiting for {sum(1 for f in futures if not f.done())} chunks")
+        transcripts = [future.result() for future in futures]
+        encoded = duration
+        report(final=True)
+        return transcripts, chunks
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def merge_transcripts(
+    transcripts: List[dict],
+    chunk_duration: int = CHUNK_DURATION,
+    offsets: Optional[List[float]] = None
+) -> dict:
+    """
+    Merge multiple transcript chunks into one.
 
-def merge_transcripts(transcripts: List[dict], chunk_duration: int = CHUNK_DURATION) -> dict:
-    """Merge multiple transcript chunks into one."""
+    Args:
+        transcripts: Per-chunk transcripts in order
+        chunk_duration: Assumed chunk length when offsets are not known
+        offsets: Start time of each chunk in the source audio
+    """
     merged = {
         "text": "",
         "segments": [],
-        "language": transcripts[0].language if transcripts else "en",
+        "language": transcripts[0]["language"] if transcripts else "en",
         "duration": 0
     }
 
     for i, transcript in enumerate(transcripts):
-        offset = i * chunk_duration
+        offset = offsets[i] if offsets else i * chunk_duration
 
         # Add text with newline separator
         if merged["text"]:
             merged["text"] += "\n\n"
-        merged["text"] += transcript.text
+        merged["text"] += transcript["text"]
 
         # Adjust segment timestamps
-        if hasattr(transcript, 'segments') and transcript.segments:
-            for segment in transcript.segments:
-                adjusted_segment = {
-                    "start": segment.get("start", 0) + offset,
-                    "end": segment.get("end", 0) + offset,
-                    "text": segment.get("text", "")
-                }
-                merged["segments"].append(adjusted_segment)
+        for segment in transcript["segments"]:
+            adjusted_segment = {
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+                "text": segment["text"]
+            }
+            merged["segments"].append(adjusted_segment)
 
         # Update total duration
-        if hasattr(transcript, 'duration'):
-            merged["duration"] += transcript.duration
+        merged["duration"] += transcript["duration"]
 
     return merged
 
 
 def transcribe_video(
     video_path: str,
-    openai_api_key: str
+    openai_api_key: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    api_base: Optional[str] = None,
+    use_cache: bool = True,
+    chunk_duration: int = CHUNK_DURATION,
+    stream: bool = False,
+    backend: str = "openai",
+    model: Optional[str] = None
 ) -> ExecutionResult:
     """
     Main transcription function.
 
     Args:
         video_path: Path to video file or YouTube URL
-        openai_api_key: OpenAI API key
+        openai_api_key: OpenAI API key (openai backend only)
+        concurrency: Maximum chunks transcribed at once
+        api_base: Base URL of an OpenAI-compatible API (e.g. a local server)
+        use_cache: Reuse and store transcripts in the content-hash cache
+        chunk_duration: Target chunk length in seconds
+        stream: Transcribe segments while ffmpeg is still encoding
+        backend: Transcription engine, one of BACKENDS
+        model: Model for the backend (defaults to the backend's own)
 
     Returns:
         ExecutionResult with transcript data
     """
-    client = OpenAI(api_key=openai_api_key)
+    engine = create_backend(backend, openai_api_key, api_base, model, concurrency)
 
     # Create temp directories
     audio_dir = get_tmp_path("audio")
@@ -272,49 +917,69 @@ def transcribe_video(
             return ExecutionResult.fail(f"Video file not found: {video_path}")
 
         video_name = video_file.stem
-        audio_path = audio_dir / f"{video_name}.mp3"
-        extract_audio(video_file, audio_path)
+        if stream:
+            audio_path = video_file
+        else:
+            audio_path = audio_dir / f"{video_name}.mp3"
+            extract_audio(video_file, audio_path)
+
+    cache = get_transcript_cache() if use_cache else None
+
+    if stream:
+        # No single extracted audio file exists to key the whole-audio
+        # cache on; per-chunk caching still applies
+        transcripts, chunks = stream_transcribe(
+            engine, audio_path, audio_dir, chunk_duration, concurrency, cache
+        )
+        final_transcript = merge_transcripts(
+            transcripts,
+            offsets=[chunk.start for chunk in chunks]
+        )
+        return save_transcript(final_transcript, video_path, video_name, len(chunks), engine)
 
-    # Check file size and chunk if needed
-    file_size = audio_path.stat().st_size
-    log(f"Audio file size: {file_size / (1024*1024):.2f} MB")
+    audio_key = content_hash(engine.cache_id, "audio", hash_file(audio_path)) if cache else None
+    final_transcript = cache.get(audio_key) if cache else None
 
-    if file_size > MAX_FILE_SIZE:
-        log("File exceeds 25MB limit, chunking...")
-        audio_chunks = chunk_audio(audio_path, audio_dir)
+    if final_transcript is not None:
+        log("Using cached transcript for identical audio")
+        chunk_count = final_transcript.pop("chunks")
     else:
-        audio_chunks = [audio_path]
-
-    # Transcribe all chunks
-    transcripts = []
-    for i, chunk_path in enumerate(audio_chunks):
-        transcript = transcribe_audio(
-            client,
-            chunk_path,
-            chunk_index=i,
-            total_chunks=len(audio_chunks)
+        file_size = audio_path.stat().st_size
+        log(f"Audio file size: {file_size / (1024*1024):.2f} MB")
+
+        # Audio longer than chunk_duration is split at pauses, which also
+        # keeps each chunk under the 25MB upload limit
+        chunks = chunk_audio(audio_path, audio_dir, chunk_duration)
+        if any(chunk.path.stat().st_size > MAX_FILE_SIZE for chunk in chunks):
+            log("Some chunks exceed the 25MB upload limit; lower --chunk-duration", level="warning")
+
+        # Transcribe all chunks and merge them onto one timeline
+        transcripts = transcribe_chunks(engine, chunks, concurrency, cache)
+        final_transcript = merge_transcripts(
+            transcripts,
+            offsets=[chunk.start for chunk in chunks]
         )
-        transcripts.append(transcript)
+        chunk_count = len(chunks)
+
+        if cache:
+            cache.set(audio_key, {**final_transcript, "chunks": chunk_count})
+
+    return save_transcript(final_transcript, video_path, video_name, chunk_count, engine)
 
-    # Merge if multiple chunks
-    if len(transcripts) > 1:
-        final_transcript = merge_transcripts(transcripts)
-    else:
-        t = transcripts[0]
-        final_transcript = {
-            "text": t.text,
-            "segments": [
-                {"start": s.get("start", 0), "end": s.get("end", 0), "text": s.get("text", "")}
-                for s in (t.segments if hasattr(t, 'segments') and t.segments else [])
-            ],
-            "language": t.language if hasattr(t, 'language') else "en",
-            "duration": t.duration if hasattr(t, 'duration') else 0
-        }
 
+def save_transcript(
+    final_transcript: dict,
+    video_path: str,
+    video_name: str,
+    chunk_count: int,
+    engine: TranscriptionBackend
+) -> ExecutionResult:
+    """Add source metadata, save the transcript and build the result."""
     # Add metadata
     final_transcript["source"] = video_path
     final_transcript["video_name"] = video_name
-    final_transcript["chunks_processed"] = len(audio_chunks)
+    final_transcript["chunks_processed"] = chunk_count
+    final_transcript["backend"] = engine.cache_id
 
     # Save transcript
     output_filename = f"transcripts/{video_name}_{timestamp()}.json"
@@ -333,13 +998,49 @@ def transcribe_video(
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Transcribe video using OpenAI Whisper API"
+        description="Transcribe video using Whisper (OpenAI API, local CPU, or fake)"
     )
     parser.add_argument(
         "--video",
         required=True,
         help="Path to video file or YouTube URL"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Chunks to transcribe at once (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--chunk-duration",
+        type=int,
+        default=CHUNK_DURATION,
+        help=f"Target chunk length in seconds; cuts snap to pauses (default: {CHUNK_DURATION})"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Transcribe chunks while ffmpeg is still encoding (fixed-length chunks)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't reuse or store cached transcripts"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="openai",
+        help="Transcription engine (default: openai)"
+    )
+    parser.add_argument(
+        "--model",
+        help=f"Model for the backend (default: {WHISPER_MODEL} for openai, {LOCAL_WHISPER_MODEL} for local)"
+    )
+    parser.add_argument(
+        "--api-base",
+        help="Base URL of an OpenAI-compatible transcription API (default: OPENAI_BASE_URL or OpenAI)"
+    )
 
     args = parser.parse_args()
 
@@ -347,7 +1048,7 @@ def main():
     env = load_env()
     api_key = env.get("OPENAI_API_KEY")
 
-    if not api_key:
+    if args.backend == "openai" and not api_key:
         result = ExecutionResult.fail(
             "OPENAI_API_KEY not found in environment. "
             "Add it to your .env file."
@@ -356,7 +1057,17 @@ def main():
         return
 
     try:
-        result = transcribe_video(args.video, api_key)
+        result = transcribe_video(
+            args.video,
+            api_key,
+            concurrency=args.concurrency,
+            api_base=args.api_base,
+            use_cache=not args.no_cache,
+            chunk_duration=args.chunk_duration,
+            stream=args.stream,
+            backend=args.backend,
+            model=args.model
+        )
     except Exception as e:
         log(f"Transcription failed: {e}", level="error")
         result = ExecutionResult.fail(str(e))
@@ -5,10 +5,14 @@ All execution scripts should import from here.
 
 import os
 import json
+import hashlib
 import logging
+import random
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar
 from dotenv import load_dotenv
 
 # Project root (parent of execution/)
@@ -104,6 +108,223 @@ def timestamp() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hash(*parts: Any) -> str:
+    """SHA-256 of JSON-serializable parts, for use as a cache key."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """
+    JSON cache in .tmp/cache/<namespace>/, one file per key.
+
+    Reads touch the entry's mtime, so evicting the oldest mtimes first once
+    the cache exceeds max_bytes is LRU. Each entry also records when it was
+    written; entries written more than ttl seconds ago (if set) are treated
+    as missing however often they are read. Writes are atomic, so
+    concurrent threads and processes can share a cache.
+    """
+
+    def __init__(self, namespace: str, max_bytes: int, ttl: Optional[float] = None):
+        self.root = TMP_DIR / "cache" / namespace
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Entries are {"created_at", "value"}; anything else is unusable
+        if not isinstance(entry, dict) or "created_at" not in entry or "value" not in entry:
+            path.unlink(missing_ok=True)
+            return None
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        # mtime only tracks recency for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["value"]
+
+    def set(self, key: str, value: Any):
+        """Store a value and evict least recently used entries over the size cap."""
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{random.randrange(1 << 30)}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"created_at": time.time(), "value": value}, f, default=str)
+        os.replace(tmp, path)
+        self.evict()
+
+    def _entries(self) -> Iterator[Tuple[float, int, Path]]:
+        for path in self.root.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+T = TypeVar("T")
+
+
+def retry_with_backoff(
+    fn: Callable[[], T],
+    is_retryable: Callable[[Exception], bool] = lambda e: True,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    description: str = "request"
+) -> T:
+    """
+    Call fn, retrying retryable errors with jittered exponential backoff.
+
+    Waits a random time up to base_delay * 2**attempt (capped at max_delay)
+    between attempts, or the server's Retry-After when the error carries
+    one, so concurrent callers hitting a rate limit don't retry in lockstep.
+
+    Args:
+        fn: Zero-argument callable to run
+        is_retryable: Whether an exception is worth retrying
+        max_retries: Retries after the first attempt
+        base_delay: Backoff base in seconds
+        max_delay: Longest single wait in seconds
+        description: Used in log messages
+
+    Returns:
+        fn's return value
+
+    Raises:
+        The last exception once retries are exhausted or it isn't retryable
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            headers = getattr(getattr(e, "response", None), "headers", None) or {}
+            try:
+                delay = min(max_delay, float(headers.get("retry-after", delay)))
+            except (TypeError, ValueError):
+                pass
+
+            log(
+                f"{description} failed ({e}), retrying in {delay:.1f}s "
+                f"(attempt {attempt + 2}/{max_retries + 1})",
+                level="warning"
+            )
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Requests- and tokens-per-minute limiter shared by concurrent callers.
+
+    Two token buckets refill continuously at limit/60 per second and start
+    full, so a burst up to the per-minute limits goes out immediately and
+    later calls are paced. acquire() blocks until both buckets can cover
+    the call; a single call larger than the token limit waits for a full
+    bucket rather than forever. Without tokens_per_minute (None or 0) only
+    requests are limited.
+
+    Raises:
+        ValueError: If requests_per_minute isn't positive or
+            tokens_per_minute is negative
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None):
+        if requests_per_minute <= 0:
+            raise ValueError(f"requests_per_minute must be positive, got {requests_per_minute}")
+        if tokens_per_minute is not None and tokens_per_minute < 0:
+            raise ValueError(f"tokens_per_minute must not be negative, got {tokens_per_minute}")
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request of about `tokens` tokens is allowed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        needed = min(tokens, self.tpm) if self.tpm else 0
+        with self._cond:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= needed:
+                    self._requests -= 1
+                    self._tokens -= needed
+                    return time.monotonic() - started
+
+                wait = (1 - self._requests) * 60 / self.rpm if self._requests < 1 else 0
+                if needed > self._tokens:
+                    wait = max(wait, (needed - self._tokens) * 60 / self.tpm)
+                self._cond.wait(timeout=wait)
+
+    def record_usage(self, estimated: int, actual: int):
+        """Correct the token bucket once a call's real usage is known."""
+        if not self.tpm:
+            return
+        with self._cond:
+            self._refill()
+            self._tokens = min(self.tpm, self._tokens + estimated - actual)
+            self._cond.notify_all()
+
+
 class ExecutionResult:
     """
     Standard result object for execution scripts.
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Visual regression engine for the auto-dev agent system.
+
+Compares screenshots against stored baselines and decides pass/fail
+automatically:
+
+- Images are decoded to RGBA arrays and compared in one vectorized NumPy
+  pass. A pixel differs when its largest channel delta exceeds `threshold`.
+- Differing pixels whose color is a blend of the other image's 3x3
+  neighborhood are treated as anti-aliasing (edges shifted by a
+  sub-pixel) and do not count against the test.
+- A perceptual hash (DCT pHash) rejects images that are obviously
+  different before the pixel pass.
+- A diff mask PNG marks real differences in red and anti-aliasing in
+  yellow over a faded copy of the baseline.
+
+Baselines are content-addressed: PNGs are stored once under
+.tmp/auto-dev/baselines/objects/<sha256>.png and an index maps each
+project + base commit + route + viewport key to its object. Checks never
+record baselines on their own: a feature branch is compared against the
+baseline of the main-branch commit it was created from. Baselines come
+from main-branch renders only: the agent coordinator records one per
+base commit before the first todo branched from it touches the checkout
+(playwright_test_runner.record_missing_baseline), and the record action or
+--update-baselines re-record them by hand.
+
+Usage:
+    # Compare two screenshots
+    python execution/visual_diff.py \
+        --action compare \
+        --actual .tmp/auto-dev/screenshots/todo_001/visual_check.png \
+        --baseline old.png
+
+    # Check a screenshot against the stored baseline for a route of a
+    # project at the main-branch commit it was branched from
+    python execution/visual_diff.py \
+        --action check \
+        --actual visual_check.png \
+        --project /path/to/project \
+        --base-commit 1a2b3c4 \
+        --route /settings
+
+    # Record a main-branch screenshot as the baseline for a route
+    python execution/visual_diff.py \
+        --action record \
+        --actual visual_check.png \
+        --project /path/to/project \
+        --base-commit 1a2b3c4 \
+        --route /settings
+
+Requirements:
+    pip install numpy pillow
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import log, get_tmp_path, hash_file, content_hash, ExecutionResult, timestamp
+
+# Lazy import numpy/Pillow to avoid errors if not installed
+numpy_available = True
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    numpy_available = False
+
+# flock is POSIX-only; elsewhere only threads in this process are serialized
+fcntl_available = True
+try:
+    import fcntl
+except ImportError:
+    fcntl_available = False
+
+BASELINE_DIR = "auto-dev/baselines"
+
+# Largest per-channel delta (0-1) for two pixels to count as equal
+DIFF_THRESHOLD = 0.1
+
+# Fraction of pixels allowed to differ before the comparison fails
+MAX_DIFF_RATIO = 0.0001
+
+# pHash bits (of 64) that may differ before images are rejected outright
+PHASH_REJECT_DISTANCE = 16
+
+DEFAULT_VIEWPORT = {"width": 1280, "height": 720}
+
+# Stores are created per call, so index updates are serialized per module
+_index_thread_lock = threading.Lock()
+
+
+@dataclass
+class DiffResult:
+    """Outcome of comparing a screenshot with its baseline."""
+    passed: bool
+    message: str
+    diff_pixels: int = 0
+    aa_pixels: int = 0
+    diff_ratio: float = 0.0
+    phash_distance: int = 0
+    diff_image: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def load_rgba(path: Path) -> "np.ndarray":
+    """Decode an image into an (H, W, 4) uint8 array."""
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+def _dct_matrix(n: int) -> "np.ndarray":
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / n)
+
+
+def perceptual_hash(path: Path, hash_size: int = 8, scale: int = 4) -> int:
+    """
+    DCT perceptual hash: low-frequency structure of the grayscale image.
+
+    Returns:
+        hash_size**2-bit integer; similar images have a small Hamming distance
+    """
+    size = hash_size * scale
+    with Image.open(path) as image:
+        pixels = np.asarray(
+            image.convert("L").resize((size, size), Image.LANCZOS),
+            dtype=np.float64
+        )
+    dct = _dct_matrix(size)
+    low = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    bits = (low > np.median(low)).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _neighborhood_range(image: "np.ndarray"):
+    """Per-channel min and max over each pixel's 3x3 neighborhood."""
+    height, width = image.shape[:2]
+    padded = np.pad(image, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    shifts = np.stack([
+        padded[dy:dy + height, dx:dx + width]
+        for dy in range(3)
+        for dx in range(3)
+    ])
+    return shifts.min(axis=0), shifts.max(axis=0)
+
+
+def _is_antialiased(image: "np.ndarray", other: "np.ndarray") -> "np.ndarray":
+    """
+    Pixels of image whose color is a blend of the colors around them in other.
+
+    The color must lie within the neighborhood's range in every channel and
+    strictly inside it in at least one, so a solid color that merely
+    matches a neighbor (e.g. the edge of a new box) is not a blend.
+    """
+    low, high = _neighborhood_range(other)
+    within = np.all((image >= low) & (image <= high), axis=-1)
+    inside = np.any((image > low) & (image < high), axis=-1)
+    return within & inside
+
+
+def compare_images(
+    actual_path: Path,
+    baseline_path: Path,
+    threshold: float = DIFF_THRESHOLD,
+    max_diff_ratio: float = MAX_DIFF_RATIO,
+    diff_path: Optional[Path] = None
+) -> DiffResult:
+    """
+    Compare a screenshot with a baseline image.
+
+    Args:
+        actual_path: New screenshot
+        baseline_path: Baseline screenshot
+        threshold: Per-channel delta (0-1) above which pixels differ
+        max_diff_ratio: Fraction of differing pixels that still passes
+        diff_path: Where to write the diff mask PNG (only written on failure)
+
+    Returns:
+        DiffResult
+    """
+    actual_path, baseline_path = Path(actual_path), Path(baseline_path)
+
+    if hash_file(actual_path) == hash_file(baseline_path):
+        return DiffResult(passed=True, message="Identical to baseline")
+
+    actual = load_rgba(actual_path)
+    baseline = load_rgba(baseline_path)
+
+    if actual.shape != baseline.shape:
+        return DiffResult(
+            passed=False,
+            message=(
+                f"Size changed: {baseline.shape[1]}x{baseline.shape[0]} -> "
+                f"{actual.shape[1]}x{actual.shape[0]}"
+            ),
+            diff_ratio=1.0
+        )
+
+    # Fast reject: structurally different images skip the pixel pass
+    distance = hamming_distance(perceptual_hash(actual_path), perceptual_hash(baseline_path))
+    if distance > PHASH_REJECT_DISTANCE:
+        return DiffResult(
+            passed=False,
+            message=f"Perceptual hash differs by {distance}/64 bits",
+            diff_ratio=1.0,
+            phash_distance=distance
+        )
+
+    delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16)).max(axis=-1)
+    differs = delta > threshold * 255
+
+    # Differences explained by anti-aliasing in either direction are tolerated
+    aa = np.zeros_like(differs)
+    if differs.any():
+        aa = differs & (_is_antialiased(actual, baseline) | _is_antialiased(baseline, actual))
+    real = differs & ~aa
+
+    diff_pixels = int(real.sum())
+    ratio = diff_pixels / real.size
+    passed = ratio <= max_diff_ratio
+
+    result = DiffResult(
+        passed=passed,
+        message=(
+            f"{diff_pixels} pixels differ ({ratio:.3%}, limit {max_diff_ratio:.3%})"
+            + (f", {int(aa.sum())} anti-aliased ignored" if aa.any() else "")
+        ),
+        diff_pixels=diff_pixels,
+        aa_pixels=int(aa.sum()),
+        diff_ratio=ratio,
+        phash_distance=distance
+    )
+
+    if diff_path and not passed:
+        write_diff_mask(baseline, real, aa, Path(diff_path))
+        result.diff_image = str(diff_path)
+
+    return result
+
+
+def write_diff_mask(
+    baseline: "np.ndarray",
+    real: "np.ndarray",
+    aa: "np.ndarray",
+    diff_path: Path
+):
+    """Write a faded baseline with real differences in red and anti-aliasing in yellow."""
+    gray = baseline[..., :3].mean(axis=-1, keepdims=True)
+    mask = np.repeat(255 - (255 - gray) * 0.1, 3, axis=-1).astype(np.uint8)
+    mask[aa] = (255, 255, 0)
+    mask[real] = (255, 0, 0)
+    diff_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(mask, "RGB").save(diff_path)
+
+
+def project_key(project_path: str) -> str:
+    """Stable name for a project checkout: directory name plus a path hash."""
+    resolved = Path(project_path).resolve()
+    return f"{resolved.name}-{content_hash(str(resolved))[:8]}"
+
+
+class BaselineStore:
+    """
+    Content-addressed baseline screenshots keyed by project, base commit,
+    route and viewport.
+
+    objects/<sha256>.png holds each distinct image once; index.json maps
+    "<project>@<commit>:<route>@<width>x<height>" to an object hash. Keys
+    made without a project or commit leave those parts out.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else get_tmp_path(f"{BASELINE_DIR}/index.json").parent
+        self.objects = self.root / "objects"
+        self.index_file = self.root / "index.json"
+        self.lock_file = self.root / "index.lock"
+
+    @staticmethod
+    def key(
+        route: str,
+        viewport: Dict[str, int],
+        project: Optional[str] = None,
+        base_commit: Optional[str] = None
+    ) -> str:
+        key = f"{route or '/'}@{viewport['width']}x{viewport['height']}"
+        scope = project_key(project) if project else ""
+        if base_commit:
+            scope += f"@{base_commit[:12]}"
+        return f"{scope}:{key}" if scope else key
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.index_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, dict]]:
+        """
+        Yield the index under an exclusive lock (fcntl.flock where
+        available, plus a thread lock); changes are written back atomically.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with _index_thread_lock, open(self.lock_file, "a") as lock_handle:
+            if fcntl_available:
+                fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                try:
+                    index = json.loads(self.index_file.read_text())
+                except FileNotFoundError:
+                    index = {}
+                except json.JSONDecodeError as e:
+                    corrupt = self.index_file.with_name(f"{self.index_file.name}.corrupt")
+                    os.replace(self.index_file, corrupt)
+                    log(f"Baseline index was unreadable ({e}); moved to {corrupt}", level="warning")
+                    index = {}
+                yield index
+                tmp = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(index, indent=2))
+                os.replace(tmp, self.index_file)
+            finally:
+                if fcntl_available:
+                    fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def get(
+        self,
+        route: str,
+        viewport: Dict[str, int] = DEFAULT_VIEWPORT,
+        project: Optional[str] = None,
+        base_commit: Optional[str] = None
+    ) -> Optional[Path]:
+        """Path of the baseline for the key, if one is stored."""
+        entry = self._load_index().get(self.key(route, viewport, project, base_commit))
+        if not entry:
+            return None
+        path = self.objects / f"{entry['sha256']}.png"
+        return path if path.exists() else None
+
+    def put(
+        self,
+        route: str,
+        image_path: Path,
+        viewport: Dict[str, int] = DEFAULT_VIEWPORT,
+        project: Optional[str] = None,
+        base_commit: Optional[str] = None
+    ) -> str:
+        """
+        Store image_path as the baseline for the key.
+
+        Returns:
+            The image's sha256
+        """
+        sha = hash_file(Path(image_path))
+        self.objects.mkdir(parents=True, exist_ok=True)
+        target = self.objects / f"{sha}.png"
+        if not target.exists():
+            shutil.copyfile(image_path, target)
+
+        with self._locked_index() as index:
+            index[self.key(route, viewport, project, base_commit)] = {"sha256": sha, "updated_at": timestamp()}
+        return sha
+
+
+def check_against_baseline(
+    image_path: Path,
+    route: str,
+    viewport: Dict[str, int] = DEFAULT_VIEWPORT,
+    store: Optional[BaselineStore] = None,
+    diff_path: Optional[Path] = None,
+    project: Optional[str] = None,
+    base_commit: Optional[str] = None
+) -> DiffResult:
+    """
+    Compare a screenshot with the stored baseline for its key.
+
+    Without a baseline there is nothing to compare against and the check
+    passes; the screenshot is not recorded, since it may be a feature
+    branch's render (see BaselineStore.put).
+    """
+    store = store or BaselineStore()
+    baseline = store.get(route, viewport, project, base_commit)
+    if baseline is None:
+        key = BaselineStore.key(route, viewport, project, base_commit)
+        return DiffResult(passed=True, message=f"No baseline for {key}; not compared")
+
+    return compare_images(image_path, baseline, diff_path=diff_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Visual regression checks for auto-dev agent")
+    parser.add_argument(
+        "--action",
+        required=True,
+        choices=["compare", "check", "record"],
+        help="Action to perform"
+    )
+    parser.add_argument("--actual", required=True, help="Path to the new screenshot")
+    parser.add_argument("--baseline", help="Baseline image (for compare)")
+    parser.add_argument("--route", default="/", help="Route the screenshot was taken of (default: /)")
+    parser.add_argument("--project", help="Project the screenshot was taken of (part of the baseline key)")
+    parser.add_argument("--base-commit", help="Main-branch commit the render is based on (part of the baseline key)")
+    parser.add_argument("--width", type=int, default=DEFAULT_VIEWPORT["width"], help="Viewport width")
+    parser.add_argument("--height", type=int, default=DEFAULT_VIEWPORT["height"], help="Viewport height")
+    parser.add_argument("--diff", help="Where to write the diff mask on failure")
+    args = parser.parse_args()
+
+    if not numpy_available:
+        print(ExecutionResult.fail(
+            error="NumPy/Pillow not installed. Run: pip install numpy pillow"
+        ).to_json())
+        sys.exit(1)
+
+    viewport = {"width": args.width, "height": args.height}
+    diff_path = Path(args.diff) if args.diff else None
+
+    if args.action == "compare":
+        if not args.baseline:
+            print(ExecutionResult.fail(error="--baseline required for compare action").to_json())
+            sys.exit(1)
+        diff = compare_images(Path(args.actual), Path(args.baseline), diff_path=diff_path)
+    elif args.action == "check":
+        diff = check_against_baseline(
+            Path(args.actual),
+            args.route,
+            viewport,
+            diff_path=diff_path,
+            project=args.project,
+            base_commit=args.base_commit
+        )
+    else:
+        sha = BaselineStore().put(args.route, Path(args.actual), viewport, args.project, args.base_commit)
+        key = BaselineStore.key(args.route, viewport, args.project, args.base_commit)
+        log(f"Recorded baseline for {key}: {sha}")
+        diff = DiffResult(passed=True, message="Baseline recorded")
+
+    result = (
+        ExecutionResult.ok(data=diff.to_dict())
+        if diff.passed
+        else ExecutionResult.fail(error=diff.message, data=diff.to_dict())
+    )
+    print(result.to_json())
+    sys.exit(0 if result.success else 1)
+
+
+if __name__ == "__main__":
+    main()